@@ -4,3 +4,23 @@ from django.apps import AppConfig
 class CommunityConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'community'
+
+    def ready(self):
+        # 리뷰 / 댓글 / 좋아요 / 닉네임이 바뀌면 캐시된 API 응답의 세대를 올림 (community.cache)
+        from django.contrib.auth import get_user_model
+        from django.db.models.signals import m2m_changed, post_delete, post_save
+        from movies.counters import on_like_changed
+        from .cache import on_comment_changed, on_review_changed, on_review_liked, on_user_changed
+        from .models import Comment, Review
+
+        User = get_user_model()
+        post_save.connect(on_review_changed, sender=Review, dispatch_uid='cache_review_saved')
+        post_delete.connect(on_review_changed, sender=Review, dispatch_uid='cache_review_deleted')
+        post_save.connect(on_comment_changed, sender=Comment, dispatch_uid='cache_comment_saved')
+        post_delete.connect(on_comment_changed, sender=Comment, dispatch_uid='cache_comment_deleted')
+        m2m_changed.connect(on_review_liked, sender=Review.like_users.through, dispatch_uid='cache_review_liked')
+        post_save.connect(on_user_changed, sender=User, dispatch_uid='cache_user_saved')
+        post_delete.connect(on_user_changed, sender=User, dispatch_uid='cache_user_deleted')
+
+        # 좋아요 수 컬럼(like_count)을 같은 트랜잭션에서 갱신 (movies.counters)
+        m2m_changed.connect(on_like_changed, sender=Review.like_users.through, dispatch_uid='counter_review_liked')
@@ -0,0 +1,81 @@
+"""
+리뷰 / 댓글 API 응답 캐시의 범위와 무효화 시그널 핸들러 (movies.cache, community.apps에서 연결)
+
+- 리뷰 목록: catalog + users + (영화별 목록이면 reviews:movie:<영화 pk>, 전체 목록이면 reviews)
+- 리뷰 상세: catalog + users + review:<리뷰 pk>
+- 댓글 목록: users + review:<리뷰 pk>
+리뷰 응답에 댓글 / 좋아요 수 / 닉네임 / 영화 제목이 같이 들어가므로 각각 바뀔 때 해당 범위를 올립니다.
+"""
+from movies.cache import CATALOG_SCOPE, USERS_SCOPE, invalidate
+from .models import Review
+
+REVIEWS_SCOPE = 'reviews'
+
+
+def movie_reviews_scope(movie_id):
+    return f'reviews:movie:{movie_id}'
+
+
+def review_scope(review_id):
+    return f'review:{review_id}'
+
+
+def review_list_scopes(movie_id=None):
+    return [CATALOG_SCOPE, USERS_SCOPE, movie_reviews_scope(movie_id) if movie_id else REVIEWS_SCOPE]
+
+
+def review_detail_scopes(review_id):
+    return [CATALOG_SCOPE, USERS_SCOPE, review_scope(review_id)]
+
+
+def comment_list_scopes(review_id):
+    return [USERS_SCOPE, review_scope(review_id)]
+
+
+def invalidate_review(review_id, movie_id=None):
+    scopes = [REVIEWS_SCOPE, review_scope(review_id)]
+    if movie_id is not None:
+        scopes.append(movie_reviews_scope(movie_id))
+    invalidate(*scopes)
+
+
+def on_review_changed(sender, instance, **kwargs):
+    """
+    Review post_save / post_delete
+    """
+    invalidate_review(instance.pk, instance.movie_id)
+
+
+def on_comment_changed(sender, instance, **kwargs):
+    """
+    Comment post_save / post_delete (리뷰 응답에 댓글이 같이 들어감)
+    """
+    movie_id = Review.objects.filter(pk=instance.review_id).values_list('movie_id', flat=True).first()
+    invalidate_review(instance.review_id, movie_id)
+
+
+def on_review_liked(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Review.like_users m2m_changed (좋아요 수)
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        invalidate_review(instance.pk, instance.movie_id)
+    elif pk_set:
+        # user.like_reviews.add(...) 처럼 유저 쪽에서 바꾼 경우
+        for review_id, movie_id in Review.objects.filter(pk__in=pk_set).values_list('pk', 'movie_id'):
+            invalidate_review(review_id, movie_id)
+    else:
+        # user.like_reviews.clear() -> 어떤 리뷰인지 알 수 없으므로 리뷰 응답 전체
+        invalidate(USERS_SCOPE)
+
+
+def on_user_changed(sender, instance, update_fields=None, **kwargs):
+    """
+    User post_save / post_delete (리뷰 / 댓글 응답의 username, nickname)
+    로그인할 때마다 last_login만 저장하는 경우는 무시합니다.
+    """
+    if update_fields is not None and not {'username', 'nickname'} & set(update_fields):
+        return
+    invalidate(USERS_SCOPE)
@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-18 16:18
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+
+def fill_like_count(apps, schema_editor):
+    # 기존 좋아요 수 채우기
+    Review = apps.get_model('community', 'Review')
+    Through = Review.like_users.through
+    counts = (
+        Through.objects.filter(review_id=OuterRef('pk'))
+        .order_by().values('review_id').annotate(count=Count('pk')).values('count')
+    )
+    Review.objects.filter(pk__in=Through.objects.values('review_id')).update(like_count=Subquery(counts))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0003_alter_review_rank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_like_count, migrations.RunPython.noop),
+    ]
@@ -17,6 +17,7 @@ class Review(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     like_users = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='like_reviews', blank=True)
+    like_count = models.PositiveIntegerField(default=0) # 좋아요 수 (like_users와 같이 갱신, movies.counters)
     
     class Meta:
         # 한 유저는 한 영화에 하나의 리뷰만 작성 가능
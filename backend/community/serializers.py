@@ -17,7 +17,6 @@ class ReviewSerializer(serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source='user.username')
     user_nickname = serializers.ReadOnlyField(source='user.nickname')
     comments = CommentSerializer(many=True, read_only=True)
-    like_count = serializers.IntegerField(source='like_users.count', read_only=True)
     
     movie_title = serializers.CharField(source='movie.title', read_only=True)
     movie_poster = serializers.CharField(source='movie.poster_path', read_only=True)
@@ -26,4 +25,4 @@ class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = '__all__'
-        read_only_fields = ('user', 'like_users', 'movie') # movie는 URL에서 받으므로 read_only 추천
\ No newline at end of file
+        read_only_fields = ('user', 'like_users', 'like_count', 'movie') # movie는 URL에서 받으므로 read_only 추천
\ No newline at end of file
@@ -1,3 +1,60 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from movies.counters import reconcile
+from movies.models import Movie
+from .models import Review
+
+User = get_user_model()
+
+
+class ReviewLikeCountTests(TestCase):
+    """
+    Review.like_count가 좋아요의 모든 경로에서 실제 like_users 수와 같은지 (movies.counters)
+    """
+
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', email='alice@example.com', password='pw')
+        self.bob = User.objects.create_user(username='bob', email='bob@example.com', password='pw')
+        movies = [Movie.objects.create(tmdb_id=i, title=f'영화 {i}') for i in range(1, 3)]
+        self.reviews = [
+            Review.objects.create(user=self.alice, movie=movie, title=f'리뷰 {movie.tmdb_id}', content='내용')
+            for movie in movies
+        ]
+        # 지워지지 않는 유저의 리뷰 (alice를 지우면 alice의 리뷰는 같이 지워짐)
+        self.reviews.append(Review.objects.create(user=self.bob, movie=movies[0], title='리뷰 3', content='내용'))
+
+    def assertCounts(self, *expected):
+        counts = [
+            Review.objects.filter(pk=review.pk).values_list('like_count', flat=True).first()
+            for review in self.reviews
+        ]
+        self.assertEqual(counts, list(expected))
+        self.assertEqual(reconcile(Review), 0)
+
+    def test_toggle(self):
+        client = APIClient()
+        client.force_authenticate(self.bob)
+        url = f'/api/v1/community/reviews/{self.reviews[0].pk}/likes/'
+
+        response = client.post(url)
+        self.assertEqual(response.data, {'liked': True, 'count': 1})
+        response = client.post(url)
+        self.assertEqual(response.data, {'liked': False, 'count': 0})
+        self.assertCounts(0, 0, 0)
+
+    def test_user_side(self):
+        self.bob.like_reviews.add(*self.reviews)
+        self.alice.like_reviews.add(self.reviews[2])
+        self.assertCounts(1, 1, 2)
+        self.bob.like_reviews.remove(self.reviews[0])
+        self.assertCounts(0, 1, 2)
+        self.bob.like_reviews.clear()
+        self.assertCounts(0, 0, 1)
+
+    def test_user_deleted(self):
+        self.alice.like_reviews.add(self.reviews[2])
+        self.bob.like_reviews.add(self.reviews[2])
+        self.alice.delete()
+        self.assertCounts(None, None, 1)
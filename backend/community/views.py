@@ -3,10 +3,13 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import ValidationError
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 
+from .cache import comment_list_scopes, review_detail_scopes, review_list_scopes
 from .models import Review, Comment
 from .serializers import ReviewSerializer, CommentSerializer
+from movies.cache import cache_response, cached_response
 from movies.models import Movie
 
 class ReviewViewSet(viewsets.ModelViewSet):
@@ -22,6 +25,15 @@ class ReviewViewSet(viewsets.ModelViewSet):
         if movie_id:
             queryset = queryset.filter(movie_id=movie_id)
         return queryset
+
+    # 목록 / 상세 조회는 캐시된 응답 사용 (리뷰, 댓글, 좋아요가 바뀌면 시그널로 무효화)
+    def list(self, request, *args, **kwargs):
+        scopes = review_list_scopes(request.query_params.get('movie'))
+        return cached_response(request, scopes, lambda: super(ReviewViewSet, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        scopes = review_detail_scopes(kwargs['pk'])
+        return cached_response(request, scopes, lambda: super(ReviewViewSet, self).retrieve(request, *args, **kwargs))
     
     # 영화 정보는 URL 파라미터나 request.data에서 가져와야 함 (URL 구조에 따라 다름)
     def perform_create(self, serializer):
@@ -43,17 +55,21 @@ class ReviewViewSet(viewsets.ModelViewSet):
 @permission_classes([IsAuthenticated])
 def like_review(request, review_pk):
     review = get_object_or_404(Review, pk=review_pk)
-    if review.like_users.filter(pk=request.user.pk).exists():
-        review.like_users.remove(request.user) # 좋아요 취소
-        liked = False
-    else:
-        review.like_users.add(request.user)    # 좋아요
-        liked = True
-    return Response({'liked': liked, 'count': review.like_users.count()})
+    with transaction.atomic():
+        if review.like_users.filter(pk=request.user.pk).exists():
+            review.like_users.remove(request.user) # 좋아요 취소
+            liked = False
+        else:
+            review.like_users.add(request.user)    # 좋아요
+            liked = True
+        # like_count는 시그널이 같은 트랜잭션에서 갱신 (movies.counters)
+        review.refresh_from_db(fields=['like_count'])
+    return Response({'liked': liked, 'count': review.like_count})
     
 
 # ★ [추가] CommentViewSet: 댓글 CRUD
 @api_view(['GET', 'POST'])
+@cache_response(lambda request, review_pk: comment_list_scopes(review_pk))
 def comment_list_create(request, review_pk):
     review = get_object_or_404(Review, pk=review_pk)
 
@@ -184,3 +184,26 @@ else:
 # TMDB API Key
 TMDB_API_KEY = config('TMDB_API_KEY', default='')
 
+# 감정 분석 추론 백엔드 (transformers | quantized | onnx)
+# onnx는 python manage.py export_mood_model 로 만든 MOOD_MODEL_PATH 디렉토리를 사용합니다.
+MOOD_INFERENCE_BACKEND = config('MOOD_INFERENCE_BACKEND', default='transformers')
+MOOD_MODEL_PATH = config('MOOD_MODEL_PATH', default=str(BASE_DIR / 'ml_models' / 'go_emotions'))
+
+# 추천/검색용 읽기 전용 배열 파일 디렉토리 (감정 벡터 행렬 등, API 워커들이 mmap으로 공유)
+CATALOG_DIR = config('CATALOG_DIR', default=str(BASE_DIR / 'catalog'))
+
+# config/wsgi.py를 불러올 때(fork 전) 카탈로그 스냅샷을 미리 만들지 여부 (movies.snapshot.preload_snapshot)
+# gunicorn --preload 처럼 워커를 fork하는 서버에서만 켭니다. (runserver는 시작 / 자동 재시작마다 전체를 읽게 됨)
+PRELOAD_SNAPSHOT = config('PRELOAD_SNAPSHOT', default=False, cast=bool)
+
+# API 응답 캐시 (movies.cache) - 워커 메모리 LRU 앞단 + 아래 공유 캐시
+# 기본은 파일 캐시 (같은 서버의 워커들이 공유), 예: CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+CACHE_BACKEND = config('CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / 'cache')),
+    }
+}
+if CACHE_BACKEND.endswith('FileBasedCache'):
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': 20000}
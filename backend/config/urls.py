@@ -12,6 +12,7 @@ urlpatterns = [
     path('api/v1/movies/', include('movies.urls')),  # 영화 관련 API (인기 영화 목록 등)
     path('api/v1/community/', include('community.urls')),
     path('api/v1/recommends/', include('recommends.urls')),
+    path('api/v1/moods/', include('moods.urls')),  # 감정 분석 요청 / 상태 조회
 ]
 
 if settings.DEBUG:
@@ -15,3 +15,12 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
 
+
+# fork 전에 카탈로그 스냅샷을 만들어 두면 (gunicorn --preload) 워커들이 copy-on-write로 공유
+# runserver도 이 파일을 불러오므로 PRELOAD_SNAPSHOT=True일 때만 (.env)
+from django.conf import settings  # noqa: E402
+
+if settings.PRELOAD_SNAPSHOT:
+    from movies.snapshot import preload_snapshot
+
+    preload_snapshot()
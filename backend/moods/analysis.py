@@ -0,0 +1,200 @@
+"""
+영화 줄거리 감정 분석 공통 로직
+
+movie_moods 명령어에서 사용합니다.
+- 분석 대상 영화를 청크 단위로 스트리밍 (전체 Movie를 한 번에 메모리에 올리지 않음)
+- 줄거리 해시 + 모델 버전이 같은 분석 결과는 다시 추론하지 않고 재사용
+- 분류 모델에 batch_size 단위로 묶어서 추론 (moods.inference, 여러 프로세스는 moods.parallel)
+- 결과는 bulk_create로 한 번에 저장 (고정 순서 float32 벡터도 함께, moods.vectors)
+"""
+import hashlib
+
+from movies.models import Movie
+from .inference import classify_safely
+from .models import MovieMood
+from .vectors import pack_scores
+
+
+def pick_dominant_mood(scores):
+    """
+    scores 예시 (점수 내림차순):
+        [{'label': 'neutral', 'score': 0.85}, {'label': 'sadness', 'score': 0.12}, ...]
+    neutral을 건너뛰고 가장 점수가 높은 감정을 대표 감정으로 선택합니다.
+    """
+    for mood in scores:
+        if mood['label'] != 'neutral':
+            return mood['label']
+    # 모든게 neutral이면 어쩔 수 없이 neutral 저장
+    return 'neutral'
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def pending_movie_ids(version, movie_ids=None):
+    """
+    분석이 필요한 영화 id 목록 (영문 줄거리가 있는 영화 중, movie_ids를 주면 그 안에서만)
+    - 아직 분석 결과가 없는 영화
+    - 분석 이후 overview_en이 바뀐 영화 (text_hash 불일치)
+    - 다른 모델/백엔드로 분석된 영화 (model_version 불일치)
+
+    줄거리 해시는 DB에서 계산할 수 없어서 (id, overview_en, 저장된 해시)만 읽어 파이썬에서 비교합니다.
+    """
+    movies = Movie.objects.filter(overview_en__isnull=False).exclude(overview_en='')
+    if movie_ids is not None:
+        movies = movies.filter(pk__in=movie_ids)
+    rows = (
+        movies
+        .order_by('pk')
+        .values_list('id', 'overview_en', 'mood_result__text_hash', 'mood_result__model_version')
+    )
+    return [
+        movie_id
+        for movie_id, overview_en, saved_hash, saved_version in rows.iterator(chunk_size=2000)
+        if saved_version != version or saved_hash != text_hash(overview_en)
+    ]
+
+
+class ScoreCache:
+    """
+    같은 모델 버전의 (줄거리 해시 -> 감정 점수) 캐시
+    DB의 기존 분석 결과 + 이번 실행에서 분석한 결과를 함께 찾아봅니다.
+    """
+
+    def __init__(self, version):
+        self.version = version
+        self.scores = {}
+        self.hits = 0
+
+    def lookup(self, hashes):
+        missing = {h for h in hashes if h not in self.scores}
+        if missing:
+            rows = (
+                MovieMood.objects
+                .filter(model_version=self.version, text_hash__in=missing)
+                .values_list('text_hash', 'score_details')
+            )
+            self.scores.update(rows)
+        return {h: self.scores[h] for h in hashes if h in self.scores}
+
+    def add(self, hashes, outputs):
+        for h, scores in zip(hashes, outputs):
+            if scores is not None:
+                self.scores[h] = scores
+
+
+class MoodChunk:
+    """
+    한 번에 읽고 저장하는 영화 묶음
+    캐시에 있는 줄거리는 건너뛰고, 같은 줄거리는 한 번만 추론하도록 texts를 만듭니다.
+    """
+
+    def __init__(self, movies, cache):
+        self.movies = movies
+        self.hashes = [text_hash(movie.overview_en) for movie in movies]
+        self.cached = cache.lookup(self.hashes)
+
+        # 추론할 텍스트 (중복 제거) / 각 텍스트의 해시와 대표 영화
+        self.texts = []
+        self.text_hashes = []
+        self.text_movies = []
+        seen = set(self.cached)
+        for movie, h in zip(movies, self.hashes):
+            if h in seen:
+                continue
+            seen.add(h)
+            self.texts.append(movie.overview_en)
+            self.text_hashes.append(h)
+            self.text_movies.append(movie)
+
+    def __len__(self):
+        return len(self.movies)
+
+    def resolve(self, outputs):
+        """
+        texts의 추론 결과 -> 영화별 점수 리스트 (실패한 텍스트를 가진 영화는 None)
+        """
+        scores = dict(self.cached)
+        scores.update(zip(self.text_hashes, outputs))
+        return [scores.get(h) for h in self.hashes]
+
+
+# DB에 영화가 없을 때 검증/벤치마크에 쓸 예시 줄거리
+SAMPLE_TEXTS = [
+    "Are you crazy? this is insane! I have to get out of here.",
+    "A young boy discovers that he is a wizard and begins his education at a school of magic.",
+    "After his wife dies, a grieving father struggles to reconnect with his estranged daughter.",
+    "A group of friends plan the perfect heist in a Las Vegas casino, but everything goes wrong.",
+    "Two strangers fall in love during a summer in Paris.",
+    "Earth's mightiest heroes must come together to stop an alien invasion.",
+    "A lonely robot left on an abandoned Earth finds an unexpected companion.",
+    "A detective hunts a serial killer who uses the seven deadly sins as his motives.",
+]
+
+
+def sample_texts(limit):
+    """
+    검증/벤치마크용 줄거리 limit개 (DB의 overview_en 우선, 부족하면 예시 문장 반복)
+    """
+    texts = list(
+        Movie.objects.exclude(overview_en='').exclude(overview_en__isnull=True)
+        .order_by('pk').values_list('overview_en', flat=True)[:limit]
+    )
+    while len(texts) < limit:
+        texts.append(SAMPLE_TEXTS[len(texts) % len(SAMPLE_TEXTS)])
+    return texts
+
+
+def analyze_sequential(classifier, chunks, batch_size):
+    """
+    한 프로세스에서 청크를 차례로 분석 (moods.parallel.analyze_parallel과 같은 형태로 결과 반환)
+    """
+    for chunk in chunks:
+        outputs, errors = classify_safely(classifier, chunk.texts, batch_size) if chunk.texts else ([], [])
+        yield chunk, outputs, errors
+
+
+def iter_movie_chunks(movie_ids, chunk_size, cache):
+    """
+    (id, title, overview_en)만 읽어서 chunk_size개씩 MoodChunk로 돌려줍니다.
+
+    분석할 id 목록을 먼저 만들어 두고 청크마다 새 쿼리를 보내므로, 저장하는 동안 커서를 열어 두지
+    않습니다. (SQLite는 같은 커넥션 안의 읽기/쓰기를 격리하지 않아서 결과가 꼬일 수 있음)
+    """
+    for i in range(0, len(movie_ids), chunk_size):
+        movies = list(
+            Movie.objects
+            .filter(pk__in=movie_ids[i:i + chunk_size])
+            .only('id', 'title', 'overview_en')
+            .order_by('pk')
+        )
+        yield MoodChunk(movies, cache)
+
+
+def build_moods(chunk, outputs, version):
+    """
+    추론 결과 -> 저장할 MovieMood 객체 리스트
+    """
+    return [
+        MovieMood(
+            movie_id=movie.pk,
+            dominant_mood=pick_dominant_mood(scores),
+            score_details=scores,
+            vector=pack_scores(scores),
+            text_hash=h,
+            model_version=version,
+        )
+        for movie, h, scores in zip(chunk.movies, chunk.hashes, chunk.resolve(outputs))
+        if scores is not None  # 분석에 실패한 영화는 저장하지 않음 (다음 실행 때 다시 시도)
+    ]
+
+
+def save_moods(moods):
+    # 다시 분석한 영화는 기존 결과를 덮어씀 (created_at도 분석 시각으로 갱신)
+    MovieMood.objects.bulk_create(
+        moods,
+        update_conflicts=True,
+        unique_fields=['movie'],
+        update_fields=['dominant_mood', 'score_details', 'vector', 'text_hash', 'model_version', 'created_at'],
+    )
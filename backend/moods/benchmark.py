@@ -0,0 +1,64 @@
+"""
+추론 백엔드 벤치마크 (bench_moods 명령어)
+
+백엔드마다 새 프로세스에서 측정합니다. 최대 메모리(peak RSS)는 프로세스가 끝날 때까지
+줄어들지 않는 값이라, 한 프로세스에서 여러 백엔드를 재면 앞 백엔드의 메모리가 섞이기 때문입니다.
+"""
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .inference import MODEL_NAME, classify, load_classifier
+from .parallel import configure_threads
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def bench_backend(backend, model_path, texts, batch_size, threads, model_name=MODEL_NAME):
+    configure_threads(threads)
+
+    started = time.perf_counter()
+    classifier = load_classifier(model_name, backend=backend, model_path=model_path, threads=threads)
+    load_seconds = time.perf_counter() - started
+
+    # 워밍업 (첫 호출의 그래프 최적화/메모리 할당 비용 제외)
+    classify(classifier, texts[:batch_size], batch_size)
+
+    latencies = []
+    started = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        t0 = time.perf_counter()
+        classify(classifier, texts[i:i + batch_size], batch_size)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'backend': backend,
+        'load_seconds': load_seconds,
+        'batch_p50_ms': percentile(latencies, 0.5) * 1000,
+        'batch_p95_ms': percentile(latencies, 0.95) * 1000,
+        'per_text_ms': elapsed / len(texts) * 1000,
+        'throughput': len(texts) / elapsed,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def bench_in_subprocess(backend, model_path, texts, batch_size, threads):
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(bench_backend, backend, model_path, texts, batch_size, threads).result()
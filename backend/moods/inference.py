@@ -0,0 +1,182 @@
+"""
+감정 분류 모델 로드 / 추론
+
+Django 모델을 import하지 않으므로 별도 프로세스(--workers)에서도 그대로 사용할 수 있습니다.
+
+추론 백엔드 (load_classifier의 backend 인자)
+- transformers: Hugging Face pipeline 그대로 사용 (fp32, 기본값)
+- quantized: torch 동적 양자화 (Linear 레이어 가중치를 int8로) - 모델 파일 없이 바로 사용 가능
+- onnx: ONNX Runtime으로 추론 (export_mood_model 명령어로 만든 디렉토리 필요)
+  model_path 디렉토리에 model.int8.onnx가 있으면 양자화 모델, 없으면 model.onnx 사용
+
+어떤 백엔드든 classifier(texts, batch_size=...) 형태로 호출하고,
+텍스트마다 [{'label', 'score'}, ...] 리스트를 돌려줍니다.
+"""
+from pathlib import Path
+
+# 28가지 감정 분류 모델 (Hugging Face)
+MODEL_NAME = 'SamLowe/roberta-base-go_emotions'
+
+BACKENDS = ('transformers', 'quantized', 'onnx')
+
+ONNX_FILE = 'model.onnx'
+ONNX_INT8_FILE = 'model.int8.onnx'
+
+
+def load_classifier(model_name=MODEL_NAME, backend='transformers', model_path=None, threads=None):
+    if backend == 'transformers':
+        return _load_pipeline(model_name)
+    if backend == 'quantized':
+        return _load_quantized(model_name)
+    if backend == 'onnx':
+        if not model_path:
+            raise ValueError('onnx 백엔드는 model_path(export_mood_model 출력 디렉토리)가 필요합니다.')
+        return OnnxClassifier(model_path, threads=threads)
+    raise ValueError(f'알 수 없는 백엔드: {backend} (사용 가능: {", ".join(BACKENDS)})')
+
+
+def model_version(model_name=MODEL_NAME, backend='transformers', model_path=None):
+    """
+    분석 결과(MovieMood.model_version)에 기록할 모델 식별자
+    백엔드마다 점수가 조금씩 다르므로 백엔드/양자화 여부까지 포함합니다.
+    예: 'SamLowe/roberta-base-go_emotions', 'SamLowe/roberta-base-go_emotions+onnx-int8'
+    """
+    if backend == 'transformers':
+        return model_name
+    if backend == 'quantized':
+        return f'{model_name}+torch-int8'
+    if backend == 'onnx':
+        int8 = model_path and (Path(model_path) / ONNX_INT8_FILE).exists()
+        return f'{model_name}+onnx-int8' if int8 else f'{model_name}+onnx'
+    raise ValueError(f'알 수 없는 백엔드: {backend} (사용 가능: {", ".join(BACKENDS)})')
+
+
+def _load_pipeline(model_name, model=None, tokenizer=None):
+    from transformers import pipeline  # pip install transformers torch 필요
+
+    return pipeline(
+        task="text-classification",
+        model=model or model_name,
+        tokenizer=tokenizer,
+        top_k=None,      # 모든 감정 점수 다 가져오기
+        truncation=True  # 긴 줄거리 잘라서 에러 방지
+    )
+
+
+def _load_quantized(model_name):
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+    # Linear 레이어(대부분의 연산량)를 int8로 동적 양자화
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return _load_pipeline(model_name, model=model, tokenizer=tokenizer)
+
+
+class OnnxClassifier:
+    """
+    ONNX Runtime 추론기 (pipeline과 같은 입출력)
+    """
+
+    def __init__(self, model_path, model_file=None, max_length=512, threads=None):
+        import numpy as np
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        model_path = Path(model_path)
+        if model_file is None:
+            model_file = ONNX_INT8_FILE if (model_path / ONNX_INT8_FILE).exists() else ONNX_FILE
+        model_file = model_path / model_file
+
+        self.np = np
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
+        config = AutoConfig.from_pretrained(model_path)
+        self.labels = [config.id2label[i] for i in range(len(config.id2label))]
+        # go_emotions는 다중 라벨 모델이라 sigmoid (pipeline과 동일한 기준)
+        self.multi_label = config.problem_type == 'multi_label_classification'
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            # 여러 워커가 동시에 돌 때 코어를 서로 빼앗지 않도록 (torch의 set_num_threads와 같은 역할)
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(str(model_file), options, providers=['CPUExecutionProvider'])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.model_file = model_file
+
+    def __call__(self, texts, batch_size=32, **kwargs):
+        if isinstance(texts, str):
+            texts = [texts]
+        results = []
+        for i in range(0, len(texts), batch_size):
+            results += self._run(texts[i:i + batch_size])
+        return results
+
+    def _run(self, texts):
+        np = self.np
+        encoded = self.tokenizer(
+            texts, padding=True, truncation=True, max_length=self.max_length, return_tensors='np'
+        )
+        inputs = {name: value.astype(np.int64) for name, value in encoded.items() if name in self.input_names}
+        logits = self.session.run(None, inputs)[0]
+
+        if self.multi_label:
+            probs = 1 / (1 + np.exp(-logits))
+        else:
+            shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probs = shifted / shifted.sum(axis=1, keepdims=True)
+
+        return [
+            [{'label': label, 'score': float(score)} for label, score in zip(self.labels, row)]
+            for row in probs
+        ]
+
+
+def compare_scores(reference, candidate):
+    """
+    같은 텍스트들에 대한 두 백엔드의 결과 비교 (양자화/ONNX 검증용)
+    반환값: (최대 오차, 평균 오차, 1위 감정 일치율)
+    """
+    diffs = []
+    top1_match = 0
+    for ref_scores, cand_scores in zip(reference, candidate):
+        ref = {s['label']: s['score'] for s in ref_scores}
+        cand = {s['label']: s['score'] for s in cand_scores}
+        diffs += [abs(ref[label] - cand.get(label, 0.0)) for label in ref]
+        top1_match += max(ref, key=ref.get) == max(cand, key=cand.get)
+    if not diffs:
+        return 0.0, 0.0, 1.0
+    return max(diffs), sum(diffs) / len(diffs), top1_match / len(reference)
+
+
+def classify(classifier, texts, batch_size):
+    """
+    여러 줄거리를 batch_size 단위로 묶어 추론합니다.
+    반환값: 텍스트마다 [{'label', 'score'}, ...] (점수 내림차순)
+    """
+    outputs = classifier(texts, batch_size=batch_size)
+    # 입력이 1개일 때 [[...]]가 아닌 [...]로 나오는 버전이 있어서 형태를 맞춤
+    if outputs and isinstance(outputs[0], dict):
+        outputs = [outputs]
+    return [sorted(scores, key=lambda s: s['score'], reverse=True) for scores in outputs]
+
+
+def classify_safely(classifier, texts, batch_size):
+    """
+    classify()와 같지만, 배치가 실패하면 한 편씩 다시 분석해서 실패한 텍스트만 None으로 돌려줍니다.
+    반환값: (결과 리스트, [(인덱스, 에러 메시지), ...])
+    """
+    try:
+        return classify(classifier, texts, batch_size), []
+    except Exception:
+        outputs, errors = [], []
+        for i, text in enumerate(texts):
+            try:
+                outputs += classify(classifier, [text], 1)
+            except Exception as e:
+                outputs.append(None)
+                errors.append((i, str(e)))
+        return outputs, errors
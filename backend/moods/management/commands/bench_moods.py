@@ -0,0 +1,45 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from moods.analysis import sample_texts
+from moods.benchmark import bench_in_subprocess
+from moods.inference import BACKENDS
+
+
+class Command(BaseCommand):
+    help = '감정 분석 추론 백엔드별 지연 시간 / 처리량 / 최대 메모리 비교'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backends', default='transformers,quantized,onnx', help='쉼표로 구분한 백엔드 목록')
+        parser.add_argument('--model-path', default=settings.MOOD_MODEL_PATH, help='onnx 백엔드 모델 디렉토리')
+        parser.add_argument('--samples', type=int, default=256, help='측정에 사용할 줄거리 수')
+        parser.add_argument('--batch-size', type=int, default=32)
+        parser.add_argument('--threads', type=int, default=os.cpu_count() or 1, help='추론 스레드 수')
+
+    def handle(self, *args, **options):
+        backends = [b.strip() for b in options['backends'].split(',') if b.strip()]
+        unknown = set(backends) - set(BACKENDS)
+        if unknown:
+            raise CommandError(f'알 수 없는 백엔드: {", ".join(unknown)} (사용 가능: {", ".join(BACKENDS)})')
+
+        texts = sample_texts(options['samples'])
+        self.stdout.write(
+            f"줄거리 {len(texts)}개 / batch_size {options['batch_size']} / 스레드 {options['threads']}"
+        )
+        self.stdout.write(
+            f"{'backend':<14}{'load(s)':>9}{'p50(ms)':>10}{'p95(ms)':>10}{'ms/text':>10}{'text/s':>9}{'RSS(MB)':>9}"
+        )
+        for backend in backends:
+            try:
+                r = bench_in_subprocess(
+                    backend, options['model_path'], texts, options['batch_size'], options['threads']
+                )
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'{backend:<14}실패: {e}'))
+                continue
+            rss = f"{r['peak_rss_mb']:.0f}" if r['peak_rss_mb'] is not None else '-'
+            self.stdout.write(
+                f"{backend:<14}{r['load_seconds']:>9.1f}{r['batch_p50_ms']:>10.1f}{r['batch_p95_ms']:>10.1f}"
+                f"{r['per_text_ms']:>10.2f}{r['throughput']:>9.1f}{rss:>9}"
+            )
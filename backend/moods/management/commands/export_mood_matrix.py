@@ -0,0 +1,11 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from moods.vectors import export_mood_matrix
+
+
+class Command(BaseCommand):
+    help = '감정 벡터 행렬(영화 수 x 28, float32)을 CATALOG_DIR에 다시 내보냅니다. (movie_moods / mood_worker가 자동 실행)'
+
+    def handle(self, *args, **options):
+        count = export_mood_matrix()
+        self.stdout.write(self.style.SUCCESS(f'감정 벡터 행렬 내보내기 완료: {count}편 -> {settings.CATALOG_DIR}'))
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from moods.analysis import sample_texts
+from moods.inference import (
+    MODEL_NAME, ONNX_FILE, ONNX_INT8_FILE, OnnxClassifier, classify, compare_scores, load_classifier,
+)
+
+
+class Command(BaseCommand):
+    help = '감정 분류 모델을 ONNX(+int8 동적 양자화)로 내보내고 fp32 결과와 비교 검증합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=settings.MOOD_MODEL_PATH, help='출력 디렉토리 (기본: MOOD_MODEL_PATH)')
+        parser.add_argument('--model', default=MODEL_NAME)
+        parser.add_argument('--opset', type=int, default=17)
+        parser.add_argument('--samples', type=int, default=64, help='검증에 사용할 줄거리 수')
+        parser.add_argument('--batch-size', type=int, default=16)
+        parser.add_argument('--tolerance', type=float, default=0.05, help='fp32 대비 허용 최대 점수 오차')
+        parser.add_argument('--no-quantize', action='store_true', help='int8 양자화 모델은 만들지 않음')
+
+    def handle(self, *args, **options):
+        # pip install transformers torch onnx onnxruntime 필요
+        import torch
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        output = Path(options['output'])
+        output.mkdir(parents=True, exist_ok=True)
+
+        # 1. fp32 모델 로드 후 토크나이저/설정 저장 (ONNX 백엔드가 같은 디렉토리에서 읽음)
+        self.stdout.write(f"모델 로드: {options['model']}")
+        tokenizer = AutoTokenizer.from_pretrained(options['model'])
+        model = AutoModelForSequenceClassification.from_pretrained(options['model']).eval()
+        tokenizer.save_pretrained(output)
+        model.config.save_pretrained(output)
+
+        # 2. ONNX로 내보내기 (배치 크기, 문장 길이는 가변)
+        onnx_path = output / ONNX_FILE
+        dummy = tokenizer(['dummy text'], return_tensors='pt')
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                (dummy['input_ids'], dummy['attention_mask']),
+                str(onnx_path),
+                input_names=['input_ids', 'attention_mask'],
+                output_names=['logits'],
+                dynamic_axes={
+                    'input_ids': {0: 'batch', 1: 'sequence'},
+                    'attention_mask': {0: 'batch', 1: 'sequence'},
+                    'logits': {0: 'batch'},
+                },
+                opset_version=options['opset'],
+            )
+        self.stdout.write(f'ONNX 저장: {onnx_path} ({onnx_path.stat().st_size / 1e6:.0f}MB)')
+
+        # 3. int8 동적 양자화 (가중치만 int8, 활성값은 실행 시점에 양자화)
+        int8_path = output / ONNX_INT8_FILE
+        if not options['no_quantize']:
+            quantize_dynamic(str(onnx_path), str(int8_path), weight_type=QuantType.QInt8)
+            self.stdout.write(f'int8 모델 저장: {int8_path} ({int8_path.stat().st_size / 1e6:.0f}MB)')
+
+        # 4. 검증: fp32 transformers 결과를 기준으로 각 백엔드의 점수 오차 비교
+        texts = sample_texts(options['samples'])
+        batch_size = options['batch_size']
+        reference = classify(load_classifier(options['model']), texts, batch_size)
+
+        candidates = [('onnx fp32', lambda: OnnxClassifier(output, model_file=ONNX_FILE))]
+        if not options['no_quantize']:
+            candidates += [
+                ('onnx int8', lambda: OnnxClassifier(output, model_file=ONNX_INT8_FILE)),
+                ('torch int8', lambda: load_classifier(options['model'], backend='quantized')),
+            ]
+
+        self.stdout.write(f'검증 ({len(texts)}개 줄거리, 허용 오차 {options["tolerance"]}):')
+        failed = []
+        for name, build in candidates:
+            outputs = classify(build(), texts, batch_size)
+            max_diff, mean_diff, top1 = compare_scores(reference, outputs)
+            ok = max_diff <= options['tolerance']
+            if not ok:
+                failed.append(name)
+            style = self.style.SUCCESS if ok else self.style.ERROR
+            self.stdout.write(style(
+                f'  {name:<10} 최대 오차 {max_diff:.4f} / 평균 오차 {mean_diff:.5f} / 1위 감정 일치 {top1:.1%}'
+            ))
+
+        if 'onnx int8' in failed and int8_path.exists():
+            # 검증에 실패한 양자화 모델은 지워서 onnx 백엔드가 fp32 모델을 쓰도록 함
+            int8_path.unlink()
+        if failed:
+            raise CommandError(f'허용 오차를 넘은 백엔드: {", ".join(failed)}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'완료! .env에 MOOD_INFERENCE_BACKEND=onnx, MOOD_MODEL_PATH={output} 설정 후 사용하세요.'
+        ))
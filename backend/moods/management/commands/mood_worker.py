@@ -0,0 +1,133 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from moods.analysis import ScoreCache, build_moods, iter_movie_chunks, pending_movie_ids, save_moods
+from moods.inference import BACKENDS, MODEL_NAME, classify_safely, load_classifier, model_version
+from moods.parallel import configure_threads, default_threads
+from moods.queue import claim_jobs, complete_jobs, fail_jobs, ready_jobs
+from moods.vectors import export_mood_matrix
+from movies.similar import build_similar_index
+
+
+class Command(BaseCommand):
+    help = '감정 분석 워커: 모델을 한 번 로드해 두고 대기열(MoodQueue)에 등록된 영화를 계속 분석합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=32, help='한 번에 분석할 최대 영화 수 (기본 32)')
+        parser.add_argument(
+            '--max-wait', type=float, default=0.5,
+            help='배치가 다 차지 않았을 때 첫 작업이 들어온 뒤 더 기다릴 최대 시간 (초, 기본 0.5)',
+        )
+        parser.add_argument('--poll-interval', type=float, default=0.2, help='대기열 확인 간격 (초, 기본 0.2)')
+        parser.add_argument('--claim-timeout', type=int, default=300, help='이 시간(초)이 지나도 끝나지 않은 작업은 다시 가져감')
+        parser.add_argument('--max-attempts', type=int, default=3, help='작업당 최대 시도 횟수')
+        parser.add_argument('--threads', type=int, default=None, help='torch/ONNX 스레드 수 (기본: CPU 코어 수)')
+        parser.add_argument('--backend', choices=BACKENDS, default=settings.MOOD_INFERENCE_BACKEND, help='추론 백엔드')
+        parser.add_argument('--model-path', default=settings.MOOD_MODEL_PATH, help='onnx 백엔드 모델 디렉토리')
+        parser.add_argument('--once', action='store_true', help='대기열을 비우면 종료 (cron 등에서 사용)')
+
+    def handle(self, *args, **options):
+        self.running = True
+        # 프로세스 관리자(systemd, docker stop 등)가 보내는 SIGTERM에도 처리 중인 배치는 마치고 종료
+        signal.signal(signal.SIGTERM, self.stop)
+
+        # 1. 모델은 워커가 시작할 때 한 번만 로드
+        threads = options['threads'] or default_threads(1)
+        configure_threads(threads)
+        version = model_version(MODEL_NAME, backend=options['backend'], model_path=options['model_path'])
+        started = time.perf_counter()
+        self.classifier = load_classifier(
+            MODEL_NAME, backend=options['backend'], model_path=options['model_path'], threads=threads
+        )
+        self.cache = ScoreCache(version)
+        self.dirty = False  # 마지막 행렬 내보내기 이후 저장한 결과가 있는지
+        self.stdout.write(self.style.SUCCESS(
+            f'모델 로드 완료 ({time.perf_counter() - started:.1f}초, {version}). 대기열을 기다립니다...'
+        ))
+
+        # 2. 대기열 확인 -> 배치가 차거나 max-wait가 지나면 가져가서 분석
+        # 감정 벡터 행렬은 배치마다가 아니라 대기열이 빌 때 한 번에 다시 내보냄
+        try:
+            while self.running:
+                if not self.wait_for_batch(options):
+                    if self.dirty:
+                        self.export_matrix()
+                    if options['once']:
+                        break
+                    continue
+                self.process_batch(version, options)
+        except KeyboardInterrupt:
+            pass
+        if self.dirty:
+            self.export_matrix()
+        self.stdout.write('워커를 종료합니다.')
+
+    def stop(self, signum, frame):
+        self.running = False
+
+    def export_matrix(self):
+        count = export_mood_matrix()
+        self.dirty = False
+        self.stdout.write(f'감정 벡터 행렬 내보내기 완료 ({count}편)')
+        # 새로 분석한 영화(get_tmdb가 대기열에 넣은 신작 등)도 비슷한 영화 인덱스에 들어가도록 다시 계산
+        if build_similar_index():
+            self.stdout.write('비슷한 영화 인덱스 갱신 완료')
+
+    def wait_for_batch(self, options):
+        """
+        마이크로 배칭: 대기 작업이 batch_size개 모이거나, 가장 오래된 작업이 max-wait만큼 기다렸으면 True
+        """
+        jobs = ready_jobs(options['claim_timeout'])
+        oldest = jobs.order_by('enqueued_at').values_list('enqueued_at', flat=True).first()
+        if oldest is None:
+            if not options['once']:
+                time.sleep(options['poll_interval'])
+            return False
+
+        waited = (timezone.now() - oldest).total_seconds()
+        if waited >= options['max_wait'] or options['once']:
+            return True
+        if jobs.count() >= options['batch_size']:
+            return True
+        time.sleep(min(options['poll_interval'], options['max_wait'] - waited))
+        return False
+
+    def process_batch(self, version, options):
+        claimed_at, jobs = claim_jobs(options['batch_size'], options['claim_timeout'])
+        if not jobs:
+            return
+        started = time.perf_counter()
+
+        # 이미 같은 줄거리/모델로 분석된 영화, 영문 줄거리가 없는 영화는 추론 없이 완료 처리
+        movie_ids = pending_movie_ids(version, [job.movie_id for job in jobs])
+        errors = {}
+        saved = 0
+        for chunk in iter_movie_chunks(movie_ids, options['batch_size'], self.cache):
+            outputs, chunk_errors = (
+                classify_safely(self.classifier, chunk.texts, options['batch_size']) if chunk.texts else ([], [])
+            )
+            moods = build_moods(chunk, outputs, version)
+            save_moods(moods)
+            self.cache.add(chunk.text_hashes, outputs)
+            saved += len(moods)
+            self.dirty = self.dirty or bool(moods)
+
+            failed_hashes = {chunk.text_hashes[index]: message for index, message in chunk_errors}
+            for movie, h in zip(chunk.movies, chunk.hashes):
+                if h in failed_hashes:
+                    errors[movie.pk] = failed_hashes[h]
+
+        failed = [job for job in jobs if job.movie_id in errors]
+        complete_jobs([job for job in jobs if job.movie_id not in errors], claimed_at)
+        dropped = fail_jobs(failed, claimed_at, errors, options['max_attempts']) if failed else 0
+
+        latency = (timezone.now() - min(job.enqueued_at for job in jobs)).total_seconds()
+        self.stdout.write(
+            f'{len(jobs)}편 처리: 분석 {saved}편 / 건너뜀 {len(jobs) - len(movie_ids)}편 / 실패 {len(failed)}편 '
+            f'(포기 {dropped}편) / 배치 {time.perf_counter() - started:.2f}초, 등록 후 최대 {latency:.1f}초'
+        )
+        for movie_id, message in errors.items():
+            self.stdout.write(self.style.ERROR(f'Error analyzing movie #{movie_id}: {message}'))
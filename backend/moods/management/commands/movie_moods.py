@@ -1,69 +1,94 @@
-﻿# moods/management/commands/analyze_emotions.py
+﻿# moods/management/commands/movie_moods.py
+import time
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from movies.models import Movie
-from moods.models import MovieMood
-from transformers import pipeline # pip install transformers torch 필요
+from moods.analysis import ScoreCache, analyze_sequential, build_moods, iter_movie_chunks, pending_movie_ids, save_moods
+from moods.inference import BACKENDS, MODEL_NAME, load_classifier, model_version
+from moods.parallel import analyze_parallel, default_threads
+from moods.vectors import export_mood_matrix, load_mood_matrix
+from movies.catalog import bump_catalog_version
+from movies.similar import build_similar_index
 from tqdm import tqdm # 진행률 표시바 (pip install tqdm)
 
+
 class Command(BaseCommand):
-		help = '영화 영문 줄거리를 AI로 분석하여 감정 데이터를 저장합니다.'
+    help = '영화 영문 줄거리를 AI로 분석하여 감정 데이터를 저장합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=32, help='모델에 한 번에 넣을 줄거리 수 (기본 32)')
+        parser.add_argument('--chunk-size', type=int, default=256, help='DB에서 한 번에 읽고 저장할 영화 수 (기본 256)')
+        parser.add_argument('--workers', type=int, default=1, help='분석 프로세스 수 (기본 1, 2 이상이면 프로세스 풀 사용)')
+        parser.add_argument('--threads', type=int, default=None, help='워커당 torch 스레드 수 (기본: CPU 코어 수 / 워커 수)')
+        parser.add_argument('--backend', choices=BACKENDS, default=settings.MOOD_INFERENCE_BACKEND, help='추론 백엔드')
+        parser.add_argument('--model-path', default=settings.MOOD_MODEL_PATH, help='onnx 백엔드 모델 디렉토리')
+
+    def handle(self, *args, **options):
+        # 1. 분석할 영화 확인 (분석 결과가 없거나, 줄거리/모델이 바뀐 영화)
+        version = model_version(MODEL_NAME, backend=options['backend'], model_path=options['model_path'])
+        movie_ids = pending_movie_ids(version)
+        total = len(movie_ids)
+        if not total:
+            self.stdout.write(self.style.SUCCESS('분석할 새로운 영화가 없습니다.'))
+            if load_mood_matrix() is None:
+                self.export_matrix()
+            return
 
-		def handle(self, *args, **options):
-				# 1. 분석할 영화 가져오기 (이미 분석된 건 제외하고, 영문 줄거리가 있는 것만)
-				movies = Movie.objects.filter(mood_result__isnull=True).exclude(overview_en='')
-				
-				if not movies.exists():
-						self.stdout.write(self.style.SUCCESS('분석할 새로운 영화가 없습니다.'))
-						return
+        self.stdout.write(f'총 {total}개의 영화 분석을 시작합니다... (모델: {version})')
 
-				self.stdout.write(f'총 {movies.count()}개의 영화 분석을 시작합니다...')
+        # 2. 청크 단위로 읽고 -> 캐시에 없는 줄거리만 배치 추론 -> 한 번에 저장
+        # --workers 2 이상이면 워커 프로세스들이 추론하고, 저장은 이 프로세스 하나가 담당합니다.
+        cache = ScoreCache(version)
+        chunks = iter_movie_chunks(movie_ids, options['chunk_size'], cache)
+        workers = options['workers']
+        if workers > 1:
+            threads = options['threads'] or default_threads(workers)
+            self.stdout.write(f'워커 {workers}개 x torch 스레드 {threads}개로 분석합니다.')
+            results = analyze_parallel(
+                chunks, workers, options['batch_size'], threads=threads,
+                backend=options['backend'], model_path=options['model_path'],
+            )
+        else:
+            # AI 모델 로드 (Hugging Face)
+            classifier = load_classifier(MODEL_NAME, backend=options['backend'], model_path=options['model_path'])
+            results = analyze_sequential(classifier, chunks, options['batch_size'])
 
-				# 2. AI 모델 로드 (Hugging Face)
-				# 추천드렸던 28가지 감정 모델 사용
-				classifier = pipeline(
-						task="text-classification", 
-						model="SamLowe/roberta-base-go_emotions", 
-						top_k=None, # 모든 감정 점수 다 가져오기
-						truncation=True # 긴 줄거리 잘라서 에러 방지
-				)
+        started = time.perf_counter()
+        db_seconds = 0.0
+        analyzed = 0
+        inferred = 0
 
-				# 3. 하나씩 분석 후 저장
-				for movie in tqdm(movies):
-					try:
-						# 줄거리 분석 실행
-						outputs = classifier(movie.overview_en)
-						# outputs 예시: [[{'label': 'realization', 'score': 0.8}, ...]]
-						
-						scores = outputs[0] # 첫 번째 결과 리스트
-						# scores 예시: [
-						#   {'label': 'neutral', 'score': 0.85}, 
-						#   {'label': 'sadness', 'score': 0.12}, 
-						#   {'label': 'fear', 'score': 0.03}
-						# ]
+        with tqdm(total=total) as progress:
+            for chunk, outputs, errors in results:
+                for index, message in errors:
+                    self.stdout.write(self.style.ERROR(f'Error analyzing {chunk.text_movies[index].title}: {message}'))
 
-						# [수정된 로직] neutral 건너뛰기
-						dominant_mood = None
-						
-						for mood in scores:
-								if mood['label'] == 'neutral':
-										continue # 뉴트럴이면 다음 껄로 넘어감
-								
-								# 뉴트럴이 아닌 것 중 점수가 가장 높은 것 당첨
-								dominant_mood = mood['label']
-								break
-						
-						# 만약 모든게 neutral이거나 점수가 너무 낮으면? (안전장치)
-						if not dominant_mood:
-								dominant_mood = 'neutral' # 어쩔 수 없이 neutral 저장
+                t0 = time.perf_counter()
+                moods = build_moods(chunk, outputs, version)
+                save_moods(moods)
+                cache.add(chunk.text_hashes, outputs)
+                db_seconds += time.perf_counter() - t0
 
-						# DB 저장
-						MovieMood.objects.create(
-								movie=movie,
-								dominant_mood=dominant_mood, # 2등이 저장됨 (예: sadness)
-								score_details=scores
-						)
+                analyzed += len(moods)
+                inferred += len(chunk.texts) - len(errors)
+                progress.update(len(chunk))
 
-					except Exception as e:
-						self.stdout.write(self.style.ERROR(f'Error analyzing {movie.title}: {str(e)}'))
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'모든 영화의 감정 분석이 완료되었습니다! ({analyzed}/{total}편)'))
+        self.stdout.write(
+            f'{elapsed:.1f}초 / {analyzed / elapsed:.1f} movies/sec '
+            f'(모델 추론 {inferred}편, 캐시 재사용 {analyzed - inferred}편, DB 저장 {db_seconds:.2f}초, '
+            f'backend={options["backend"]}, batch_size={options["batch_size"]}, workers={workers})'
+        )
+        if analyzed:
+            self.export_matrix()
 
-				self.stdout.write(self.style.SUCCESS('모든 영화의 감정 분석이 완료되었습니다!'))
\ No newline at end of file
+    def export_matrix(self):
+        # 3. API 워커가 mmap으로 읽는 (영화 수 x 28) 감정 벡터 행렬 내보내기
+        count = export_mood_matrix()
+        self.stdout.write(f'감정 벡터 행렬 내보내기 완료 ({count}편)')
+        # 감정 벡터가 바뀌었으므로 비슷한 영화 인덱스도 다시 계산
+        if build_similar_index():
+            self.stdout.write('비슷한 영화 인덱스 갱신 완료')
+        # 워커들의 카탈로그 버전(영화 API ETag, 캐시된 응답)도 새로 고치도록 알림
+        bump_catalog_version()
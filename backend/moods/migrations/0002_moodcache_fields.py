@@ -0,0 +1,52 @@
+# Generated by Django 5.2 on 2026-10-18 15:44
+
+import hashlib
+
+from django.db import migrations, models
+
+# 이 마이그레이션 이전의 분석 결과는 모두 기본 transformers 백엔드로 만든 것
+PREVIOUS_MODEL_VERSION = 'SamLowe/roberta-base-go_emotions'
+BATCH_SIZE = 500
+
+
+def backfill(apps, schema_editor):
+    """
+    기존 분석 결과를 현재 줄거리 기준으로 채워서, 마이그레이션 직후 전체를 다시 분석하지 않도록 합니다.
+    (BATCH_SIZE개씩 읽고 저장해서 전체를 메모리에 올리지 않음)
+    """
+    MovieMood = apps.get_model('moods', 'MovieMood')
+    rows = MovieMood.objects.values_list('id', 'movie__overview_en')
+    batch = []
+    for mood_id, overview_en in rows.iterator(chunk_size=BATCH_SIZE):
+        text = overview_en or ''
+        batch.append(MovieMood(
+            id=mood_id,
+            text_hash=hashlib.sha256(text.encode('utf-8')).hexdigest(),
+            model_version=PREVIOUS_MODEL_VERSION,
+        ))
+        if len(batch) >= BATCH_SIZE:
+            MovieMood.objects.bulk_update(batch, ['text_hash', 'model_version'])
+            batch = []
+    if batch:
+        MovieMood.objects.bulk_update(batch, ['text_hash', 'model_version'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('moods', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moviemood',
+            name='model_version',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='moviemood',
+            name='text_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
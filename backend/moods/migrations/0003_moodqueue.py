@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 15:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('moods', '0002_moodcache_fields'),
+        ('movies', '0006_ingestionjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MoodQueue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('enqueued_at', models.DateTimeField(db_index=True)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('attempts', models.IntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('movie', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='mood_queue', to='movies.movie')),
+            ],
+        ),
+    ]
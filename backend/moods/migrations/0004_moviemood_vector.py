@@ -0,0 +1,54 @@
+# Generated by Django 5.2 on 2026-10-18 15:48
+
+import numpy as np
+from django.db import migrations, models
+
+# 마이그레이션 시점의 저장 형식 (moods.vectors와 같지만, 앱 코드가 바뀌어도 이 마이그레이션은 그대로 동작하도록 복사)
+# go_emotions 라벨 순서의 리틀 엔디언 float32 x 28
+MOOD_LABELS = [
+    'admiration', 'amusement', 'anger', 'annoyance', 'approval', 'caring', 'confusion',
+    'curiosity', 'desire', 'disappointment', 'disapproval', 'disgust', 'embarrassment',
+    'excitement', 'fear', 'gratitude', 'grief', 'joy', 'love', 'nervousness', 'optimism',
+    'pride', 'realization', 'relief', 'remorse', 'sadness', 'surprise', 'neutral',
+]
+LABEL_INDEX = {label: i for i, label in enumerate(MOOD_LABELS)}
+BATCH_SIZE = 500
+
+
+def pack_scores(scores):
+    vector = np.zeros(len(MOOD_LABELS), dtype='<f4')
+    for item in scores or []:
+        index = LABEL_INDEX.get(item['label'])
+        if index is not None:
+            vector[index] = item['score']
+    return vector.tobytes()
+
+
+def backfill(apps, schema_editor):
+    # 기존 분석 결과의 score_details로 벡터 채우기 (BATCH_SIZE개씩)
+    MovieMood = apps.get_model('moods', 'MovieMood')
+    batch = []
+    for mood in MovieMood.objects.only('id', 'score_details').iterator(chunk_size=BATCH_SIZE):
+        mood.vector = pack_scores(mood.score_details)
+        batch.append(mood)
+        if len(batch) >= BATCH_SIZE:
+            MovieMood.objects.bulk_update(batch, ['vector'])
+            batch = []
+    if batch:
+        MovieMood.objects.bulk_update(batch, ['vector'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('moods', '0003_moodqueue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moviemood',
+            name='vector',
+            field=models.BinaryField(blank=True, default=b''),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -22,5 +22,31 @@ class MovieMood(models.Model):
     # 4. 분석일 (언제 분석했는지 기록)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # 5. 분석에 사용한 입력/모델 (둘 중 하나라도 바뀌면 movie_moods가 다시 분석)
+    # text_hash: 분석한 overview_en의 sha256 (같은 줄거리면 다른 영화의 결과를 그대로 재사용)
+    # model_version: moods.inference.model_version() 값
+    text_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    model_version = models.CharField(max_length=100, blank=True)
+
+    # 6. 전체 감정 점수를 moods.vectors.MOOD_LABELS 순서로 고정한 float32 x 28 벡터 (112 bytes)
+    # 추천/유사도 계산은 JSON 대신 이 값(또는 내보낸 행렬 파일)을 사용합니다.
+    vector = models.BinaryField(default=b'', blank=True)
+
+    def __str__(self):
+        return f"[{self.dominant_mood}] {self.movie.title}"
+
+
+class MoodQueue(models.Model):
+    """
+    감정 분석 대기열 (mood_worker가 모델을 한 번만 로드해 두고 계속 처리)
+    영화당 1행만 유지하며, 처리 중에 다시 등록되면 claimed_at이 비워져서 한 번 더 분석됩니다.
+    """
+    movie = models.OneToOneField(Movie, on_delete=models.CASCADE, related_name='mood_queue')
+    enqueued_at = models.DateTimeField(db_index=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)  # 워커가 가져간 시각 (None이면 대기 중)
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
     def __str__(self):
-        return f"[{self.dominant_mood}] {self.movie.title}"
\ No newline at end of file
+        state = 'claimed' if self.claimed_at else 'waiting'
+        return f"[{state}] movie #{self.movie_id} (attempts {self.attempts})"
@@ -0,0 +1,94 @@
+"""
+여러 프로세스로 감정 분석 (movie_moods --workers N)
+
+- 각 워커 프로세스는 시작할 때 모델을 한 번만 로드합니다.
+- 워커마다 torch 스레드 수를 (CPU 코어 수 / 워커 수)로 제한해서 코어를 서로 빼앗지 않도록 합니다.
+- 부모 프로세스가 영화 청크를 나눠 주고(샤딩), 결과를 받아서 혼자 DB에 저장합니다.
+  (SQLite는 동시에 여러 곳에서 쓰면 잠금 에러가 나므로 쓰기는 부모 프로세스 하나만 담당)
+"""
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .inference import MODEL_NAME, classify_safely, load_classifier
+
+_classifier = None
+
+
+def default_threads(workers):
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def configure_threads(threads):
+    # torch를 import하기 전에 설정해야 OpenMP/MKL 스레드 풀 크기에 반영됩니다.
+    for name in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[name] = str(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except ImportError:
+        pass
+
+
+def init_worker(model_name, threads, backend='transformers', model_path=None):
+    global _classifier
+
+    configure_threads(threads)
+    _classifier = load_classifier(model_name, backend=backend, model_path=model_path, threads=threads)
+
+
+def classify_in_worker(texts, batch_size):
+    return classify_safely(_classifier, texts, batch_size)
+
+
+def analyze_parallel(chunks, workers, batch_size, threads=None, model_name=MODEL_NAME, backend='transformers',
+                     model_path=None, max_in_flight=None):
+    """
+    chunks: 청크(moods.analysis.MoodChunk)를 돌려주는 iterable (chunk.texts를 추론)
+    완료되는 순서대로 (청크, 결과 리스트, 에러 리스트)를 돌려줍니다.
+    추론할 텍스트가 없는 청크(모두 캐시에 있는 경우)는 워커에 보내지 않고 바로 돌려줍니다.
+
+    청크를 한꺼번에 다 넘기지 않고 최대 max_in_flight개만 워커에 맡겨 두기 때문에
+    DB 읽기도 메인 스레드에서 조금씩 진행됩니다.
+    """
+    threads = threads or default_threads(workers)
+    max_in_flight = max_in_flight or workers * 2
+    chunks = iter(chunks)
+
+    # spawn: 부모의 DB 커넥션 등을 물려받지 않는 깨끗한 프로세스로 시작 (Windows와 동작 동일)
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=init_worker,
+        initargs=(model_name, threads, backend, model_path),
+    ) as executor:
+        in_flight = {}
+        ready = []
+
+        def submit_next():
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            if not chunk.texts:
+                ready.append(chunk)
+                return True
+            future = executor.submit(classify_in_worker, chunk.texts, batch_size)
+            in_flight[future] = chunk
+            return True
+
+        def fill():
+            # 워커에 max_in_flight개가 찰 때까지 청크를 읽고, 캐시로 끝난 청크는 바로 돌려줌
+            while len(in_flight) < max_in_flight and submit_next():
+                while ready:
+                    yield ready.pop(), [], []
+
+        yield from fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = in_flight.pop(future)
+                outputs, errors = future.result()
+                yield from fill()
+                yield chunk, outputs, errors
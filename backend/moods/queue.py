@@ -0,0 +1,85 @@
+"""
+감정 분석 대기열 (MoodQueue)
+
+- enqueue_movies(): 수집(get_tmdb)이나 API에서 분석할 영화를 등록 (모델 로드 없이 DB 1회 쓰기)
+- enqueue_changed_movies(): 수집한 영화 중 영문 줄거리가 분석 때와 달라진 영화만 등록
+  (인기도 / 투표 수만 바뀐 영화까지 매번 다시 등록하지 않도록)
+- mood_worker 명령어가 대기열을 가져가서(claim) 묶음으로 분석한 뒤 완료/실패 처리
+
+가져간 뒤 claim_timeout이 지나도 끝나지 않은 작업(워커가 죽은 경우)은 다시 대기 상태로 봅니다.
+"""
+from datetime import timedelta
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from movies.models import Movie
+from .analysis import text_hash
+from .models import MoodQueue
+
+
+def enqueue_movies(movie_ids):
+    """
+    movie_ids: Movie pk 목록. 이미 대기열에 있으면 대기 상태로 되돌려서 다시 분석되도록 합니다.
+    """
+    now = timezone.now()
+    MoodQueue.objects.bulk_create(
+        [MoodQueue(movie_id=movie_id, enqueued_at=now) for movie_id in set(movie_ids)],
+        update_conflicts=True,
+        unique_fields=['movie'],
+        update_fields=['enqueued_at', 'claimed_at'],
+    )
+
+
+def enqueue_changed_movies(movie_ids):
+    """
+    get_tmdb의 on_write: 저장한 영화 중 분석 결과가 없거나 overview_en의 해시가 저장된 text_hash와 다른 영화만 등록
+    반환값: 등록한 영화 수
+    """
+    rows = Movie.objects.filter(pk__in=movie_ids).values_list('pk', 'overview_en', 'mood_result__text_hash')
+    changed = [pk for pk, overview_en, saved_hash in rows if overview_en and saved_hash != text_hash(overview_en)]
+    if changed:
+        enqueue_movies(changed)
+    return len(changed)
+
+
+def ready_jobs(claim_timeout):
+    expired = timezone.now() - timedelta(seconds=claim_timeout)
+    return MoodQueue.objects.filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=expired))
+
+
+def claim_jobs(limit, claim_timeout):
+    """
+    대기 중인 작업을 오래된 순으로 limit개까지 가져갑니다.
+    반환값: (claimed_at, [MoodQueue, ...]) - 완료/실패 처리할 때 claimed_at이 같은 행만 건드립니다.
+    """
+    ids = list(ready_jobs(claim_timeout).order_by('enqueued_at').values_list('pk', flat=True)[:limit])
+    if not ids:
+        return None, []
+    claimed_at = timezone.now()
+    # 같은 작업을 다른 워커가 먼저 가져갔으면 update 조건에 걸리지 않음
+    ready_jobs(claim_timeout).filter(pk__in=ids).update(claimed_at=claimed_at, attempts=F('attempts') + 1)
+    return claimed_at, list(MoodQueue.objects.filter(pk__in=ids, claimed_at=claimed_at))
+
+
+def complete_jobs(jobs, claimed_at):
+    # 처리 중에 다시 등록된 작업은 claimed_at이 바뀌었으므로 지우지 않음
+    MoodQueue.objects.filter(pk__in=[job.pk for job in jobs], claimed_at=claimed_at).delete()
+
+
+def fail_jobs(jobs, claimed_at, errors, max_attempts):
+    """
+    errors: {movie_id: 에러 메시지}
+    max_attempts번 실패한 작업은 대기열에서 지우고 (movie_moods 일괄 분석 때 다시 시도),
+    나머지는 대기 상태로 되돌립니다.
+    반환값: 포기한 작업 수
+    """
+    dropped = [job for job in jobs if job.attempts >= max_attempts]
+    MoodQueue.objects.filter(pk__in=[job.pk for job in dropped], claimed_at=claimed_at).delete()
+
+    retry = [job for job in jobs if job.attempts < max_attempts]
+    for job in retry:
+        job.last_error = errors.get(job.movie_id, '')
+        job.claimed_at = None
+    MoodQueue.objects.bulk_update(retry, ['last_error', 'claimed_at'])
+    return len(dropped)
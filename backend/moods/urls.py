@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    # 감정 분석 요청 (POST): /api/v1/moods/analyze/
+    path('analyze/', views.analyze_movies, name='analyze_movies'),
+    # 감정 분석 상태 (GET): /api/v1/moods/12345/
+    path('<int:movie_pk>/', views.mood_status, name='mood_status'),
+]
@@ -0,0 +1,117 @@
+"""
+감정 점수 벡터 (float32 x 28)
+
+score_details(JSON 리스트)는 라벨 순서가 점수순이라 영화마다 다릅니다.
+MOOD_LABELS 순서로 고정한 float32 벡터를 MovieMood.vector에 바이트로 저장하고,
+전체 영화의 벡터를 (영화 수 x 28) 행렬 파일로 내보내서 API 워커가 mmap으로 읽습니다.
+
+    matrix = load_mood_matrix()
+    if matrix:
+        scores = matrix.arrays['vectors'] @ weights   # 영화 전체를 한 번에 계산
+        tmdb_ids = matrix.arrays['tmdb_ids']
+"""
+import numpy as np
+from django.dispatch import Signal
+
+from movies.catalog import ArrayStore, write_arrays
+from movies.models import Genre, Movie
+from .models import MovieMood
+
+# go_emotions 모델의 라벨 순서 (config.id2label)
+MOOD_LABELS = [
+    'admiration', 'amusement', 'anger', 'annoyance', 'approval', 'caring', 'confusion',
+    'curiosity', 'desire', 'disappointment', 'disapproval', 'disgust', 'embarrassment',
+    'excitement', 'fear', 'gratitude', 'grief', 'joy', 'love', 'nervousness', 'optimism',
+    'pride', 'realization', 'relief', 'remorse', 'sadness', 'surprise', 'neutral',
+]
+LABEL_INDEX = {label: i for i, label in enumerate(MOOD_LABELS)}
+VECTOR_DTYPE = np.dtype('<f4')  # 리틀 엔디언 float32 (저장 형식 고정)
+
+MATRIX_NAME = 'mood_vectors'
+_matrix_store = ArrayStore(MATRIX_NAME)
+
+# 행렬을 새로 내보낸 뒤 발생 (recommends 앱이 기분별 후보 풀을 다시 만듦)
+mood_matrix_exported = Signal()
+
+
+def scores_to_vector(scores):
+    """
+    [{'label': 'sadness', 'score': 0.8}, ...] -> MOOD_LABELS 순서의 float32 벡터
+    """
+    vector = np.zeros(len(MOOD_LABELS), dtype=VECTOR_DTYPE)
+    for item in scores:
+        index = LABEL_INDEX.get(item['label'])
+        if index is not None:
+            vector[index] = item['score']
+    return vector
+
+
+def pack_scores(scores):
+    return scores_to_vector(scores).tobytes()
+
+
+def unpack_vector(data):
+    return np.frombuffer(data, dtype=VECTOR_DTYPE)
+
+
+def export_mood_matrix():
+    """
+    벡터가 있는 모든 영화의 (영화 수 x 28) 행렬을 CATALOG_DIR에 내보냅니다. (pk 순서)
+    추천 점수에 같이 쓰는 popularity / vote_average와 장르 행렬(영화 수 x 장르 수, 행 합 1)도
+    같은 순서로 함께 내보내므로
+    감정 분석뿐 아니라 영화 수집(get_tmdb)이 끝난 뒤에도 다시 내보냅니다.
+    반환값: 내보낸 영화 수
+    """
+    rows = (
+        MovieMood.objects
+        .exclude(vector=b'')
+        .order_by('movie_id')
+        .values_list('movie_id', 'movie__tmdb_id', 'movie__popularity', 'movie__vote_average', 'vector')
+    )
+    movie_ids, tmdb_ids, popularity, vote_average, vectors = [], [], [], [], []
+    for movie_id, tmdb_id, movie_popularity, movie_vote_average, vector in rows.iterator(chunk_size=2000):
+        movie_ids.append(movie_id)
+        tmdb_ids.append(tmdb_id)
+        popularity.append(movie_popularity)
+        vote_average.append(movie_vote_average)
+        vectors.append(bytes(vector))
+
+    # 열 우선(Fortran) 순서로 저장: 감정 하나의 전체 영화 점수가 연속된 메모리라서
+    # 가중치가 있는 감정 몇 개만 읽으면 되는 추천 점수 계산이 행렬 전체를 훑지 않아도 됨
+    matrix = np.frombuffer(b''.join(vectors), dtype=VECTOR_DTYPE).reshape(-1, len(MOOD_LABELS))
+    matrix = np.asfortranarray(matrix)
+
+    # 장르 원-핫 (장르가 여러 개면 나눠서 행 합이 1), 열 순서는 meta의 genre_ids
+    genre_ids = list(Genre.objects.order_by('tmdb_id').values_list('tmdb_id', flat=True))
+    genre_index = {genre_id: i for i, genre_id in enumerate(genre_ids)}
+    row_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+    genres = np.zeros((len(movie_ids), len(genre_ids)), dtype=np.float32, order='F')
+    links = Movie.genres.through.objects.values_list('movie_id', 'genre__tmdb_id')
+    for movie_id, genre_id in links.iterator(chunk_size=2000):
+        row = row_index.get(movie_id)
+        if row is not None:
+            genres[row, genre_index[genre_id]] = 1.0
+    counts = genres.sum(axis=1, keepdims=True)
+    np.divide(genres, counts, out=genres, where=counts > 0)
+    version = write_arrays(
+        MATRIX_NAME,
+        {
+            'vectors': matrix,
+            'movie_ids': np.array(movie_ids, dtype=np.int64),
+            'tmdb_ids': np.array(tmdb_ids, dtype=np.int64),
+            'popularity': np.array(popularity, dtype=np.float32),
+            'vote_average': np.array(vote_average, dtype=np.float32),
+            'genres': genres,
+        },
+        labels=MOOD_LABELS,
+        genre_ids=genre_ids,
+    )
+    mood_matrix_exported.send(sender=None, version=version)
+    return len(movie_ids)
+
+
+def load_mood_matrix(refresh=False):
+    """
+    내보낸 행렬 (없으면 None). 파일이 교체되면 다음 호출부터 새 행렬을 돌려줍니다.
+    """
+    return _matrix_store.get(refresh=refresh)
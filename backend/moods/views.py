@@ -1,3 +1,43 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-# Create your views here.
+from movies.models import Movie
+from .models import MoodQueue
+from .queue import enqueue_movies
+
+
+# 1. 감정 분석 요청 (mood_worker가 몇 초 안에 분석)
+# 요청 예시: POST /moods/analyze/ { "movie_ids": [101, 102] }  (tmdb_id)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def analyze_movies(request):
+    ids = request.data.get('movie_ids', [])
+    if not isinstance(ids, list) or not ids:
+        return Response({'error': 'movie_ids is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    id_list = [int(id) for id in ids if str(id).isdigit()][:100]
+    movie_pks = list(
+        Movie.objects
+        .filter(tmdb_id__in=id_list, overview_en__isnull=False)
+        .exclude(overview_en='')
+        .values_list('pk', flat=True)
+    )
+    enqueue_movies(movie_pks)
+    return Response({'queued': len(movie_pks)}, status=status.HTTP_202_ACCEPTED)
+
+
+# 2. 감정 분석 상태 조회: GET /moods/12345/ (tmdb_id)
+@api_view(['GET'])
+def mood_status(request, movie_pk):
+    movie = get_object_or_404(Movie.objects.select_related('mood_result'), tmdb_id=movie_pk)
+    queued = MoodQueue.objects.filter(movie=movie).exists()
+    mood = getattr(movie, 'mood_result', None)
+
+    context = {
+        'status': 'queued' if queued else ('done' if mood else 'none'),
+        'dominant_mood': mood.dominant_mood if mood else None,
+    }
+    return Response(context)
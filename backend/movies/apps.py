@@ -4,3 +4,21 @@ from django.apps import AppConfig
 class MoviesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'movies'
+
+    def ready(self):
+        # 영화 한 편을 저장/삭제하면(관리자 페이지 등) 카탈로그 버전을 올려서
+        # 워커마다 메모리에 만들어 둔 인덱스(자동완성 등)를 다시 만들게 함
+        # (get_tmdb의 일괄 저장은 시그널이 없으므로 명령어 끝에서 직접 올림)
+        from django.contrib.auth import get_user_model
+        from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+        from .catalog import on_movie_changed
+        from .counters import on_like_changed, on_user_deleted
+        from .models import Movie
+
+        post_save.connect(on_movie_changed, sender=Movie, dispatch_uid='catalog_movie_saved')
+        post_delete.connect(on_movie_changed, sender=Movie, dispatch_uid='catalog_movie_deleted')
+
+        # 찜할 때마다 찜한 사람 수 컬럼(like_count)을 같은 트랜잭션에서 갱신
+        m2m_changed.connect(on_like_changed, sender=Movie.like_users.through, dispatch_uid='counter_movie_liked')
+        # 유저를 지우면 CASCADE로 찜 / 리뷰 좋아요 행이 시그널 없이 지워지므로 미리 수를 뺌 (리뷰 포함)
+        pre_delete.connect(on_user_deleted, sender=get_user_model(), dispatch_uid='counter_user_deleted')
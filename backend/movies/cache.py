@@ -0,0 +1,314 @@
+"""
+API 응답 캐시 (워커 프로세스 메모리 LRU + 공유 캐시 2단)
+
+    @api_view(['GET', 'POST'])
+    @cache_response(lambda request, review_pk: ['users', f'review:{review_pk}'])
+    def comment_list_create(request, review_pk): ...
+
+- 1단: 워커마다 메모리에 LOCAL_CACHE_SIZE개까지 (LRU)
+- 2단: settings.CACHES['default'] (기본은 파일 캐시라 같은 서버의 워커들이 공유,
+  CACHE_BACKEND / CACHE_LOCATION 설정으로 Redis 등으로 바꿀 수 있음)
+- 무효화는 짧은 TTL 대신 범위(scope)별 세대 번호로 합니다.
+  응답 키에 그 응답이 의존하는 범위들의 세대 번호를 넣어 두고, 데이터가 바뀌면 시그널 핸들러가
+  invalidate(범위)로 세대를 올립니다. 이전 세대의 키는 다시 읽히지 않고 LRU / 캐시 만료로 사라집니다.
+- 세대 번호는 공유 캐시에 저장해서 요청마다 한 번(get_many) 읽고,
+  'catalog' 범위는 영화 데이터 버전 스탬프(movies.catalog.catalog_version)를 그대로 사용합니다.
+- 캐시가 비었을 때 같은 키를 동시에 요청하면 한 요청만 계산합니다. (SingleFlight)
+  같은 워커의 스레드는 Event로, 다른 워커 프로세스끼리는 공유 캐시 add() 락으로 기다리고,
+  같은 URL의 이전 세대 응답이 있으면 기다리지 않고 그 응답을 바로 돌려줍니다. (stale-while-revalidate)
+- 카탈로그 스냅샷에서 응답하는 API(@catalog_etag)는 스냅샷 버전으로 ETag를 붙이고,
+  If-None-Match가 같으면 뷰를 실행하지 않고 304를 돌려줍니다. (브라우저 / CDN이 다시 받지 않도록)
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .catalog import catalog_version
+from .snapshot import get_snapshot
+
+CACHE_ALIAS = 'default'
+LOCAL_CACHE_SIZE = 1024             # 워커마다 메모리에 두는 응답 수
+RESPONSE_TIMEOUT = 60 * 60 * 24     # 공유 캐시의 응답 보관 시간 (무효화는 세대 번호로 하므로 길게)
+KEY_PREFIX = 'api'
+
+LOCK_TIMEOUT = 30           # 계산 중 락의 최대 유지 시간 (계산하던 워커가 죽어도 풀리도록)
+WAIT_TIMEOUT = 10           # 다른 요청의 계산을 기다리는 최대 시간 (넘으면 직접 계산)
+POLL_INTERVAL = 0.05        # 다른 워커의 계산 결과를 확인하는 간격
+
+CATALOG_MAX_AGE = 60        # 브라우저 / CDN이 ETag 확인 없이 재사용하는 시간 (초)
+
+CATALOG_SCOPE = 'catalog'   # 영화 데이터 (get_tmdb, 관리자 수정)
+USERS_SCOPE = 'users'       # 닉네임 등 응답에 들어가는 유저 정보
+
+MISSING = object()
+
+
+class LocalLRU:
+    def __init__(self, maxsize=LOCAL_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class TwoTierCache:
+    def __init__(self, alias=CACHE_ALIAS, local_size=LOCAL_CACHE_SIZE):
+        self.alias = alias
+        self.local = LocalLRU(local_size)
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def get(self, key):
+        value = self.local.get(key, MISSING)
+        if value is MISSING:
+            value = self.shared.get(key, MISSING)
+            if value is not MISSING:
+                self.local.set(key, value)
+        return value
+
+    def set(self, key, value, timeout=RESPONSE_TIMEOUT):
+        self.local.set(key, value)
+        self.shared.set(key, value, timeout)
+
+    def delete(self, key):
+        self.local.delete(key)
+        self.shared.delete(key)
+
+    def generations(self, scopes):
+        """
+        [(범위, 세대), ...] - 세대를 알 수 없으면(캐시를 쓸 수 없는 백엔드 등) None
+        """
+        keys = {scope: generation_key(scope) for scope in scopes if scope != CATALOG_SCOPE}
+        found = self.shared.get_many(list(keys.values())) if keys else {}
+        result = []
+        for scope in scopes:
+            if scope == CATALOG_SCOPE:
+                result.append((scope, catalog_version.get()))
+                continue
+            generation = found.get(keys[scope])
+            if generation is None:
+                # 처음이거나 캐시에서 밀려난 범위 -> 지금 시각으로 시작 (예전 세대 번호로 돌아가지 않도록)
+                self.shared.add(keys[scope], time.time_ns(), None)
+                generation = self.shared.get(keys[scope])
+                if generation is None:
+                    return None
+            result.append((scope, generation))
+        return result
+
+    def bump(self, scope):
+        key = generation_key(scope)
+        try:
+            self.shared.incr(key)
+        except ValueError:
+            self.shared.set(key, time.time_ns(), None)
+
+
+def generation_key(scope):
+    return f'{KEY_PREFIX}:gen:{scope}'
+
+
+class SingleFlight:
+    """
+    같은 키를 한 번만 계산 (같은 프로세스의 스레드 + 공유 캐시 락으로 워커 프로세스 간)
+
+        result, value = flight.run(key, compute, stale_key)
+
+    compute() -> (result, 캐시할 값 또는 None)
+    이 요청이 계산했으면 (result, value), 다른 요청의 결과나 이전 값(stale_key)을 받았으면 (None, value)
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def run(self, key, compute, stale_key=None, timeout=RESPONSE_TIMEOUT):
+        with self._lock:
+            event = self._flights.get(key)
+            leader = event is None
+            if leader:
+                event = self._flights[key] = threading.Event()
+
+        if not leader:
+            # 같은 워커의 다른 스레드가 계산 중 -> 이전 값이 있으면 바로, 없으면 끝날 때까지 기다림
+            value = self._stale(stale_key)
+            if value is MISSING:
+                event.wait(WAIT_TIMEOUT)
+                value = self.cache.get(key)
+            if value is not MISSING:
+                return None, value
+            return self._compute(key, compute, stale_key, timeout)
+
+        try:
+            return self._run_shared(key, compute, stale_key, timeout)
+        finally:
+            with self._lock:
+                del self._flights[key]
+            event.set()
+
+    def _run_shared(self, key, compute, stale_key, timeout):
+        shared = self.cache.shared
+        lock_key = f'{key}:lock'
+        # Redis / DB 캐시의 add()는 원자적, 파일 캐시는 확인 후 쓰기라서
+        # 거의 같은 순간에 들어온 워커 몇 개가 같이 계산할 수는 있음 (결과는 같음)
+        if shared.add(lock_key, os.getpid(), LOCK_TIMEOUT):
+            try:
+                return self._compute(key, compute, stale_key, timeout)
+            finally:
+                shared.delete(lock_key)
+
+        # 다른 워커가 계산 중
+        value = self._stale(stale_key)
+        if value is not MISSING:
+            return None, value
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            value = self.cache.get(key)
+            if value is not MISSING:
+                return None, value
+            if shared.get(lock_key) is None:
+                break  # 계산이 끝났는데 캐시하지 않은 결과(404 등) -> 직접 계산
+        return self._compute(key, compute, stale_key, timeout)
+
+    def _compute(self, key, compute, stale_key, timeout):
+        result, value = compute()
+        if value is not None:
+            self.cache.set(key, value, timeout)
+            if stale_key is not None:
+                self.cache.set(stale_key, value, timeout)
+        elif stale_key is not None:
+            self.cache.delete(stale_key)  # 삭제된 리뷰 등 -> 이전 값을 더 이상 돌려주지 않음
+        return result, value
+
+    def _stale(self, stale_key):
+        return MISSING if stale_key is None else self.cache.get(stale_key)
+
+
+response_cache = TwoTierCache()
+response_flight = SingleFlight(response_cache)
+
+
+def invalidate(*scopes):
+    """
+    범위들의 세대를 올림 (시그널 핸들러에서 호출)
+    트랜잭션 안이면 커밋 후에 올립니다. (커밋 전에 올리면 다른 요청이 커밋 전 데이터로 새 세대를 채울 수 있음)
+    """
+    def bump():
+        for scope in scopes:
+            response_cache.bump(scope)
+    transaction.on_commit(bump)
+
+
+def response_key(request, generations=None):
+    # generations=None -> 세대와 무관한 URL별 최신 응답 (stale-while-revalidate용)
+    raw = repr((request.build_absolute_uri(), generations))
+    return f'{KEY_PREFIX}:response:{hashlib.sha1(raw.encode("utf-8")).hexdigest()}'
+
+
+def plain(data):
+    # ReturnDict / ReturnList는 serializer를 참조하므로 LRU에 넣기 전에 일반 dict / list로
+    if isinstance(data, dict):
+        return dict(data)
+    if isinstance(data, list):
+        return list(data)
+    return data
+
+
+def cached_response(request, scopes, view, timeout=RESPONSE_TIMEOUT):
+    """
+    scopes의 세대가 그대로면 캐시된 응답, 아니면 view()를 호출해서 200 응답만 캐시
+    (ViewSet의 list / retrieve처럼 데코레이터를 쓰기 어려운 곳에서 직접 호출)
+    동시에 들어온 같은 요청은 한 번만 계산하고, 나머지는 결과나 이전 세대 응답을 받습니다.
+    """
+    generations = response_cache.generations(scopes)
+    if generations is None:
+        return view()
+    key = response_key(request, generations)
+    data = response_cache.get(key)
+    if data is not MISSING:
+        return Response(data)
+
+    def compute():
+        response = view()
+        return response, plain(response.data) if response.status_code == 200 else None
+
+    response, data = response_flight.run(key, compute, response_key(request), timeout)
+    return response if response is not None else Response(data)
+
+
+def cache_response(scopes, timeout=RESPONSE_TIMEOUT):
+    """
+    함수 뷰의 GET 응답을 캐시하는 데코레이터 (@api_view 바로 아래에 사용, 다른 메서드는 그대로 통과)
+    scopes(request, *args, **kwargs) -> 응답이 의존하는 범위 리스트
+    유저마다 달라지는 응답(is_liked 등)에는 쓰지 않습니다.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view(request, *args, **kwargs)
+            return cached_response(
+                request, scopes(request, *args, **kwargs), lambda: view(request, *args, **kwargs), timeout
+            )
+        return wrapped
+    return decorator
+
+
+def catalog_etag(view):
+    """
+    카탈로그 스냅샷으로 응답하는 함수 뷰에 ETag / Cache-Control을 붙이는 데코레이터 (@api_view 바로 아래에 사용)
+    ETag는 응답하는 스냅샷의 버전이라, 스냅샷을 다시 만드는 중에도 새 버전 ETag로 이전 데이터를 보내지 않습니다.
+    유저마다 달라지는 응답에는 쓰지 않습니다.
+    """
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        version = get_snapshot().version
+        if not version:
+            # 아직 카탈로그 버전이 없음 (get_tmdb 전 등)
+            return view(request, *args, **kwargs)
+        etag = f'"catalog-{version}"'
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=CATALOG_MAX_AGE)
+        return response
+    return wrapped
@@ -0,0 +1,247 @@
+"""
+API 워커들이 공유하는 읽기 전용 배열 파일 (CATALOG_DIR)
+
+배치 작업(movie_moods 등)이 numpy 배열을 .npy 파일로 내보내고, API 워커는 np.load(mmap_mode='r')로
+읽습니다. 여러 워커 프로세스가 같은 파일을 열어도 운영체제 페이지 캐시를 공유하므로
+메모리는 한 벌만 사용합니다.
+
+- write_arrays('mood_vectors', {'vectors': ..., 'movie_ids': ...})
+  -> mood_vectors.<버전>.vectors.npy, mood_vectors.<버전>.movie_ids.npy 를 쓰고
+     마지막에 mood_vectors.json(현재 버전의 파일 목록)을 원자적으로 교체합니다.
+     읽는 쪽은 항상 같은 버전의 파일 묶음을 보게 됩니다.
+- ArrayStore('mood_vectors').get()
+  -> json 파일이 바뀌었는지 stat으로 확인해서 바뀐 경우에만 다시 엽니다.
+- bump_catalog_version() / catalog_version.get()
+  -> 영화 데이터(제목, 인기도 등)가 바뀔 때마다 올리는 버전 문자열 (catalog.version 파일)
+     프로세스마다 메모리에 만들어 두는 인덱스(자동완성 등)가 이 값이 바뀌면 다시 만듭니다.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+
+
+def catalog_dir():
+    return Path(settings.CATALOG_DIR)
+
+
+def _replace_atomic(target, write):
+    # 같은 디렉토리의 임시 파일에 다 쓴 다음 os.replace (읽는 쪽이 쓰다 만 파일을 보지 않도록)
+    tmp = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+    with open(tmp, 'wb') as f:
+        write(f)
+    os.replace(tmp, target)
+
+
+def write_arrays(name, arrays, **meta):
+    """
+    arrays: {키: numpy 배열}, meta: json에 같이 저장할 값 (예: labels)
+    반환값: 새 버전 문자열
+    """
+    directory = catalog_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    version = f'{time.time_ns():x}'
+
+    files = {}
+    for key, array in arrays.items():
+        filename = f'{name}.{version}.{key}.npy'
+        _replace_atomic(directory / filename, lambda f, array=array: np.save(f, array))
+        files[key] = filename
+
+    manifest_path = directory / f'{name}.json'
+    previous = _read_manifest(manifest_path)
+    manifest = {'version': version, 'files': files, **meta}
+    _replace_atomic(manifest_path, lambda f: f.write(json.dumps(manifest, ensure_ascii=False).encode('utf-8')))
+
+    # 지금 버전과 바로 전 버전만 남기고 정리 (방금 교체된 버전을 아직 읽고 있는 워커가 있을 수 있음)
+    keep = set(files.values()) | set((previous or {}).get('files', {}).values())
+    for path in directory.glob(f'{name}.*.npy'):
+        if path.name not in keep:
+            try:
+                path.unlink()
+            except OSError:  # Windows에서 다른 프로세스가 mmap 중인 파일
+                pass
+    return version
+
+
+def _read_manifest(path):
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+class ArrayStore:
+    """
+    사용 예시:
+        store = ArrayStore('mood_vectors')
+        data = store.get()  # 파일이 없으면 None
+        if data:
+            data.arrays['vectors'], data.meta['labels'], data.version
+
+    check_interval초에 한 번만 stat()을 호출하므로 요청마다 get()을 불러도 부담이 없습니다.
+    """
+
+    class Snapshot:
+        __slots__ = ('version', 'arrays', 'meta')
+
+        def __init__(self, version, arrays, meta):
+            self.version = version
+            self.arrays = arrays
+            self.meta = meta
+
+    def __init__(self, name, check_interval=1.0):
+        self.name = name
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._stamp = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, refresh=False):
+        """
+        refresh=True면 확인 간격과 관계없이 바로 stat()으로 확인 (파일을 방금 쓴 프로세스에서 사용)
+        """
+        now = time.monotonic()
+        if not refresh and now - self._checked_at < self.check_interval:
+            return self._snapshot
+
+        with self._lock:
+            self._checked_at = now
+            path = catalog_dir() / f'{self.name}.json'
+            try:
+                stat = path.stat()
+            except OSError:
+                self._snapshot, self._stamp = None, None
+                return None
+
+            stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            if stamp != self._stamp:
+                snapshot = self._load(path)
+                if snapshot is not None:
+                    self._snapshot, self._stamp = snapshot, stamp
+            return self._snapshot
+
+    def _load(self, path):
+        manifest = _read_manifest(path)
+        if manifest is None:
+            return None
+        directory = path.parent
+        try:
+            arrays = {
+                key: np.load(directory / filename, mmap_mode='r')
+                for key, filename in manifest['files'].items()
+            }
+        except OSError:
+            # 그 사이 새 버전으로 교체/정리된 경우 -> 다음 확인 때 다시 읽음
+            return None
+        meta = {key: value for key, value in manifest.items() if key not in ('version', 'files')}
+        return self.Snapshot(manifest['version'], arrays, meta)
+
+
+VERSION_FILE = 'catalog.version'
+
+
+def bump_catalog_version():
+    """
+    영화 데이터가 바뀌었음을 모든 워커에 알림 (get_tmdb 완료, 관리자 수정 등)
+    반환값: 새 버전 문자열
+    """
+    directory = catalog_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    version = f'{time.time_ns():x}'
+    _replace_atomic(directory / VERSION_FILE, lambda f: f.write(version.encode('ascii')))
+    return version
+
+
+def on_movie_changed(sender, **kwargs):
+    """
+    Movie post_save / post_delete 핸들러 (movies.apps에서 연결)
+    트랜잭션 안이면 커밋 후에 올립니다. (커밋 전에 올리면 다른 워커가 커밋 전 데이터로 인덱스를 다시 만들 수 있음)
+    """
+    transaction.on_commit(bump_catalog_version)
+
+
+class VersionStamp:
+    """
+    catalog.version 파일의 현재 값 (파일이 없으면 '')
+    ArrayStore와 같이 check_interval초에 한 번만 stat()을 호출합니다.
+    """
+
+    def __init__(self, check_interval=1.0):
+        self.check_interval = check_interval
+        self._version = ''
+        self._stamp = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, refresh=False):
+        now = time.monotonic()
+        if not refresh and now - self._checked_at < self.check_interval:
+            return self._version
+
+        with self._lock:
+            self._checked_at = now
+            path = catalog_dir() / VERSION_FILE
+            try:
+                stat = path.stat()
+            except OSError:
+                self._version, self._stamp = '', None
+                return ''
+            stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            if stamp != self._stamp:
+                try:
+                    self._version = path.read_text(encoding='ascii').strip()
+                    self._stamp = stamp
+                except OSError:
+                    pass
+            return self._version
+
+
+catalog_version = VersionStamp()
+
+
+class VersionedValue:
+    """
+    카탈로그 버전마다 build(version)으로 다시 만드는 프로세스 내 객체 (자동완성 인덱스, 카탈로그 스냅샷 등)
+
+        index = VersionedValue(build_index)
+        index.get()  # 처음이면 만들 때까지 기다림
+
+    버전이 바뀌면 백그라운드 스레드에서 새 객체를 만드는 동안 이전 객체를 돌려주고,
+    다 만들어지면 참조만 한 번에 교체합니다.
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self._value = None
+        self._version = None
+        self._building = False
+        self._lock = threading.Lock()
+
+    def _rebuild(self, version, background=False):
+        try:
+            value = self.build(version)
+            self._value, self._version = value, version
+        finally:
+            self._building = False
+            if background:
+                connection.close()  # 백그라운드 스레드가 연 DB 연결 정리
+
+    def get(self):
+        version = catalog_version.get()
+        value = self._value
+        if value is not None and self._version == version:
+            return value
+        with self._lock:
+            if self._value is None:
+                self._rebuild(version)
+            elif not self._building and self._version != version:
+                self._building = True
+                threading.Thread(target=self._rebuild, args=(version, True), daemon=True).start()
+            return self._value
@@ -0,0 +1,108 @@
+"""
+찜 / 좋아요 수 컬럼 (Movie.like_count, Review.like_count)
+
+목록을 보여줄 때마다 like_users를 COUNT(*)하지 않도록 수를 컬럼에 저장해 두고,
+like_users가 바뀔 때 m2m_changed 핸들러에서 바뀐 영화 / 리뷰의 수만 중간 테이블에서 다시 셉니다.
+add() / remove() / clear()는 중간 테이블 변경과 시그널을 한 트랜잭션에서 실행하므로
+수도 같은 트랜잭션 안에서 바뀝니다. (관리자 페이지, user.like_movies.add(...) 등)
+
+- post_add / post_remove / post_clear: 바뀐 행의 수를 다시 셈 (pk_set만큼 더하고 빼지 않으므로
+  같은 찜하기 요청이 동시에 두 번 들어와서 둘 다 pk_set에 같은 유저가 있어도 두 번 더해지지 않음)
+- 유저 쪽에서 clear()하면 pk_set이 없으므로 pre_clear에서 대상 id를 기억해 둠
+- 유저를 지우면 CASCADE로 중간 테이블 행이 지워지지만 m2m_changed는 오지 않으므로
+  User pre_delete(on_user_deleted)에서 그 유저가 누른 영화 / 리뷰의 수를 1씩 뺌
+그래도 어긋난 값은 python manage.py reconcile_like_counts 로 고칩니다.
+"""
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def through_fields(through, counted_model):
+    """
+    중간 테이블에서 (세는 쪽 FK 이름, 유저 쪽 FK 이름)  예: ('movie', 'user')
+    """
+    source = target = None
+    for field in through._meta.fields:
+        if field.many_to_one:
+            if field.related_model is counted_model:
+                source = field.name
+            else:
+                target = field.name
+    return source, target
+
+
+def recount(model, through, ids):
+    """
+    ids 행의 like_count를 중간 테이블의 실제 행 수로 맞춤
+    """
+    source, _ = through_fields(through, model)
+    likes = (
+        through.objects
+        .filter(**{source: OuterRef('pk')})
+        .order_by()
+        .values(source)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    model.objects.filter(pk__in=ids).update(like_count=Coalesce(Subquery(likes), 0))
+
+
+def on_like_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """
+    Movie.like_users / Review.like_users m2m_changed (movies.apps, community.apps에서 연결)
+    """
+    counted = model if reverse else type(instance)
+    source, user_field = through_fields(sender, counted)
+
+    if not reverse:
+        # movie.like_users.add(user) 처럼 영화 / 리뷰 쪽에서 바꾼 경우
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            recount(counted, sender, [instance.pk])
+        return
+
+    # user.like_movies.add(movie) 처럼 유저 쪽에서 바꾼 경우
+    if action == 'pre_clear':
+        # 영화 찜 / 리뷰 좋아요를 같은 유저 인스턴스로 각각 clear()할 수 있으므로 중간 테이블별로 기억
+        cleared = instance.__dict__.setdefault('_like_cleared_ids', {})
+        cleared[sender] = list(sender.objects.filter(**{user_field: instance.pk}).values_list(source, flat=True))
+        return
+    if action == 'post_clear':
+        ids = instance.__dict__.get('_like_cleared_ids', {}).pop(sender, None)
+    elif action in ('post_add', 'post_remove'):
+        ids = pk_set
+    else:
+        return
+    if ids:
+        recount(counted, sender, ids)
+
+
+def on_user_deleted(sender, instance, **kwargs):
+    """
+    User pre_delete (movies.apps에서 연결)
+    CASCADE로 지워질 중간 테이블 행만큼 영화 / 리뷰의 수를 1씩 뺌 (like_users가 있는 모든 모델)
+    """
+    for relation in instance._meta.related_objects:
+        if not relation.many_to_many or relation.field.name != 'like_users':
+            continue
+        counted, through = relation.related_model, relation.through
+        source, user_field = through_fields(through, counted)
+        ids = through.objects.filter(**{user_field: instance.pk}).values(source)
+        counted.objects.filter(pk__in=ids).update(like_count=F('like_count') - 1)
+
+
+def reconcile(model, batch_size=1000):
+    """
+    like_count가 실제 like_users 수와 다른 행만 고침. 반환값: 고친 행 수
+    """
+    drifted = [
+        model(pk=pk, like_count=actual)
+        for pk, actual in (
+            model.objects
+            .annotate(actual=Count('like_users'))
+            .exclude(like_count=F('actual'))
+            .values_list('pk', 'actual')
+            .iterator()
+        )
+    ]
+    model.objects.bulk_update(drifted, ['like_count'], batch_size=batch_size)
+    return len(drifted)
@@ -0,0 +1,180 @@
+"""
+수집한 영화 데이터를 DB에 일괄(bulk) 저장하는 모듈
+
+영화 1편마다 update_or_create + genres.clear() + 장르별 get/add를 하면
+영화당 10회 이상의 SQL이 발생합니다. MovieWriter는
+- 장르 맵(tmdb_id -> pk)을 처음 한 번만 불러오고
+- 영화를 batch_size 만큼 모았다가
+- bulk_create(update_conflicts=True)로 tmdb_id 기준 upsert
+- movies_movie_genres 연결 테이블은 기존 값과 비교(diff)해서 바뀐 행만 추가/삭제
+를 배치당 하나의 트랜잭션으로 처리합니다.
+
+저장할 값의 해시(payload_hash)가 DB에 저장된 값과 같으면 그 영화는 쓰기를 건너뜁니다.
+"""
+import hashlib
+import json
+import time
+from collections import defaultdict
+
+from django.db import transaction
+
+from .models import Movie, Genre
+
+# upsert 시 갱신할 컬럼 (tmdb_id는 충돌 기준 컬럼)
+MOVIE_UPDATE_FIELDS = [
+    'title', 'overview', 'overview_en', 'poster_path', 'release_date',
+    'popularity', 'vote_average', 'vote_count', 'runtime', 'director', 'actors',
+    'payload_hash', 'tmdb_etag',
+]
+
+
+def payload_hash(fields, genre_ids):
+    """
+    저장할 값(+장르)의 해시. ETag는 값이 아니므로 제외합니다.
+    """
+    payload = {key: value for key, value in fields.items() if key not in ('payload_hash', 'tmdb_etag')}
+    payload['genre_ids'] = sorted(genre_ids)
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def save_genres(genres):
+    """
+    TMDb 장르 목록 저장 (이름이 바뀐 경우도 반영)
+    """
+    Genre.objects.bulk_create(
+        [Genre(tmdb_id=g['id'], name=g['name']) for g in genres],
+        update_conflicts=True,
+        unique_fields=['tmdb_id'],
+        update_fields=['name'],
+    )
+
+
+class MovieWriter:
+    """
+    사용 예시:
+        writer = MovieWriter(batch_size=200)
+        for fields, genre_ids in ...:
+            writer.add(fields, genre_ids)
+        writer.flush()
+        print(writer.rows_per_sec)
+
+    on_write: 저장(추가/변경)된 영화 중 영문 줄거리가 있는 영화의 pk 목록을 받는 함수.
+              같은 트랜잭션 안에서 호출됩니다. 인기도 / 투표 수만 바뀐 영화도 들어오므로
+              받는 쪽에서 줄거리가 바뀐 영화만 골라야 합니다. (예: moods.queue.enqueue_changed_movies)
+    """
+
+    def __init__(self, batch_size=200, on_write=None):
+        self.batch_size = batch_size
+        self.on_write = on_write
+        self.genre_map = dict(Genre.objects.values_list('tmdb_id', 'pk'))
+        self.buffer = []  # [(fields, genre_ids), ...]
+
+        # 통계
+        self.rows = 0          # 저장한 영화 수
+        self.unchanged = 0     # 해시가 같아서 쓰기를 건너뛴 영화 수
+        self.link_rows = 0     # 추가/삭제한 장르 연결 행 수
+        self.batches = 0
+        self.db_seconds = 0.0  # DB 작업에 걸린 시간
+
+    def add(self, fields, genre_ids):
+        fields['payload_hash'] = payload_hash(fields, genre_ids)
+        self.buffer.append((fields, genre_ids))
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self, checkpoint=None):
+        """
+        버퍼에 남은 영화 저장. checkpoint(함수)를 주면 같은 트랜잭션 안에서 실행하므로
+        체크포인트가 실제로 커밋된 데이터보다 앞서 나가는 일이 없습니다.
+        """
+        if not self.buffer and checkpoint is None:
+            return
+        batch, self.buffer = self.buffer, []
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            if batch:
+                written = self._write(batch)
+                self.rows += written
+                self.unchanged += len(batch) - written
+                self.batches += 1
+            if checkpoint is not None:
+                checkpoint()
+        self.db_seconds += time.perf_counter() - started
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.db_seconds if self.db_seconds else 0.0
+
+    def _write(self, batch):
+        # 같은 배치에 같은 영화가 두 번 들어오면 마지막 값만 사용 (ON CONFLICT 중복 방지)
+        latest = {fields['tmdb_id']: (fields, genre_ids) for fields, genre_ids in batch}
+
+        # 0. 저장된 해시와 같은 영화는 제외
+        stored = {
+            tmdb_id: (pk, stored_hash, stored_etag)
+            for tmdb_id, pk, stored_hash, stored_etag in Movie.objects.filter(tmdb_id__in=latest.keys())
+            .values_list('tmdb_id', 'pk', 'payload_hash', 'tmdb_etag')
+        }
+        unchanged = {
+            tmdb_id: item for tmdb_id, item in latest.items()
+            if tmdb_id in stored and stored[tmdb_id][1] == item[0]['payload_hash']
+        }
+        latest = {tmdb_id: item for tmdb_id, item in latest.items() if tmdb_id not in unchanged}
+
+        # 값은 같은데 ETag만 바뀐 영화는 ETag만 갱신 (다음 조건부 요청이 304를 받도록)
+        etag_updates = [
+            Movie(pk=stored[tmdb_id][0], tmdb_etag=fields['tmdb_etag'])
+            for tmdb_id, (fields, _) in unchanged.items()
+            if 'tmdb_etag' in fields and fields['tmdb_etag'] != stored[tmdb_id][2]
+        ]
+        if etag_updates:
+            Movie.objects.bulk_update(etag_updates, ['tmdb_etag'])
+        if not latest:
+            return 0
+
+        # 1. 영화 upsert (tmdb_id 기준)
+        Movie.objects.bulk_create(
+            [Movie(**fields) for fields, _ in latest.values()],
+            update_conflicts=True,
+            unique_fields=['tmdb_id'],
+            update_fields=MOVIE_UPDATE_FIELDS,
+        )
+        movie_pks = dict(
+            Movie.objects.filter(tmdb_id__in=latest.keys()).values_list('tmdb_id', 'pk')
+        )
+
+        # 2. 장르 연결 diff
+        desired = {
+            (movie_pks[tmdb_id], self.genre_map[genre_id])
+            for tmdb_id, (_, genre_ids) in latest.items()
+            for genre_id in genre_ids
+            if genre_id in self.genre_map
+        }
+        Through = Movie.genres.through
+        existing = set(
+            Through.objects.filter(movie_id__in=movie_pks.values()).values_list('movie_id', 'genre_id')
+        )
+
+        to_add = desired - existing
+        to_remove = existing - desired
+
+        if to_add:
+            Through.objects.bulk_create(
+                [Through(movie_id=movie_id, genre_id=genre_id) for movie_id, genre_id in to_add],
+                ignore_conflicts=True,
+            )
+        if to_remove:
+            # 장르 수는 20개 미만이므로 장르별로 묶어서 삭제
+            by_genre = defaultdict(list)
+            for movie_id, genre_id in to_remove:
+                by_genre[genre_id].append(movie_id)
+            for genre_id, movie_ids in by_genre.items():
+                Through.objects.filter(genre_id=genre_id, movie_id__in=movie_ids).delete()
+
+        self.link_rows += len(to_add) + len(to_remove)
+
+        if self.on_write is not None:
+            self.on_write([movie_pks[tmdb_id] for tmdb_id, (fields, _) in latest.items() if fields['overview_en']])
+        return len(latest)
@@ -0,0 +1,88 @@
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings, setup_databases, teardown_databases
+
+from movies.management.commands.get_tmdb import Command as GetTmdbCommand
+from movies.replay import ReplayServer
+
+
+class Command(BaseCommand):
+    help = '녹화된 TMDb 응답으로 get_tmdb 수집 성능 측정 (네트워크/실제 DB 사용 안 함)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='get_tmdb --record 로 녹화한 디렉토리')
+        parser.add_argument('--pages', type=int, default=9)
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--rate', type=float, default=40)
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--latency', type=float, default=0.05, help='응답 지연 (초)')
+        parser.add_argument('--jitter', type=float, default=0.02, help='응답 지연에 더할 랜덤 값 최대치 (초)')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='429 응답 확률 (0~1)')
+        parser.add_argument('--runs', type=int, default=1, help='반복 횟수 (2회차부터는 변경 없음 경로 측정)')
+        parser.add_argument('--seed', type=int, default=0, help='지연/429 주입 난수 시드 (재현용)')
+
+    def handle(self, *args, **options):
+        server = ReplayServer(
+            options['directory'],
+            latency=options['latency'],
+            jitter=options['jitter'],
+            error_rate=options['error_rate'],
+            retry_after=0,
+            seed=options['seed'],
+        )
+        if not server.records:
+            raise CommandError(f"녹화된 응답이 없습니다: {options['directory']}")
+
+        self.stdout.write(
+            f"응답 {len(server.records)}개 / 지연 {options['latency'] * 1000:.0f}ms"
+            f"(+{options['jitter'] * 1000:.0f}ms) / 429 확률 {options['error_rate']:.0%} / "
+            f"동시 요청 {options['concurrency']} / 초당 {options['rate']:.0f}회 제한"
+        )
+
+        # 테스트용 임시 DB와 임시 CATALOG_DIR에서 실행해서 개발 DB / API 워커가 읽는 배열 파일을 건드리지 않습니다.
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with server, tempfile.TemporaryDirectory() as catalog_dir, override_settings(CATALOG_DIR=catalog_dir):
+                for run in range(1, options['runs'] + 1):
+                    server.request_count = server.error_count = server.miss_count = 0
+                    stats = self.run_once(server, options)
+                    self.report(run, stats, server)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+    def run_once(self, server, options):
+        command = GetTmdbCommand()
+        # get_tmdb의 영화별 로그 출력은 버림 (출력 비용이 측정에 섞이지 않도록)
+        with open(os.devnull, 'w') as devnull:
+            call_command(
+                command,
+                pages=options['pages'],
+                concurrency=options['concurrency'],
+                rate=options['rate'],
+                batch_size=options['batch_size'],
+                base_url=server.base_url,
+                # 수집 후 내보내기는 측정에서 빼고 실행하지 않음 (elapsed에 섞이지 않도록)
+                skip_exports=True,
+                stdout=devnull,
+            )
+        return command.stats
+
+    def report(self, run, stats, server):
+        elapsed = stats['elapsed']
+        handled = stats['saved'] + stats['unchanged']
+        self.stdout.write(self.style.SUCCESS(f'[{run}회차] {elapsed:.2f}초'))
+        self.stdout.write(
+            f"  처리량: {handled / elapsed:.1f} movies/sec "
+            f"(저장 {stats['saved']} / 변경 없음 {stats['unchanged']} / 에러 {stats['errors']})"
+        )
+        self.stdout.write(
+            f"  요청: 클라이언트 {stats['requests']}회 (재시도 {stats['retries']}회), "
+            f"서버 {server.request_count}회 (429 주입 {server.error_count}회, 녹화 없음 {server.miss_count}회), "
+            f"{stats['requests'] / elapsed:.1f} req/sec"
+        )
+        self.stdout.write(
+            f"  DB: {stats['db_seconds']:.3f}초 ({stats['db_seconds'] / elapsed:.1%})"
+        )
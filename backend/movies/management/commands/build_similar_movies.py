@@ -0,0 +1,22 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from movies.similar import SIMILAR_COUNT, build_similar_index
+
+
+class Command(BaseCommand):
+    help = '감정 벡터 + 장르 + 인기도로 영화별 비슷한 영화 인덱스를 만들어 CATALOG_DIR에 내보냅니다. (get_tmdb / movie_moods가 자동 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--k', type=int, default=SIMILAR_COUNT, help=f'영화별 저장할 비슷한 영화 수 (기본 {SIMILAR_COUNT})')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = build_similar_index(options['k'])
+        if not count:
+            self.stdout.write(self.style.WARNING('감정 벡터 행렬이 없습니다. movie_moods를 먼저 실행하세요.'))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'비슷한 영화 인덱스 완료: {count}편 -> {settings.CATALOG_DIR} ({time.perf_counter() - started:.1f}초)'
+        ))
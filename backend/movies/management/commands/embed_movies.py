@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from movies.models import Movie
+from movies.semantic import EMBEDDING_MODEL, build_embedding_index, load_encoder
+from tqdm import tqdm # 진행률 표시바 (pip install tqdm)
+
+
+class Command(BaseCommand):
+    help = '영화 영문 줄거리(overview_en)를 문장 임베딩 행렬로 만들어 CATALOG_DIR에 내보냅니다. (자연어 검색용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=32, help='인코더에 한 번에 넣을 줄거리 수 (기본 32)')
+        parser.add_argument('--threads', type=int, default=None, help='torch 스레드 수 (기본: 전체 코어)')
+        parser.add_argument('--model', default=EMBEDDING_MODEL, help='문장 임베딩 모델 (Hugging Face)')
+
+    def handle(self, *args, **options):
+        # 1. 줄거리가 있는 영화 전체 (pk 순서)
+        rows = list(
+            Movie.objects
+            .exclude(overview_en__isnull=True)
+            .exclude(overview_en='')
+            .order_by('pk')
+            .values_list('tmdb_id', 'overview_en')
+        )
+        if not rows:
+            self.stdout.write(self.style.WARNING('줄거리(overview_en)가 있는 영화가 없습니다. get_tmdb를 먼저 실행하세요.'))
+            return
+
+        # 2. 이전 인덱스와 줄거리가 같은 영화는 재사용하고 나머지만 인코딩
+        started = time.perf_counter()
+        encoder = load_encoder(options['model'], threads=options['threads'])
+        with tqdm(desc='인코딩', unit='편') as bar:
+            total, encoded = build_embedding_index(rows, encoder, options['batch_size'], progress=bar.update)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'임베딩 행렬 내보내기 완료: {total}편 (새로 인코딩 {encoded}편, 재사용 {total - encoded}편) '
+            f'-> {settings.CATALOG_DIR} ({time.perf_counter() - started:.1f}초)'
+        ))
@@ -1,134 +1,338 @@
-﻿import requests
-from django.core.management.base import BaseCommand
+﻿import asyncio
+import time
+from datetime import timedelta, timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
-from movies.models import Movie, Genre
+from django.db.models import Max, Q
+from django.utils import timezone
+from movies.ingest import MovieWriter, save_genres
+from movies.models import IngestionJob, Movie, SyncState
+from movies.replay import Recorder
+from moods.queue import enqueue_changed_movies
+from moods.vectors import export_mood_matrix
+from movies.catalog import bump_catalog_version
+from movies.similar import build_similar_index
+from movies.tmdb import TMDbClient, TMDbError, TMDB_BASE_URL, NOT_MODIFIED, list_item_from_detail, parse_movie
+
+# [설정] 필터링 기준값
+MIN_VOTE_COUNT = 100   # 최소 투표 수 (이것보다 적으면 거름)
+MIN_VOTE_AVERAGE = 4.0 # 최소 평점
+
+# 증분 동기화 워터마크 이름 / TMDb changes 피드 최대 조회 기간
+SYNC_STATE_NAME = 'tmdb_movies'
+MAX_CHANGES_DAYS = 14
+
 
 class Command(BaseCommand):
     help = 'TMDb 영화 데이터 수집 (상세 정보 포함)'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=9, help='수집할 인기 영화 페이지 수 (기본 9)')
+        parser.add_argument('--start-page', type=int, default=1, help='시작 페이지 (기본 1)')
+        parser.add_argument('--concurrency', type=int, default=16, help='동시 요청 수 (1이면 순차 수집)')
+        parser.add_argument('--rate', type=float, default=40, help='초당 최대 요청 수 (TMDb 제한 대응)')
+        parser.add_argument('--base-url', default=TMDB_BASE_URL, help='TMDb API 주소')
+        parser.add_argument('--batch-size', type=int, default=200, help='DB 일괄 저장 단위 (영화 수)')
+        parser.add_argument(
+            '--incremental', action='store_true',
+            help='마지막 동기화 이후 TMDb changes 피드에 올라온 영화만 다시 가져오기',
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='중단된 마지막 전체 수집 작업을 체크포인트 다음 페이지부터 이어서 실행 (실패한 영화는 먼저 다시 가져옴)',
+        )
+        parser.add_argument('--record', metavar='DIR', help='받은 TMDb 응답을 DIR에 녹화 (오프라인 재생/벤치마크용)')
+        parser.add_argument(
+            '--no-mood-queue', action='store_true',
+            help='저장한 영화를 감정 분석 대기열(mood_worker)에 등록하지 않음',
+        )
+        parser.add_argument(
+            '--skip-exports', action='store_true',
+            help='수집 후 감정 벡터 행렬 / 비슷한 영화 인덱스 내보내기와 카탈로그 버전 갱신을 건너뜀 (bench_ingest 등)',
+        )
+
     def handle(self, *args, **options):
-        api_key = settings.TMDB_API_KEY
-        
-        # [설정] 필터링 기준값
-        MIN_VOTE_COUNT = 100   # 최소 투표 수 (이것보다 적으면 거름)
-        MIN_VOTE_AVERAGE = 4.0 # 최소 평점
-        
-        # 1. 장르 데이터 수집 (기존과 동일)
-        self.stdout.write('장르 데이터 수집 중...')
-        genre_url = f"https://api.themoviedb.org/3/genre/movie/list?api_key={api_key}&language=ko-KR"
-        genres = requests.get(genre_url).json().get('genres', [])
-        for genre_data in genres:
-            Genre.objects.get_or_create(
-                tmdb_id=genre_data['id'],
-                defaults={'name': genre_data['name']}
+        started = time.perf_counter()
+        run_started_at = timezone.now()
+        client = TMDbClient(
+            settings.TMDB_API_KEY,
+            base_url=options['base_url'],
+            concurrency=options['concurrency'],
+            rate=options['rate'],
+            recorder=Recorder(options['record']) if options['record'] else None,
+        )
+        self.not_modified = 0
+        # 새로 저장되거나 영문 줄거리가 바뀐 영화는 mood_worker가 바로 분석하도록 대기열에 등록
+        self.on_write = None if options['no_mood_queue'] else enqueue_changed_movies
+
+        watermark = SyncState.objects.filter(name=SYNC_STATE_NAME).first()
+        incremental = options['incremental'] and not options['resume']
+        if incremental and watermark is None:
+            self.stdout.write(self.style.WARNING('동기화 기록이 없어 전체 수집으로 진행합니다.'))
+            incremental = False
+
+        self.job = self.get_job(options, incremental)
+        try:
+            if incremental:
+                writer = asyncio.run(self.ingest_changes(client, watermark.synced_at, options['batch_size']))
+            else:
+                pages = range(self.job.cursor_page + 1, self.job.end_page + 1)
+                writer = asyncio.run(self.ingest(client, pages, options['batch_size']))
+        except BaseException as e:
+            # 중단(Ctrl+C 포함)되면 실패로 기록해 두고 --resume으로 이어서 실행
+            self.job.status = 'failed'
+            self.job.add_error(repr(e))
+            self.job.save()
+            raise
+
+        self.job.status = 'completed'
+        self.job.save()
+
+        # 다음 증분 동기화는 이번 실행 시작 시각 이후의 변경분부터
+        # (이어서 실행한 작업은 처음 시작한 시각을 기준으로 해야 그 사이 변경분을 놓치지 않음)
+        if self.covers_catalog(incremental):
+            synced_at = min(run_started_at, self.job.created_at)
+            SyncState.objects.update_or_create(name=SYNC_STATE_NAME, defaults={'synced_at': synced_at})
+        else:
+            self.stdout.write(self.style.WARNING(
+                '일부 페이지만 수집했거나 에러가 있어 동기화 시각(워터마크)은 그대로 둡니다.'
+            ))
+
+        # 추천 점수에 쓰는 인기도/평점이 바뀌었으므로 감정 벡터 행렬도 다시 내보냄
+        # 비슷한 영화 인덱스도 새 행렬 기준으로 다시 계산 (오프라인 작업이라 여기서 실행)
+        if writer.rows and not options['skip_exports']:
+            export_mood_matrix()
+            build_similar_index()
+            # 워커마다 메모리에 만들어 둔 영화 인덱스(자동완성 등)도 다시 만들도록 알림
+            bump_catalog_version()
+
+        elapsed = time.perf_counter() - started
+        # bench_ingest 등에서 결과를 읽어갈 수 있도록 보관
+        self.stats = {
+            'elapsed': elapsed,
+            'fetched': self.fetched,
+            'saved': writer.rows,
+            'unchanged': writer.unchanged + self.not_modified,
+            'errors': self.job.error_count,
+            'requests': client.request_count,
+            'retries': client.retry_count,
+            'db_seconds': writer.db_seconds,
+        }
+        self.stdout.write(self.style.SUCCESS(
+            f'데이터 수집 완료! (작업 #{self.job.pk}) 영화 {writer.rows}편 저장 / '
+            f'변경 없음 {writer.unchanged + self.not_modified}편 / 에러 {self.job.error_count}건 / '
+            f'요청 {client.request_count}회 (재시도 {client.retry_count}회) / {elapsed:.1f}초'
+        ))
+        self.stdout.write(
+            f'DB 저장: {writer.batches}개 배치, 장르 연결 변경 {writer.link_rows}행, '
+            f'{writer.db_seconds:.2f}초 ({writer.rows_per_sec:.0f} rows/sec)'
+        )
+        if client.recorder is not None:
+            self.stdout.write(f'응답 {client.recorder.count}개 녹화: {options["record"]}')
+
+    def get_job(self, options, incremental):
+        if options['resume']:
+            # 끝까지 수집했어도 받지 못한 영화가 남아 있으면 이어서 실행할 작업으로 취급
+            job = (
+                IngestionJob.objects
+                .filter(mode='full')
+                .filter(Q(status__in=['running', 'failed']) | ~Q(failed_movie_ids=[]))
+                .order_by('-pk')
+                .first()
+            )
+            if job is None:
+                raise CommandError('이어서 실행할 작업이 없습니다.')
+            self.stdout.write(
+                f'작업 #{job.pk} 이어서 실행: {job.cursor_page + 1} ~ {job.end_page} 페이지 '
+                f'(마지막 커밋 영화: {job.last_movie_id}, 다시 가져올 영화: {len(job.failed_movie_ids)}편)'
             )
+            job.status = 'running'
+            job.save()
+            return job
+
+        if incremental:
+            return IngestionJob.objects.create(mode='incremental')
+
+        start_page = options['start_page']
+        return IngestionJob.objects.create(
+            mode='full',
+            start_page=start_page,
+            end_page=start_page + options['pages'] - 1,
+            cursor_page=start_page - 1,
+        )
+
+    def covers_catalog(self, incremental):
+        """
+        워터마크를 옮겨도 되는지: 이번 실행이 DB의 모든 영화를 최신으로 만들었을 때만 True
+        - 증분 동기화: 다시 가져오다 실패한 영화가 없을 때 (있으면 다음 증분 때 다시 확인)
+        - 전체 수집: 받지 못한 영화 없이 1페이지부터 지금까지 커밋된 가장 뒤 페이지까지 모두 다시 수집했을 때
+          (--start-page / --pages로 일부만 수집하면 나머지 영화의 변경분을 놓침)
+        """
+        job = self.job
+        if incremental:
+            return job.error_count == 0
+        if job.failed_movie_ids:
+            return False
+        collected = (
+            IngestionJob.objects
+            .filter(mode='full')
+            .exclude(pk=job.pk)
+            .aggregate(last_page=Max('cursor_page'))['last_page']
+        ) or 0
+        return job.start_page == 1 and job.end_page >= collected
+
+    def checkpoint(self, writer, page=None, last_movie_id=None):
+        """
+        writer.flush() 트랜잭션 안에서 실행되어 방금 커밋한 데이터까지만 커서를 옮깁니다.
+        """
+        job = self.job
+        if page is not None:
+            job.cursor_page = page
+        if last_movie_id is not None:
+            job.last_movie_id = last_movie_id
+        job.fetched_count = self.base_counts[0] + self.fetched
+        job.saved_count = self.base_counts[1] + writer.rows
+        job.unchanged_count = self.base_counts[2] + writer.unchanged + self.not_modified
+        # 실패한 영화도 같이 저장해야 커서가 그 영화를 건너뛴 채 앞서 나가지 않음
+        job.failed_movie_ids = sorted(self.failed_ids)
+        job.save()
 
-        # 2. 영화 데이터 수집
-        self.stdout.write('영화 데이터 수집 중...')
-        
-        for page in range(1, 10):
-            # 2-1. 목록 가져오기 (한국어 기준)
-            url = f"https://api.themoviedb.org/3/movie/popular?api_key={api_key}&language=ko-KR&page={page}"
-            response = requests.get(url)
-            results = response.json().get('results', [])
-
-            for movie_data in results:
-                if movie_data['vote_count'] < MIN_VOTE_COUNT:
-                    self.stdout.write(self.style.WARNING(f"Skipped (Low Votes): {movie_data['title']} ({movie_data['vote_count']})"))
-                    continue
-                
-                if not movie_data['overview']:
-                    self.stdout.write(self.style.WARNING(f"Skipped (No Overview): {movie_data['title']}"))
-                    continue
-                
-                movie_id = movie_data['id']
-                
-                # ---------------------------------------------------------
-                # 한국어 상세 정보 가져오기 (감독, 배우용)
-                detail_url_ko = f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={api_key}&language=ko-KR&append_to_response=credits"
-                detail_res_ko = requests.get(detail_url_ko).json()
-
-                # 영어 상세 정보 가져오기 (오직 줄거리용 ⭐)
-                # language='en-US'로 설정해서 확실한 영어 원문
-                detail_url_en = f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={api_key}&language=en-US&append_to_response=keywords"
-                detail_res_en = requests.get(detail_url_en).json()
-                
-                overview_raw = detail_res_en.get('overview', '')
-                tagline_raw = detail_res_en.get('tagline', '')
-                
-                # 2. 키워드 추출 (리스트 형태 -> 문자열로 변환)
-                # 예: ['prison', 'escape'] -> "prison, escape"
-                keywords_data = detail_res_en.get('keywords', {}).get('keywords', [])
-                keywords_list = [k['name'] for k in keywords_data]
-                keywords_str = ", ".join(keywords_list)
-                
-                # 3. 텍스트 합치기 (태그라인 -> 줄거리 -> 키워드 순서)
-                full_text_parts = []
-                
-                if tagline_raw:
-                    full_text_parts.append(f"{tagline_raw}.")  # 태그라인 끝에 마침표 추가
-                
-                if overview_raw:
-                    full_text_parts.append(overview_raw)
-                
-                if keywords_str:
-                    full_text_parts.append(f"Keywords: {keywords_str}.") # 키워드임을 명시
-                
-                # 공백으로 이어 붙이기
-                overview_en = " ".join(full_text_parts)
-                
-                # 4. 만약 다 합쳤는데도 빈 값이면 한국어 줄거리로 대체 (방어 코드)
-                if not overview_en.strip():
-                    overview_en = movie_data['overview']
-                # ---------------------------------------------------------
-
-                # 2-3. 감독 & 배우 찾기 (한국어 응답 기준)
-                director_name = "Unknown"
-                if 'credits' in detail_res_ko and 'crew' in detail_res_ko['credits']:
-                    crew_list = detail_res_ko['credits']['crew']
-                    director_entry = next((person for person in crew_list if person['job'] == 'Director'), None)
-                    if director_entry:
-                        director_name = director_entry['name']
-
-                actors_list = []
-                if 'credits' in detail_res_ko and 'cast' in detail_res_ko['credits']:
-                    for cast in detail_res_ko['credits']['cast'][:5]:
-                        actors_list.append({
-                            'name': cast['name'],
-                            'character': cast['character'],
-                            'profile_path': cast['profile_path']
-                        })
-
-                # 2-4. 개봉일 빈 값 처리
-                release_date = movie_data.get('release_date') or None
-
-                # 2-5. DB 저장
-                movie, created = Movie.objects.update_or_create(
-                    tmdb_id=movie_id,
-                    defaults={
-                        'title': movie_data['title'],
-                        'overview': movie_data['overview'],
-                        'overview_en': overview_en, # [확인] 이제 확실한 영어가 들어갑니다!
-                        'poster_path': movie_data['poster_path'],
-                        'release_date': release_date,
-                        'popularity': movie_data['popularity'],
-                        'vote_average': movie_data['vote_average'],
-                        'vote_count': movie_data['vote_count'],
-                        'runtime': detail_res_ko.get('runtime'), # 런타임은 한국어 응답에서
-                        'director': director_name,
-                        'actors': actors_list
-                    }
+    async def prepare(self, client, batch_size):
+        # 이어서 실행하는 경우 이전 실행까지의 집계에 더해 나감
+        self.fetched = 0
+        self.base_counts = (self.job.fetched_count, self.job.saved_count, self.job.unchanged_count)
+        self.failed_ids = set(self.job.failed_movie_ids)
+
+        # 장르 데이터 수집 (장르 맵은 MovieWriter가 한 번만 불러옵니다)
+        self.stdout.write('장르 데이터 수집 중...')
+        genres = await client.genres()
+        await sync_to_async(save_genres)(genres)
+        return await sync_to_async(MovieWriter)(batch_size=batch_size, on_write=self.on_write)
+
+    async def ingest(self, client, pages, batch_size):
+        async with client:
+            writer = await self.prepare(client, batch_size)
+            if self.failed_ids:
+                await self.retry_failed(client, writer)
+
+            # 한 번에 너무 많은 작업을 만들지 않도록 동시 요청 수만큼의 페이지를 묶어서 처리하고,
+            # 묶음이 끝날 때마다 저장 + 체크포인트를 같은 트랜잭션으로 커밋합니다.
+            self.stdout.write('영화 데이터 수집 중...')
+            pages = list(pages)
+            window = max(1, client.concurrency)
+            for i in range(0, len(pages), window):
+                page_chunk = pages[i:i + window]
+                page_results = await asyncio.gather(*(client.popular(page) for page in page_chunk))
+
+                candidates = [
+                    movie_data
+                    for results in page_results
+                    for movie_data in results
+                    if self.is_valid(movie_data)
+                ]
+                await asyncio.gather(*(self.fetch_and_save(client, writer, m) for m in candidates))
+
+                last_movie_id = candidates[-1]['id'] if candidates else None
+                await sync_to_async(writer.flush)(
+                    checkpoint=lambda: self.checkpoint(writer, page=page_chunk[-1], last_movie_id=last_movie_id)
                 )
+        return writer
+
+    async def ingest_changes(self, client, since, batch_size):
+        """
+        증분 동기화: changes 피드에 올라온 영화 중 DB에 있는 영화만 조건부 요청으로 다시 가져옵니다.
+        """
+        async with client:
+            writer = await self.prepare(client, batch_size)
+
+            today = timezone.now().date()
+            start_date = since.date()
+            if (today - start_date).days > MAX_CHANGES_DAYS:
+                start_date = today - timedelta(days=MAX_CHANGES_DAYS)
+                self.stdout.write(self.style.WARNING(
+                    f'마지막 동기화가 {MAX_CHANGES_DAYS}일보다 오래되어 {start_date} 이후 변경분만 확인합니다. '
+                    f'(누락이 걱정되면 전체 수집을 실행하세요)'
+                ))
+
+            changed_ids = await client.changes(start_date, today)
+            etags = await sync_to_async(
+                lambda: dict(Movie.objects.filter(tmdb_id__in=changed_ids).values_list('tmdb_id', 'tmdb_etag'))
+            )()
+            self.stdout.write(f'변경된 영화 {len(changed_ids)}편 중 DB에 있는 영화 {len(etags)}편 확인 중...')
+
+            since_utc = since.astimezone(dt_timezone.utc)
+            ids = list(etags)
+            window = max(1, client.concurrency) * 20
+            for i in range(0, len(ids), window):
+                await asyncio.gather(*(
+                    self.refetch_and_save(client, writer, tmdb_id, etags[tmdb_id], since_utc)
+                    for tmdb_id in ids[i:i + window]
+                ))
+
+            await sync_to_async(writer.flush)(checkpoint=lambda: self.checkpoint(writer))
+        return writer
+
+    async def retry_failed(self, client, writer):
+        """
+        --resume: 지난 실행에서 받지 못한 영화를 먼저 다시 가져옵니다. (또 실패하면 목록에 다시 남음)
+        """
+        ids, self.failed_ids = sorted(self.failed_ids), set()
+        self.stdout.write(f'지난 실행에서 받지 못한 영화 {len(ids)}편 다시 가져오는 중...')
+        await asyncio.gather(*(self.refetch_and_save(client, writer, tmdb_id) for tmdb_id in ids))
+        await sync_to_async(writer.flush)(checkpoint=lambda: self.checkpoint(writer))
+
+    def is_valid(self, movie_data):
+        if movie_data['vote_count'] < MIN_VOTE_COUNT:
+            self.stdout.write(self.style.WARNING(f"Skipped (Low Votes): {movie_data['title']} ({movie_data['vote_count']})"))
+            return False
+
+        if not movie_data['overview']:
+            self.stdout.write(self.style.WARNING(f"Skipped (No Overview): {movie_data['title']}"))
+            return False
+        return True
+
+    async def fetch_and_save(self, client, writer, movie_data):
+        # 한국어 상세(감독, 배우) + 영어 줄거리/키워드를 한 번의 요청으로 가져옵니다.
+        try:
+            detail = await client.movie_detail(movie_data['id'])
+        except TMDbError as e:
+            self.record_error(e, movie_data['id'])
+            return
+        if detail is None:
+            self.stdout.write(self.style.WARNING(f"Skipped (Not Found): {movie_data['title']}"))
+            return
+
+        self.fetched += 1
+        fields = parse_movie(movie_data, detail)
+        # 바로 저장하지 않고 버퍼에 쌓았다가 batch_size마다 한 번에 저장합니다.
+        await sync_to_async(writer.add)(fields, movie_data.get('genre_ids', []))
+        self.stdout.write(f"Fetched: {fields['title']} (EN Overview Length: {len(fields['overview_en'])})")
+
+    async def refetch_and_save(self, client, writer, tmdb_id, etag=None, since=None):
+        try:
+            detail = await client.movie_detail(tmdb_id, etag=etag, since=since)
+        except TMDbError as e:
+            self.record_error(e, tmdb_id)
+            return
+        if detail is NOT_MODIFIED:
+            self.not_modified += 1
+            return
+        if detail is None:
+            self.stdout.write(self.style.WARNING(f"Skipped (Not Found): {tmdb_id}"))
+            return
+
+        # 증분 동기화는 목록 없이 상세만 받으므로 상세 응답으로 목록 항목을 만들어 씁니다.
+        self.fetched += 1
+        movie_data = list_item_from_detail(detail)
+        fields = parse_movie(movie_data, detail)
+        await sync_to_async(writer.add)(fields, movie_data['genre_ids'])
+        self.stdout.write(f"Refreshed: {fields['title']}")
 
-                # 2-6. 장르 연결 (기존 동일)
-                movie.genres.clear()
-                for genre_id in movie_data.get('genre_ids', []):
-                    try:
-                        genre = Genre.objects.get(tmdb_id=genre_id)
-                        movie.genres.add(genre)
-                    except Genre.DoesNotExist:
-                        pass
-                
-                self.stdout.write(f"Updated: {movie.title} (EN Overview Length: {len(overview_en)}) (Keywords: {len(keywords_list)})")
-
-        self.stdout.write(self.style.SUCCESS('데이터 수집 완료!'))
\ No newline at end of file
+    def record_error(self, error, movie_id):
+        # 재시도를 다 써도 실패한 영화는 작업 기록에 남기고 나머지는 계속 수집합니다.
+        # (체크포인트에 같이 저장되어 --resume 때 다시 가져옴)
+        self.job.add_error(error, movie_id=movie_id)
+        self.failed_ids.add(movie_id)
+        self.stdout.write(self.style.ERROR(f"Error: {movie_id} ({error})"))
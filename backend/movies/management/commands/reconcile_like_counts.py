@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+from community.models import Review
+from movies.counters import reconcile
+from movies.models import Movie
+
+
+class Command(BaseCommand):
+    help = '영화 찜 수 / 리뷰 좋아요 수 컬럼(like_count)을 실제 like_users 수와 맞춤'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        movies = reconcile(Movie)
+        reviews = reconcile(Review)
+        self.stdout.write(self.style.SUCCESS(
+            f'완료: 영화 {movies}편, 리뷰 {reviews}개 수정 ({time.perf_counter() - started:.1f}초)'
+        ))
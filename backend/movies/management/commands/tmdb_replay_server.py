@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.replay import ReplayServer
+
+
+class Command(BaseCommand):
+    help = '녹화된 TMDb 응답을 돌려주는 로컬 서버 실행 (get_tmdb --base-url 로 연결)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='get_tmdb --record 로 녹화한 디렉토리')
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency', type=float, default=0.0, help='응답 지연 (초)')
+        parser.add_argument('--jitter', type=float, default=0.0, help='응답 지연에 더할 랜덤 값 최대치 (초)')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='429 응답 확률 (0~1)')
+        parser.add_argument('--retry-after', type=int, default=1, help='429 응답의 Retry-After (초)')
+
+    def handle(self, *args, **options):
+        server = ReplayServer(
+            options['directory'],
+            host=options['host'],
+            port=options['port'],
+            latency=options['latency'],
+            jitter=options['jitter'],
+            error_rate=options['error_rate'],
+            retry_after=options['retry_after'],
+        )
+        if not server.records:
+            raise CommandError(f"녹화된 응답이 없습니다: {options['directory']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f'응답 {len(server.records)}개 재생 중: {server.base_url} (종료: Ctrl+C)'
+        ))
+        self.stdout.write(f'예) python manage.py get_tmdb --base-url {server.base_url}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.httpd.server_close()
+            self.stdout.write(
+                f'요청 {server.request_count}회 / 429 주입 {server.error_count}회 / 녹화 없음 {server.miss_count}회'
+            )
@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-18 15:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0004_movie_like_users'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('synced_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='payload_hash',
+            field=models.CharField(blank=True, default='', max_length=40),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='tmdb_etag',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
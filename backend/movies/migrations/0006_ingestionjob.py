@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 15:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_movie_sync_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mode', models.CharField(choices=[('full', '전체 수집'), ('incremental', '증분 동기화')], default='full', max_length=20)),
+                ('status', models.CharField(choices=[('running', '진행 중'), ('completed', '완료'), ('failed', '실패')], default='running', max_length=20)),
+                ('start_page', models.IntegerField(default=1)),
+                ('end_page', models.IntegerField(default=1)),
+                ('cursor_page', models.IntegerField(default=0)),
+                ('last_movie_id', models.IntegerField(blank=True, null=True)),
+                ('fetched_count', models.IntegerField(default=0)),
+                ('saved_count', models.IntegerField(default=0)),
+                ('unchanged_count', models.IntegerField(default=0)),
+                ('error_count', models.IntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,72 @@
+"""
+영화 전문 검색용 SQLite FTS5 가상 테이블 (movies.search)
+
+- trigram 토크나이저: 띄어쓰기와 무관하게 3글자 이상 부분 문자열로 검색 (한글 포함)
+- rowid = movies_movie.id, 컬럼: 제목 / 감독 / 배우 이름 / 줄거리(한글 + 영문)
+- movies_movie 트리거로 INSERT / UPDATE / DELETE(bulk_create upsert 포함)를 그대로 반영
+SQLite가 아닌 DB에서는 아무것도 하지 않습니다. (검색은 title__icontains로 동작)
+"""
+from django.db import migrations
+
+FTS_ROW = """
+    new.title,
+    coalesce(new.director, ''),
+    coalesce((SELECT group_concat(json_extract(value, '$.name'), ' ') FROM json_each(new.actors)), ''),
+    coalesce(new.overview, '') || ' ' || coalesce(new.overview_en, '')
+"""
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE movies_movie_fts USING fts5(
+        title, director, actors, overview, tokenize = 'trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER movies_movie_fts_insert AFTER INSERT ON movies_movie BEGIN
+        INSERT INTO movies_movie_fts (rowid, title, director, actors, overview) VALUES (new.id, {FTS_ROW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER movies_movie_fts_update AFTER UPDATE OF title, director, actors, overview, overview_en ON movies_movie BEGIN
+        DELETE FROM movies_movie_fts WHERE rowid = old.id;
+        INSERT INTO movies_movie_fts (rowid, title, director, actors, overview) VALUES (new.id, {FTS_ROW});
+    END
+    """,
+    """
+    CREATE TRIGGER movies_movie_fts_delete AFTER DELETE ON movies_movie BEGIN
+        DELETE FROM movies_movie_fts WHERE rowid = old.id;
+    END
+    """,
+    # 기존 영화 채우기
+    f"""
+    INSERT INTO movies_movie_fts (rowid, title, director, actors, overview)
+    SELECT new.id, {FTS_ROW} FROM movies_movie AS new
+    """,
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS movies_movie_fts_insert',
+    'DROP TRIGGER IF EXISTS movies_movie_fts_update',
+    'DROP TRIGGER IF EXISTS movies_movie_fts_delete',
+    'DROP TABLE IF EXISTS movies_movie_fts',
+]
+
+
+def run_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0006_ingestionjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sqlite(CREATE_SQL), run_sqlite(DROP_SQL)),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2 on 2026-10-18 16:18
+
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+# SQLite는 NOT NULL 컬럼을 추가할 때 movies_movie 테이블을 새로 만들어 옮기므로
+# 0007에서 만든 전문 검색 트리거가 같이 사라짐 -> 컬럼을 추가 / 삭제한 뒤 다시 만듦
+fts = import_module('movies.migrations.0007_movie_fts')
+TRIGGER_SQL = [sql for sql in fts.CREATE_SQL if 'CREATE TRIGGER' in sql]
+DROP_TRIGGER_SQL = [sql for sql in fts.DROP_SQL if 'DROP TRIGGER' in sql]
+
+
+def recreate_triggers(apps, schema_editor):
+    fts.run_sqlite(DROP_TRIGGER_SQL + TRIGGER_SQL)(apps, schema_editor)
+
+
+def fill_like_count(apps, schema_editor):
+    # 기존 찜 수 채우기
+    Movie = apps.get_model('movies', 'Movie')
+    Through = Movie.like_users.through
+    counts = (
+        Through.objects.filter(movie_id=OuterRef('pk'))
+        .order_by().values('movie_id').annotate(count=Count('pk')).values('count')
+    )
+    Movie.objects.filter(pk__in=Through.objects.values('movie_id')).update(like_count=Subquery(counts))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0007_movie_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, recreate_triggers),
+        migrations.AddField(
+            model_name='movie',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(recreate_triggers, migrations.RunPython.noop),
+        migrations.RunPython(fill_like_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 16:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0008_movie_like_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingestionjob',
+            name='failed_movie_ids',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
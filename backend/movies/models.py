@@ -43,6 +43,71 @@ class Movie(models.Model):
         related_name='like_movies', 
         blank=True
     )
+    # 찜한 사람 수 (like_users가 바뀔 때 같은 트랜잭션에서 다시 셈, movies.counters)
+    # 어긋나면 python manage.py reconcile_like_counts
+    like_count = models.PositiveIntegerField(default=0)
+
+    # 증분 동기화용 (get_tmdb --incremental)
+    # payload_hash: 저장된 값의 해시 (같은 데이터를 다시 받으면 DB 쓰기를 건너뜀)
+    # tmdb_etag: 마지막 상세 응답의 ETag (조건부 요청 If-None-Match에 사용)
+    payload_hash = models.CharField(max_length=40, blank=True, default='')
+    tmdb_etag = models.CharField(max_length=100, blank=True, default='')
 
     def __str__(self):
         return self.title
+
+
+class SyncState(models.Model):
+    # 동기화 작업별 마지막 성공 시각 (워터마크)
+    # 예: name='tmdb_movies' -> 다음 증분 동기화는 이 시각 이후 변경분만 가져옴
+    name = models.CharField(max_length=50, unique=True)
+    synced_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} @ {self.synced_at}"
+
+
+class IngestionJob(models.Model):
+    """
+    get_tmdb 실행 1회 = 작업 1개
+    중단되더라도 --resume으로 마지막 체크포인트(커밋된 페이지) 다음부터 이어서 수집합니다.
+    """
+    STATUS_CHOICES = [
+        ('running', '진행 중'),
+        ('completed', '완료'),
+        ('failed', '실패'),
+    ]
+    MODE_CHOICES = [
+        ('full', '전체 수집'),
+        ('incremental', '증분 동기화'),
+    ]
+
+    mode = models.CharField(max_length=20, choices=MODE_CHOICES, default='full')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+
+    # 수집 범위와 커서 (cursor_page까지의 데이터는 DB에 커밋되어 있음)
+    start_page = models.IntegerField(default=1)
+    end_page = models.IntegerField(default=1)
+    cursor_page = models.IntegerField(default=0)
+    last_movie_id = models.IntegerField(null=True, blank=True)  # 마지막으로 커밋된 영화의 tmdb_id
+
+    # 집계
+    fetched_count = models.IntegerField(default=0)    # TMDb에서 받아온 영화 수
+    saved_count = models.IntegerField(default=0)      # DB에 저장한 영화 수
+    unchanged_count = models.IntegerField(default=0)  # 변경이 없어 저장을 건너뛴 영화 수
+    error_count = models.IntegerField(default=0)
+
+    # 에러 기록 예: [{'movie_id': 123, 'error': '...'}, ...] (최근 100개만 보관)
+    errors = models.JSONField(default=list, blank=True)
+    # 재시도를 다 써도 받지 못한 영화의 tmdb_id (커서와 같은 트랜잭션에 저장, --resume 때 먼저 다시 가져옴)
+    failed_movie_ids = models.JSONField(default=list, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"[{self.status}] {self.mode} #{self.pk} (page {self.cursor_page}/{self.end_page})"
+
+    def add_error(self, error, movie_id=None):
+        self.error_count += 1
+        self.errors = (self.errors + [{'movie_id': movie_id, 'error': str(error)}])[-100:]
@@ -0,0 +1,169 @@
+"""
+TMDb 응답 녹화 / 재생 (오프라인 벤치마크, 테스트용)
+
+- Recorder: TMDbClient가 받은 응답을 디렉토리에 JSON 파일로 저장합니다.
+  (python manage.py get_tmdb --record tmdb_cassettes)
+- ReplayServer: 저장된 응답을 TMDb API처럼 돌려주는 로컬 HTTP 서버.
+  응답 지연(latency)과 429 에러를 일정 확률로 섞어서 실제 환경을 흉내냅니다.
+  (python manage.py tmdb_replay_server tmdb_cassettes --latency 0.05 --error-rate 0.02)
+
+api_key는 파일 이름(키)과 파일 내용 어디에도 저장하지 않습니다.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+IGNORED_PARAMS = {'api_key'}
+
+
+def replay_key(path, params):
+    """
+    (경로, 쿼리 파라미터) -> 파일 이름
+    예: /movie/popular?language=ko-KR&page=1 -> movie_popular-1a2b3c4d5e6f7a8b.json
+    """
+    query = urlencode(sorted((k, str(v)) for k, v in params.items() if k not in IGNORED_PARAMS))
+    digest = hashlib.sha1(f'{path}?{query}'.encode('utf-8')).hexdigest()[:16]
+    prefix = re.sub(r'[^0-9A-Za-z]+', '_', path).strip('_')[:60]
+    return f'{prefix}-{digest}.json'
+
+
+class Recorder:
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.count = 0
+
+    def save(self, path, params, response):
+        record = {
+            'path': path,
+            'params': {k: v for k, v in params.items() if k not in IGNORED_PARAMS},
+            'status': response.status_code,
+            'etag': response.headers.get('ETag', ''),
+            'body': response.json(),
+        }
+        target = self.directory / replay_key(path, params)
+        target.write_text(json.dumps(record, ensure_ascii=False), encoding='utf-8')
+        self.count += 1
+
+
+class ReplayServer:
+    """
+    사용 예시:
+        with ReplayServer('tmdb_cassettes', latency=0.05, error_rate=0.02) as server:
+            client = TMDbClient(api_key, base_url=server.base_url)
+    """
+
+    def __init__(self, directory, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 retry_after=1, seed=None):
+        self.directory = Path(directory)
+        self.latency = latency          # 응답마다 추가할 지연 (초)
+        self.jitter = jitter            # 지연에 더할 랜덤 값의 최대치 (초)
+        self.error_rate = error_rate    # 429 응답을 보낼 확률 (0~1)
+        self.retry_after = retry_after  # 429 응답의 Retry-After (초)
+        self.random = random.Random(seed)
+
+        # 통계
+        self.request_count = 0
+        self.error_count = 0
+        self.miss_count = 0  # 녹화되지 않은 요청 수
+        self._lock = threading.Lock()
+
+        # 녹화 파일은 처음 한 번만 메모리에 올려서 디스크 I/O가 벤치마크에 섞이지 않도록 합니다.
+        self.records = {}
+        for file in self.directory.glob('*.json'):
+            record = json.loads(file.read_text(encoding='utf-8'))
+            body = json.dumps(record['body'], ensure_ascii=False).encode('utf-8')
+            self.records[file.name] = (record.get('status', 200), record.get('etag', ''), body)
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def lookup(self, raw_path):
+        url = urlsplit(raw_path)
+        path = url.path
+        # TMDb 주소처럼 /3/movie/... 형태로 호출해도 동작하도록
+        if path.startswith('/3/'):
+            path = path[2:]
+        params = dict(parse_qsl(url.query))
+        return self.records.get(replay_key(path, params))
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive 지원
+
+            def do_GET(self):
+                with server._lock:
+                    server.request_count += 1
+                    inject_error = server.random.random() < server.error_rate
+                    delay = server.latency + server.random.uniform(0, server.jitter)
+
+                if delay:
+                    time.sleep(delay)
+
+                if inject_error:
+                    with server._lock:
+                        server.error_count += 1
+                    self._send(429, b'{"status_code": 25}', {'Retry-After': str(server.retry_after)})
+                    return
+
+                record = server.lookup(self.path)
+                if record is None:
+                    with server._lock:
+                        server.miss_count += 1
+                    self._send(404, b'{"status_code": 34}')
+                    return
+
+                status, etag, body = record
+                headers = {'ETag': etag} if etag else {}
+                if etag and self.headers.get('If-None-Match') == etag:
+                    self._send(304, b'', headers)
+                    return
+                self._send(status, body, headers)
+
+            def _send(self, status, body, headers=None):
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json;charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # 요청마다 로그를 찍으면 벤치마크 결과가 왜곡되므로 생략
+                pass
+
+        return Handler
@@ -0,0 +1,101 @@
+"""
+영화 검색 (GET /api/v1/movies/?search=...)
+
+SQLite FTS5 가상 테이블(movies_movie_fts, 0007_movie_fts 마이그레이션)에서
+제목 / 감독 / 배우 / 줄거리를 검색하고, BM25 관련도와 인기도를 섞어 정렬합니다.
+
+    점수 = (BM25 / 최고 BM25) + POPULARITY_BLEND x log1p(인기도) / log1p(후보 중 최고 인기도)
+
+- trigram 토크나이저라 3글자 이상 검색어는 띄어쓰기 없이 부분 문자열로 찾습니다. (예: '기생충', '놀란')
+  같이 들어온 3글자 미만 단어('어벤져스 2'의 '2')는 FTS 후보에 LIKE 조건으로 더 거릅니다.
+- 검색어가 모두 3글자 미만이거나 SQLite가 아니면 제목 부분 일치(title__icontains)로 대체합니다.
+- 결과는 관련도 상위 MAX_RESULTS편까지만 만들고 페이지 단위로 잘라서 돌려줍니다.
+"""
+import math
+
+from django.db import connection
+
+from .models import Movie
+
+FTS_TABLE = 'movies_movie_fts'
+MAX_RESULTS = 200       # 검색어 하나당 최대 결과 수
+MIN_TERM_LENGTH = 3     # trigram 토크나이저가 찾을 수 있는 최소 글자 수
+
+# 컬럼별 BM25 가중치 (title, director, actors, overview 순서)
+COLUMN_WEIGHTS = (10.0, 5.0, 3.0, 1.0)
+POPULARITY_BLEND = 0.3
+
+
+def match_query(keyword):
+    """
+    검색어 -> FTS5 MATCH 식 (단어마다 큰따옴표로 감싸서 AND). 쓸 수 있는 단어가 없으면 None
+    """
+    terms = [term for term in keyword.split() if len(term) >= MIN_TERM_LENGTH]
+    if not terms:
+        return None
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def short_terms(keyword):
+    """
+    trigram으로 찾을 수 없는 3글자 미만 단어 ('어벤져스 2' -> ['2'])
+    """
+    return [term for term in keyword.split() if len(term) < MIN_TERM_LENGTH]
+
+
+def like_pattern(term):
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def fts_candidates(query, extra_terms=()):
+    """
+    [(영화 pk, bm25, popularity), ...] BM25 상위 MAX_RESULTS편 (bm25는 작을수록 관련도 높음)
+    extra_terms: 네 컬럼 중 하나에 부분 문자열로 들어 있어야 하는 단어들 (icontains와 같은 LIKE, AND)
+    """
+    weights = ', '.join(str(w) for w in COLUMN_WEIGHTS)
+    columns = ('title', 'director', 'actors', 'overview')
+    like = '(' + ' OR '.join(f"{FTS_TABLE}.{column} LIKE %s ESCAPE '\\'" for column in columns) + ')'
+    params = [query]
+    for term in extra_terms:
+        params += [like_pattern(term)] * len(columns)
+    sql = (
+        f'SELECT m.id, bm25({FTS_TABLE}, {weights}) AS score, m.popularity '
+        f'FROM {FTS_TABLE} JOIN movies_movie AS m ON m.id = {FTS_TABLE}.rowid '
+        f'WHERE {FTS_TABLE} MATCH %s'
+        + ''.join(f' AND {like}' for _ in extra_terms)
+        + ' ORDER BY score LIMIT %s'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + [MAX_RESULTS])
+        return cursor.fetchall()
+
+
+def rank_candidates(candidates):
+    """
+    BM25 + 인기도 점수 순으로 정렬한 영화 pk 리스트
+    """
+    if not candidates:
+        return []
+    best = min(score for _, score, _ in candidates)
+    top_popularity = math.log1p(max(max(popularity or 0 for _, _, popularity in candidates), 0))
+
+    def combined(row):
+        _, score, popularity = row
+        relevance = score / best if best < 0 else 0.0
+        boost = math.log1p(max(popularity or 0, 0)) / top_popularity if top_popularity > 0 else 0.0
+        return relevance + POPULARITY_BLEND * boost
+
+    return [pk for pk, _, _ in sorted(candidates, key=combined, reverse=True)]
+
+
+def search_movie_ids(keyword):
+    """
+    검색어에 맞는 영화 pk (정렬된 상위 MAX_RESULTS편)
+    """
+    query = match_query(keyword)
+    if query is not None and connection.vendor == 'sqlite':
+        return rank_candidates(fts_candidates(query, short_terms(keyword)))
+    return list(
+        Movie.objects.filter(title__icontains=keyword).order_by('-popularity').values_list('pk', flat=True)[:MAX_RESULTS]
+    )
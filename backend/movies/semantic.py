@@ -0,0 +1,184 @@
+"""
+줄거리 임베딩 기반 자연어 영화 검색 (GET /api/v1/movies/semantic/?q=...)
+
+- 오프라인(embed_movies 명령어): overview_en(태그라인 + 줄거리 + 키워드)을 작은 문장 인코더로
+  길이 1인 float32 벡터로 만들어 (영화 수 x 384) 행렬을 CATALOG_DIR에 내보냅니다.
+  줄거리 해시를 같이 저장해 두고 다시 실행하면 줄거리가 바뀐 영화만 인코딩합니다.
+- 검색: 검색어를 인덱스를 만든 것과 같은 모델(인덱스 meta의 model)로 임베딩 -> 행렬과의 내적(= 코사인 유사도)을
+  SEARCH_BLOCK행씩 계산하면서 상위 k개만 유지. 같은 검색어는 LRU 캐시에서 바로 돌려줍니다. (인덱스가 바뀌면 캐시 키도 바뀜)
+
+인코더는 transformers + torch가 필요합니다. (pip install transformers torch)
+"""
+import threading
+
+import numpy as np
+
+from moods.analysis import text_hash
+from .cache import LocalLRU
+from .catalog import ArrayStore, write_arrays
+
+# 문장 임베딩 모델 (384차원, CPU에서도 빠른 6층 모델)
+EMBEDDING_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+MAX_LENGTH = 256        # 인코더 입력 최대 토큰 수
+
+INDEX_NAME = 'movie_embeddings'
+HASH_DTYPE = 'S32'      # 줄거리 해시(sha256) 앞 32자
+SEARCH_BLOCK = 16384    # 검색할 때 한 번에 곱하는 영화 수
+QUERY_CACHE_SIZE = 1024
+
+_index_store = ArrayStore(INDEX_NAME)
+_encoders = {}  # 모델 이름 -> 인코더
+_encoder_lock = threading.Lock()
+_query_cache = LocalLRU(QUERY_CACHE_SIZE)
+
+
+class SentenceEncoder:
+    """
+    encoder(texts, batch_size=32) -> (텍스트 수 x 차원) float32, 행 길이 1 (토큰 평균 풀링)
+    """
+
+    def __init__(self, model_name=EMBEDDING_MODEL, threads=None):
+        import torch  # pip install transformers torch 필요
+        from transformers import AutoModel, AutoTokenizer
+
+        if threads:
+            torch.set_num_threads(threads)
+        self.torch = torch
+        self.model_name = model_name
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModel.from_pretrained(model_name).eval()
+
+    def __call__(self, texts, batch_size=32):
+        torch = self.torch
+        vectors = []
+        with torch.inference_mode():
+            for i in range(0, len(texts), batch_size):
+                encoded = self.tokenizer(
+                    texts[i:i + batch_size], padding=True, truncation=True, max_length=MAX_LENGTH, return_tensors='pt'
+                )
+                hidden = self.model(**encoded).last_hidden_state
+                mask = encoded['attention_mask'].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                vectors.append(torch.nn.functional.normalize(pooled, dim=1).numpy())
+        if not vectors:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(vectors).astype(np.float32, copy=False)
+
+
+def load_encoder(model_name=EMBEDDING_MODEL, threads=None):
+    return SentenceEncoder(model_name, threads=threads)
+
+
+def get_encoder(model_name=EMBEDDING_MODEL):
+    """
+    검색용 인코더 (프로세스당 모델마다 한 번만 로드)
+    """
+    encoder = _encoders.get(model_name)
+    if encoder is None:
+        with _encoder_lock:
+            encoder = _encoders.get(model_name)
+            if encoder is None:
+                encoder = _encoders[model_name] = load_encoder(model_name)
+    return encoder
+
+
+def hash_key(text):
+    return text_hash(text)[:32].encode('ascii')
+
+
+def build_embedding_index(rows, encoder, batch_size=32, progress=None):
+    """
+    rows: [(tmdb_id, overview_en), ...]
+    이전 인덱스와 모델이 같고 줄거리 해시가 같은 영화는 벡터를 재사용하고 나머지만 인코딩합니다.
+    반환값: (전체 영화 수, 새로 인코딩한 영화 수)
+    """
+    if not rows:
+        return 0, 0
+    tmdb_ids = np.array([tmdb_id for tmdb_id, _ in rows], dtype=np.int64)
+    hashes = np.array([hash_key(text) for _, text in rows], dtype=HASH_DTYPE)
+
+    previous = _index_store.get(refresh=True)
+    reuse = {}
+    if previous is not None and previous.meta.get('model') == encoder.model_name:
+        old_vectors = previous.arrays['vectors']
+        for i, (tmdb_id, old_hash) in enumerate(zip(previous.arrays['tmdb_ids'].tolist(), previous.arrays['hashes'])):
+            reuse[(tmdb_id, bytes(old_hash))] = i
+
+    missing = [i for i, key in enumerate(zip(tmdb_ids.tolist(), hashes.tolist())) if key not in reuse]
+    encoded = None
+    if missing:
+        texts = [rows[i][1] for i in missing]
+        parts = []
+        for start in range(0, len(texts), batch_size * 8):
+            parts.append(encoder(texts[start:start + batch_size * 8], batch_size=batch_size))
+            if progress:
+                progress(len(parts[-1]))
+        encoded = np.vstack(parts)
+
+    dim = encoded.shape[1] if encoded is not None else previous.arrays['vectors'].shape[1]
+    vectors = np.zeros((len(rows), dim), dtype=np.float32)
+    if encoded is not None:
+        vectors[missing] = encoded
+    for i, key in enumerate(zip(tmdb_ids.tolist(), hashes.tolist())):
+        old = reuse.get(key)
+        if old is not None:
+            vectors[i] = old_vectors[old]
+
+    write_arrays(
+        INDEX_NAME,
+        {'vectors': vectors, 'tmdb_ids': tmdb_ids, 'hashes': hashes},
+        model=encoder.model_name,
+    )
+    return len(rows), len(missing)
+
+
+def top_k_blocked(vectors, queries, k, block=SEARCH_BLOCK):
+    """
+    vectors: (영화 수 x 차원), queries: (검색어 수 x 차원)
+    블록 단위로 내적을 계산하면서 검색어마다 상위 k개만 유지 (임시 메모리 = 블록 x 검색어 수)
+    반환값: (indices, scores) - 각각 (검색어 수 x k), 점수 내림차순
+    """
+    n = len(vectors)
+    k = min(k, n)
+    best_idx = np.zeros((len(queries), 0), dtype=np.int64)
+    best_scores = np.zeros((len(queries), 0), dtype=np.float32)
+    for start in range(0, n, block):
+        scores = (vectors[start:start + block] @ queries.T).T
+        idx = np.broadcast_to(np.arange(start, start + scores.shape[1]), scores.shape)
+        scores = np.hstack([best_scores, scores])
+        idx = np.hstack([best_idx, idx])
+        if scores.shape[1] > k:
+            keep = np.argpartition(scores, scores.shape[1] - k, axis=1)[:, scores.shape[1] - k:]
+            scores = np.take_along_axis(scores, keep, axis=1)
+            idx = np.take_along_axis(idx, keep, axis=1)
+        best_scores, best_idx = scores, idx
+    order = np.argsort(-best_scores, axis=1)
+    return np.take_along_axis(best_idx, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+def search_index(index, query, k):
+    """
+    index(ArrayStore 스냅샷)에서 검색 -> ((tmdb_id, 유사도), ...)
+    """
+    # 인덱스를 만든 모델로 검색어를 임베딩 (다른 모델이면 벡터 공간이 달라서 비교할 수 없음)
+    query_vector = get_encoder(index.meta.get('model', EMBEDDING_MODEL))([query])
+    idx, scores = top_k_blocked(index.arrays['vectors'], query_vector, k)
+    return tuple(zip(index.arrays['tmdb_ids'][idx[0]].tolist(), scores[0].tolist()))
+
+
+def semantic_search(query, k=20):
+    """
+    검색어와 줄거리가 비슷한 영화 상위 k개 [(tmdb_id, 유사도), ...]
+    인덱스가 없으면 None
+    """
+    index = _index_store.get()
+    if index is None or not len(index.arrays['tmdb_ids']):
+        return None
+    query = ' '.join(query.split())
+    # 캐시 키의 버전과 실제로 검색한 인덱스가 같도록 위에서 가져온 스냅샷으로 검색
+    key = (query, k, index.version)
+    results = _query_cache.get(key)
+    if results is None:
+        results = search_index(index, query, k)
+        _query_cache.set(key, results)
+    return list(results)
@@ -14,17 +14,9 @@ class MovieListSerializer(serializers.ModelSerializer):
 
 class MovieDetailSerializer(serializers.ModelSerializer):
     # 상세 페이지용: 장르 정보 포함, 줄거리 포함
+    # 모든 유저에게 같은 응답이어야 ETag로 캐시할 수 있으므로 찜 여부 / 찜한 유저는 GET /movies/<pk>/likes/ 에서
     genres = GenreSerializer(many=True, read_only=True)
 
-    # 현재 로그인한 유저가 찜했는지 여부 (True/False)
-    is_liked = serializers.SerializerMethodField()
-
     class Meta:
         model = Movie
-        fields = '__all__' # 모든 필드 포함
-
-    def get_is_liked(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.like_users.filter(pk=request.user.pk).exists()
-        return False
\ No newline at end of file
+        exclude = ['payload_hash', 'tmdb_etag', 'like_users', 'like_count'] # 동기화용 내부 필드와 찜 정보를 제외한 모든 필드 포함
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+비슷한 영화 인덱스 (GET /api/v1/movies/<tmdb_id>/similar/)
+
+영화마다 [감정 벡터 | 장르 원-핫 | 인기도]를 이어 붙인 특징 벡터를 만들고,
+코사인 유사도 상위 SIMILAR_COUNT편을 영화 수집 / 감정 분석이 끝난 뒤 오프라인으로 미리 계산해
+CATALOG_DIR에 내보냅니다. (감정 벡터 행렬 moods.vectors를 입력으로 사용)
+
+- 지금은 정확한 최근접 이웃: BLOCK_SIZE편씩 (블록 x 전체) 행렬곱 후 argpartition
+  영화 10만 편이면 몇십 초 걸리지만 API와 무관한 오프라인 작업입니다.
+  영화가 훨씬 많아지면 neighbors / scores 배열만 같은 형태로 만드는 근사 인덱스(그래프 기반 등)로 교체하면 됩니다.
+- API는 tmdb_id -> 행 번호를 이진 탐색(np.searchsorted)하고 미리 계산한 행을 읽기만 하므로
+  영화 수가 늘어도 응답 시간이 늘지 않습니다.
+"""
+import numpy as np
+
+from moods.vectors import load_mood_matrix
+from .catalog import ArrayStore, write_arrays
+
+INDEX_NAME = 'similar_movies'
+SIMILAR_COUNT = 20   # 영화별로 저장하는 비슷한 영화 수
+BLOCK_SIZE = 256     # 한 번에 계산하는 영화 수 (유사도 블록 메모리 = BLOCK_SIZE x 영화 수 x 4바이트)
+
+# 특징별 비중 (각 부분을 단위 벡터로 만든 뒤 곱함)
+MOOD_FEATURE = 1.0
+GENRE_FEATURE = 0.8
+POPULARITY_FEATURE = 0.3
+
+_index_store = ArrayStore(INDEX_NAME)
+
+
+def unit_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def build_features(arrays):
+    """
+    감정 벡터 행렬 배열 -> 행 길이 1인 (영화 수 x (28 + 장르 수 + 1)) float32 특징 행렬
+    """
+    parts = [MOOD_FEATURE * unit_rows(np.ascontiguousarray(arrays['vectors'], dtype=np.float32))]
+    if 'genres' in arrays:
+        parts.append(GENRE_FEATURE * unit_rows(np.ascontiguousarray(arrays['genres'], dtype=np.float32)))
+    popularity = np.log1p(np.maximum(np.asarray(arrays['popularity'], dtype=np.float32), 0))
+    top = popularity.max() if len(popularity) else 0
+    if top > 0:
+        popularity /= top
+    parts.append(POPULARITY_FEATURE * popularity[:, None])
+    return unit_rows(np.hstack(parts).astype(np.float32))
+
+
+def exact_neighbors(features, k, block_size=BLOCK_SIZE):
+    """
+    전체 영화 쌍의 내적으로 구한 정확한 상위 k개
+    반환값: (neighbors: (영화 수 x k) int32 행 번호, scores: (영화 수 x k) float32 유사도)
+    """
+    n = len(features)
+    k = min(k, max(n - 1, 0))
+    neighbors = np.zeros((n, k), dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float32)
+    if not k:
+        return neighbors, scores
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        sims = features[start:end] @ features.T
+        rows = np.arange(end - start)
+        sims[rows, rows + start] = -np.inf  # 자기 자신 제외
+        top = np.argpartition(sims, n - k, axis=1)[:, n - k:]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        neighbors[start:end] = np.take_along_axis(top, order, axis=1)
+        scores[start:end] = np.take_along_axis(top_scores, order, axis=1)
+    return neighbors, scores
+
+
+def build_similar_index(k=SIMILAR_COUNT):
+    """
+    현재 감정 벡터 행렬로 비슷한 영화 인덱스를 다시 만들어 내보냅니다.
+    반환값: 인덱스에 들어간 영화 수 (행렬이 없으면 0)
+    """
+    matrix = load_mood_matrix(refresh=True)
+    if matrix is None or not len(matrix.arrays['tmdb_ids']):
+        return 0
+    tmdb_ids = np.asarray(matrix.arrays['tmdb_ids'], dtype=np.int64)
+    neighbors, scores = exact_neighbors(build_features(matrix.arrays), k)
+
+    # tmdb_id 순서로 정렬해 두고 API에서 이진 탐색 (neighbors도 정렬된 행 번호로 바꿔서 저장)
+    order = np.argsort(tmdb_ids, kind='stable')
+    position = np.empty_like(order)
+    position[order] = np.arange(len(order))
+    write_arrays(
+        INDEX_NAME,
+        {
+            'tmdb_ids': tmdb_ids[order],
+            'neighbors': position[neighbors[order]].astype(np.int32),
+            'scores': scores[order],
+        },
+        matrix_version=matrix.version,
+        method='exact',
+    )
+    return len(tmdb_ids)
+
+
+def similar_tmdb_ids(tmdb_id, k=SIMILAR_COUNT):
+    """
+    미리 계산한 비슷한 영화 상위 k개의 tmdb_id (유사도 순)
+    인덱스가 없거나 인덱스에 없는 영화(감정 분석 전 등)면 None
+    """
+    index = _index_store.get()
+    if index is None:
+        return None
+    tmdb_ids = index.arrays['tmdb_ids']
+    row = int(np.searchsorted(tmdb_ids, tmdb_id))
+    if row >= len(tmdb_ids) or tmdb_ids[row] != tmdb_id:
+        return None
+    return tmdb_ids[index.arrays['neighbors'][row, :k]].tolist()
@@ -0,0 +1,114 @@
+"""
+읽기 전용 영화 API용 프로세스 내 카탈로그 스냅샷
+
+영화 정보는 수집(get_tmdb) 때만 바뀌므로 워커마다 한 번 DB에서 읽어 __slots__ 레코드로 들고 있고,
+movie_popular / movie_list_by_ids / movie_detail은 ORM 객체를 만들지 않고 메모리에서 응답합니다.
+
+- tmdb_id -> MovieRecord 딕셔너리, 인기도순 레코드 목록, 장르는 읽을 때 한 번만 {'tmdb_id', 'name'}으로 변환
+- 카탈로그 버전(movies.catalog.catalog_version)이 바뀌면 새 스냅샷을 만든 뒤 참조만 교체
+  (만드는 동안 요청은 이전 스냅샷으로 응답)
+- gunicorn --preload 처럼 fork 전에 config/wsgi.py에서 preload_snapshot()을 호출하면 (settings.PRELOAD_SNAPSHOT)
+  워커들이 부모 프로세스의 스냅샷을 copy-on-write로 공유합니다. (gc.freeze()로 GC가 페이지를 건드리지 않게 함)
+"""
+import gc
+import logging
+
+from django.db import DatabaseError, connection
+
+from .catalog import VersionedValue
+from .models import Genre, Movie
+
+logger = logging.getLogger(__name__)
+
+POPULAR_COUNT = 20
+
+# MovieListSerializer / MovieDetailSerializer와 같은 필드 순서
+LIST_FIELDS = ('tmdb_id', 'title', 'poster_path', 'vote_average', 'release_date')
+DETAIL_FIELDS = (
+    'tmdb_id', 'title', 'overview', 'overview_en', 'poster_path', 'release_date',
+    'popularity', 'vote_average', 'vote_count', 'runtime', 'director', 'actors',
+)
+
+
+class MovieRecord:
+    __slots__ = ('pk', 'genres') + DETAIL_FIELDS
+
+    def __init__(self, pk, genres, values):
+        self.pk = pk
+        self.genres = genres
+        for field, value in zip(DETAIL_FIELDS, values):
+            setattr(self, field, value)
+
+    def list_data(self):
+        return {field: getattr(self, field) for field in LIST_FIELDS}
+
+    def detail_data(self):
+        data = {'id': self.pk, 'genres': list(self.genres)}
+        for field in DETAIL_FIELDS:
+            data[field] = getattr(self, field)
+        return data
+
+
+class CatalogSnapshot:
+    __slots__ = ('version', 'by_tmdb_id', 'records', 'popular')
+
+    def __init__(self, version, records):
+        self.version = version
+        self.records = records  # pk 순서
+        self.by_tmdb_id = {record.tmdb_id: record for record in records}
+        self.popular = sorted(records, key=lambda r: r.popularity, reverse=True)[:POPULAR_COUNT]
+
+    def get(self, tmdb_id):
+        return self.by_tmdb_id.get(tmdb_id)
+
+    def list_by_ids(self, tmdb_ids):
+        """
+        tmdb_ids 중 있는 영화만 pk 순서로 (Movie.objects.filter(tmdb_id__in=...)와 같은 순서)
+        """
+        found = [self.by_tmdb_id[tmdb_id] for tmdb_id in set(tmdb_ids) if tmdb_id in self.by_tmdb_id]
+        return sorted(found, key=lambda r: r.pk)
+
+
+def load_snapshot(version):
+    genres = {
+        pk: {'tmdb_id': tmdb_id, 'name': name}
+        for pk, tmdb_id, name in Genre.objects.values_list('pk', 'tmdb_id', 'name')
+    }
+    movie_genres = {}
+    for movie_id, genre_id in Movie.genres.through.objects.order_by('pk').values_list('movie_id', 'genre_id').iterator():
+        movie_genres.setdefault(movie_id, []).append(genres[genre_id])
+
+    records = []
+    rows = Movie.objects.order_by('pk').values_list('pk', *DETAIL_FIELDS)
+    for pk, *values in rows.iterator(chunk_size=2000):
+        release_date = values[DETAIL_FIELDS.index('release_date')]
+        if release_date is not None:
+            values[DETAIL_FIELDS.index('release_date')] = release_date.isoformat()
+        records.append(MovieRecord(pk, tuple(movie_genres.get(pk, ())), values))
+    return CatalogSnapshot(version, records)
+
+
+_snapshot = VersionedValue(load_snapshot)
+
+
+def get_snapshot():
+    """
+    현재 카탈로그 버전의 스냅샷 (버전이 바뀌면 다시 만드는 동안 이전 스냅샷)
+    """
+    return _snapshot.get()
+
+
+def preload_snapshot():
+    """
+    fork 전(wsgi 로드 시) 스냅샷을 미리 만들어 워커들이 copy-on-write로 공유하게 함
+    """
+    try:
+        get_snapshot()
+    except DatabaseError:
+        # migrate 전 등 -> 워커가 첫 요청 때 만듦
+        logger.warning('카탈로그 스냅샷을 미리 만들지 못했습니다.', exc_info=True)
+        return
+    finally:
+        connection.close()  # fork 전에 연 DB 연결을 워커들이 공유하지 않도록
+    # 지금까지 만든 객체를 GC 대상에서 빼서, GC가 참조 정보를 쓰면서 공유 페이지를 복사하지 않게 함
+    gc.freeze()
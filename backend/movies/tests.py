@@ -1,3 +1,70 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .counters import on_like_changed, reconcile
+from .models import Movie
+
+User = get_user_model()
+
+
+class LikeCountTests(TestCase):
+    """
+    Movie.like_count가 찜하기의 모든 경로에서 실제 like_users 수와 같은지 (movies.counters)
+    """
+
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', email='alice@example.com', password='pw')
+        self.bob = User.objects.create_user(username='bob', email='bob@example.com', password='pw')
+        self.movies = [Movie.objects.create(tmdb_id=i, title=f'영화 {i}') for i in range(1, 4)]
+
+    def assertCounts(self, *expected):
+        counts = [Movie.objects.get(pk=movie.pk).like_count for movie in self.movies]
+        self.assertEqual(counts, list(expected))
+        # 저장된 값이 실제 수와 같으면 reconcile이 고칠 행이 없음
+        self.assertEqual(reconcile(Movie), 0)
+
+    def test_toggle(self):
+        client = APIClient()
+        client.force_authenticate(self.alice)
+        url = f'/api/v1/movies/{self.movies[0].pk}/likes/'
+
+        response = client.post(url)
+        self.assertEqual(response.data, {'is_liked': True, 'count': 1})
+        response = client.post(url)
+        self.assertEqual(response.data, {'is_liked': False, 'count': 0})
+        self.assertCounts(0, 0, 0)
+
+    def test_movie_side(self):
+        movie = self.movies[0]
+        movie.like_users.add(self.alice, self.bob)
+        movie.like_users.add(self.alice)  # 이미 찜한 유저는 다시 세지 않음
+        self.assertCounts(2, 0, 0)
+        movie.like_users.remove(self.bob, self.bob)
+        self.assertCounts(1, 0, 0)
+        movie.like_users.clear()
+        self.assertCounts(0, 0, 0)
+
+    def test_user_side(self):
+        self.alice.like_movies.add(*self.movies)
+        self.bob.like_movies.add(self.movies[0])
+        self.assertCounts(2, 1, 1)
+        self.alice.like_movies.remove(self.movies[1])
+        self.assertCounts(2, 0, 1)
+        self.alice.like_movies.clear()
+        self.assertCounts(1, 0, 0)
+
+    def test_add_same_pair_twice(self):
+        # 동시에 들어온 찜하기 두 요청이 둘 다 pk_set에 같은 유저를 받은 경우
+        movie = self.movies[0]
+        movie.like_users.add(self.alice)
+        on_like_changed(Movie.like_users.through, movie, 'post_add', False, User, {self.alice.pk})
+        self.assertCounts(1, 0, 0)
+
+    def test_user_deleted(self):
+        self.alice.like_movies.add(*self.movies[:2])
+        self.bob.like_movies.add(self.movies[0])
+        self.bob.delete()
+        self.assertCounts(1, 1, 0)
+        User.objects.filter(pk=self.alice.pk).delete()
+        self.assertCounts(0, 0, 0)
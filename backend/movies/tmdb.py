@@ -0,0 +1,309 @@
+"""
+TMDb API 비동기 클라이언트
+
+get_tmdb 명령어의 동시 수집 모드에서 사용합니다.
+- 커넥션 풀을 공유하는 httpx.AsyncClient 하나로 모든 요청 처리
+- 동시 요청 수 제한 (Semaphore)
+- 토큰 버킷 방식의 초당 요청 수 제한 (TMDb 권장: IP당 초당 약 40~50회)
+- 429 / 5xx / 네트워크 오류 시 지수 백오프 재시도 (429는 Retry-After 헤더 우선)
+"""
+import asyncio
+import random
+import time
+from email.utils import format_datetime
+
+import httpx
+
+TMDB_BASE_URL = 'https://api.themoviedb.org/3'
+
+# 재시도 대상 상태 코드
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 조건부 요청 결과 304 (변경 없음)를 나타내는 값
+NOT_MODIFIED = object()
+
+
+class TokenBucket:
+    """
+    토큰 버킷 Rate Limiter
+    rate: 초당 채워지는 토큰 수, capacity: 한 번에 몰아서 쓸 수 있는 최대 토큰 수(burst)
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        # Lock 안에서 기다리므로 요청 순서대로(FIFO) 토큰을 받게 됩니다.
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    def penalize(self, seconds):
+        # 429를 받으면 그 시간만큼 버킷을 비워서 다른 요청들도 함께 쉬게 합니다.
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+class TMDbError(Exception):
+    pass
+
+
+class TMDbClient:
+    """
+    사용 예시:
+        async with TMDbClient(api_key, concurrency=16, rate=40) as client:
+            data = await client.popular(page=1)
+    """
+
+    def __init__(self, api_key, base_url=TMDB_BASE_URL, concurrency=16, rate=40,
+                 max_retries=5, timeout=10.0, recorder=None):
+        self.api_key = api_key
+        self.recorder = recorder  # movies.replay.Recorder (응답을 디스크에 녹화할 때)
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.request_count = 0  # 실제로 보낸 HTTP 요청 수 (재시도 포함)
+        self.retry_count = 0
+        self._client = None
+
+    async def __aenter__(self):
+        # 동시 요청 수만큼 keep-alive 커넥션을 유지해서 TLS 핸드셰이크를 재사용합니다.
+        limits = httpx.Limits(
+            max_connections=self.concurrency,
+            max_keepalive_connections=self.concurrency,
+        )
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=limits,
+            timeout=self.timeout,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        self._client = None
+
+    def _backoff(self, attempt):
+        # 0.5s, 1s, 2s, 4s ... (+ jitter), 최대 30초
+        return min(30.0, 0.5 * (2 ** attempt)) + random.uniform(0, 0.25)
+
+    async def get(self, path, **params):
+        """
+        GET 요청 후 JSON 반환. 404는 None 반환 (TMDb에서 삭제된 영화 등)
+        """
+        response = await self.request(path, **params)
+        return None if response is None else response.json()
+
+    async def request(self, path, headers=None, **params):
+        """
+        GET 요청 후 httpx.Response 반환 (304 응답도 그대로 반환). 404는 None 반환
+        """
+        params['api_key'] = self.api_key
+
+        for attempt in range(self.max_retries + 1):
+            async with self.semaphore:
+                await self.bucket.acquire()
+                self.request_count += 1
+                try:
+                    response = await self._client.get(path, params=params, headers=headers)
+                except httpx.TransportError as e:
+                    error, wait = e, self._backoff(attempt)
+                else:
+                    if response.status_code == 404:
+                        return None
+                    if response.status_code == 304:
+                        return response
+                    if response.status_code not in RETRY_STATUS_CODES:
+                        response.raise_for_status()
+                        if self.recorder is not None:
+                            self.recorder.save(path, params, response)
+                        return response
+
+                    error = TMDbError(f'{response.status_code} {path}')
+                    wait = self._backoff(attempt)
+                    if response.status_code == 429:
+                        retry_after = response.headers.get('Retry-After')
+                        if retry_after and retry_after.isdigit():
+                            wait = max(wait, float(retry_after))
+                        self.bucket.penalize(wait)
+
+            if attempt == self.max_retries:
+                break
+            self.retry_count += 1
+            await asyncio.sleep(wait)
+
+        raise TMDbError(f'재시도 {self.max_retries}회 초과: {path} ({error})')
+
+    # ------------------------------------------------------------------
+    # 엔드포인트별 헬퍼
+    # ------------------------------------------------------------------
+    async def genres(self, language='ko-KR'):
+        data = await self.get('/genre/movie/list', language=language)
+        return (data or {}).get('genres', [])
+
+    async def popular(self, page, language='ko-KR'):
+        data = await self.get('/movie/popular', language=language, page=page)
+        return (data or {}).get('results', [])
+
+    async def changes(self, start_date, end_date):
+        """
+        /movie/changes 피드에서 기간 내 변경된 영화 id 목록 반환 (TMDb 제한: 최대 14일)
+        """
+        params = {'start_date': start_date.isoformat(), 'end_date': end_date.isoformat()}
+        first = await self.get('/movie/changes', page=1, **params) or {}
+        total_pages = first.get('total_pages', 1)
+        rest = await asyncio.gather(
+            *(self.get('/movie/changes', page=page, **params) for page in range(2, total_pages + 1))
+        )
+        ids = set()
+        for data in [first, *rest]:
+            ids.update(item['id'] for item in (data or {}).get('results', []))
+        return ids
+
+    async def movie_detail(self, movie_id, etag=None, since=None):
+        """
+        한국어 상세 + credits + keywords + translations를 한 번에 요청합니다.
+        영어 줄거리/태그라인은 translations의 en 항목에서 꺼내므로 보통 영화당 1회 요청으로 끝나고,
+        en 번역이 없는 경우에만 en-US 상세를 한 번 더 요청합니다.
+
+        etag / since(datetime)를 주면 조건부 요청(If-None-Match / If-Modified-Since)을 보내고,
+        304 응답이면 NOT_MODIFIED를 반환합니다.
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if since:
+            headers['If-Modified-Since'] = format_datetime(since, usegmt=True)
+
+        response = await self.request(
+            f'/movie/{movie_id}',
+            headers=headers,
+            language='ko-KR',
+            append_to_response='credits,keywords,translations',
+        )
+        if response is None:
+            return None
+        if response.status_code == 304:
+            return NOT_MODIFIED
+
+        detail = response.json()
+        detail['etag'] = response.headers.get('ETag', '')
+
+        english = find_english_translation(detail)
+        if english is None:
+            detail_en = await self.get(f'/movie/{movie_id}', language='en-US') or {}
+            english = {
+                'overview': detail_en.get('overview', ''),
+                'tagline': detail_en.get('tagline', ''),
+            }
+        detail['english'] = english
+        return detail
+
+
+def find_english_translation(detail):
+    translations = detail.get('translations', {}).get('translations', [])
+    candidates = [t for t in translations if t.get('iso_639_1') == 'en']
+    # en-US를 우선 사용하고, 없으면 다른 영어권 번역 사용
+    candidates.sort(key=lambda t: t.get('iso_3166_1') != 'US')
+    for translation in candidates:
+        data = translation.get('data') or {}
+        if data.get('overview') or data.get('tagline'):
+            return {'overview': data.get('overview', ''), 'tagline': data.get('tagline', '')}
+    return None
+
+
+def list_item_from_detail(detail):
+    """
+    상세 응답을 popular 목록 항목과 같은 형태로 변환 (증분 동기화에서는 목록 없이 상세만 받기 때문)
+    """
+    return {
+        'id': detail['id'],
+        'title': detail.get('title', ''),
+        'overview': detail.get('overview', ''),
+        'poster_path': detail.get('poster_path'),
+        'release_date': detail.get('release_date'),
+        'popularity': detail.get('popularity', 0),
+        'vote_average': detail.get('vote_average', 0),
+        'vote_count': detail.get('vote_count', 0),
+        'genre_ids': [genre['id'] for genre in detail.get('genres', [])],
+    }
+
+
+def build_overview_en(detail, fallback=''):
+    """
+    감정 분석용 영어 텍스트 만들기 (태그라인 -> 줄거리 -> 키워드 순서)
+    """
+    english = detail.get('english') or {}
+    overview_raw = english.get('overview', '')
+    tagline_raw = english.get('tagline', '')
+
+    # 키워드 추출 (리스트 형태 -> 문자열로 변환)
+    # 예: ['prison', 'escape'] -> "prison, escape"
+    keywords_data = detail.get('keywords', {}).get('keywords', [])
+    keywords_str = ", ".join(k['name'] for k in keywords_data)
+
+    full_text_parts = []
+    if tagline_raw:
+        full_text_parts.append(f"{tagline_raw}.")  # 태그라인 끝에 마침표 추가
+    if overview_raw:
+        full_text_parts.append(overview_raw)
+    if keywords_str:
+        full_text_parts.append(f"Keywords: {keywords_str}.")  # 키워드임을 명시
+
+    overview_en = " ".join(full_text_parts)
+
+    # 다 합쳤는데도 빈 값이면 한국어 줄거리로 대체 (방어 코드)
+    if not overview_en.strip():
+        overview_en = fallback
+    return overview_en
+
+
+def parse_movie(movie_data, detail):
+    """
+    popular 목록 항목 + 상세 응답 -> Movie 필드 dict
+    """
+    credits = detail.get('credits', {})
+
+    director_name = "Unknown"
+    director_entry = next((person for person in credits.get('crew', []) if person['job'] == 'Director'), None)
+    if director_entry:
+        director_name = director_entry['name']
+
+    actors_list = [
+        {
+            'name': cast['name'],
+            'character': cast['character'],
+            'profile_path': cast['profile_path'],
+        }
+        for cast in credits.get('cast', [])[:5]
+    ]
+
+    return {
+        'tmdb_id': movie_data['id'],
+        'title': movie_data['title'],
+        'overview': movie_data['overview'],
+        'overview_en': build_overview_en(detail, fallback=movie_data['overview']),
+        'poster_path': movie_data['poster_path'],
+        'release_date': movie_data.get('release_date') or None,  # 개봉일 빈 값 처리
+        'popularity': movie_data['popularity'],
+        'vote_average': movie_data['vote_average'],
+        'vote_count': movie_data['vote_count'],
+        'runtime': detail.get('runtime'),
+        'director': director_name,
+        'actors': actors_list,
+        'tmdb_etag': detail.get('etag', ''),
+    }
@@ -0,0 +1,224 @@
+"""
+검색창 자동완성 (GET /api/v1/movies/autocomplete/?q=...)
+
+워커 프로세스마다 영화 제목 / 감독 / 배우 이름으로 메모리 안에 정렬된 키 배열을 만들어 두고
+bisect로 접두사 범위를 찾습니다. 요청마다 SQL을 실행하지 않습니다.
+
+- 키는 소문자 + 공백 제거, 단어 시작 위치마다 하나씩 ('다크 나이트' -> '다크나이트', '나이트')
+- 초성 검색: 한글을 초성으로 바꾼 키 배열을 따로 만들어 두고, 검색어에 자음(ㄱ~ㅎ)이 있으면 그쪽에서 찾음
+  ('ㄱㅅㅊ' -> '기생충', '봉ㅈㅎ' -> '봉준호')
+  완성된 글자가 섞인 검색어는 초성 범위에서 찾은 뒤 원래 키와 글자마다 비교해서 거름 ('봉ㅈㅎ'에 '박지환'은 제외)
+- 인기도순 상위 k개: 키가 SCAN_LIMIT개보다 많은 접두사(짧은 검색어)는 만들 때 상위 목록을 미리 계산,
+  나머지는 범위 안의 키만 훑음
+- 카탈로그 버전(movies.catalog.catalog_version)이 바뀌면 백그라운드에서 새 인덱스를 만든 뒤 한 번에 교체
+  (만드는 동안에는 이전 인덱스로 응답)
+"""
+import heapq
+import re
+from bisect import bisect_left
+
+import numpy as np
+
+from .catalog import VersionedValue
+from .models import Movie
+
+SCAN_LIMIT = 256         # 이보다 키가 많은 접두사는 상위 목록을 미리 계산
+TOP_K = 10               # 미리 계산하는 상위 목록 길이 (= 최대 결과 수)
+MAX_ACTORS = 5           # 영화마다 색인하는 배우 수 (출연 순)
+
+FIELD_TITLE, FIELD_DIRECTOR, FIELD_ACTOR = 'title', 'director', 'actor'
+
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+HANGUL_START, HANGUL_END = 0xAC00, 0xD7A3
+JAMO_START, JAMO_END = 0x3131, 0x314E  # 호환용 자모 ㄱ~ㅎ
+KEY_END = '\U0010ffff'
+HANGUL_RE = re.compile('[\uac00-\ud7a3]')
+JAMO_RE = re.compile('[\u3131-\u314e]')
+
+
+def normalize(text):
+    return ''.join(text.lower().split())
+
+
+def to_chosung(text):
+    """
+    한글 음절을 초성으로 ('기생충' -> 'ㄱㅅㅊ'), 나머지 문자는 그대로
+    """
+    return ''.join(
+        CHOSUNG[(ord(ch) - HANGUL_START) // 588] if HANGUL_START <= ord(ch) <= HANGUL_END else ch
+        for ch in text
+    )
+
+
+def has_hangul(text):
+    return HANGUL_RE.search(text) is not None
+
+
+def has_jamo(text):
+    return JAMO_RE.search(text) is not None
+
+
+def syllables_match(query, key):
+    """
+    검색어의 자음(ㄱ~ㅎ)이 아닌 글자가 원래 키의 같은 위치 글자와 모두 같은지 ('봉ㅈㅎ', '봉준호' -> True)
+    """
+    return all(ch == key[i] for i, ch in enumerate(query) if not JAMO_START <= ord(ch) <= JAMO_END)
+
+
+def word_keys(text):
+    """
+    'The Dark Knight' -> ['thedarkknight', 'darkknight', 'knight']
+    """
+    words = text.lower().split()
+    return [''.join(words[i:]) for i in range(len(words))]
+
+
+class PrefixIndex:
+    """
+    정렬된 키 배열 + 키별 (영화 번호, 필드, 표시 이름) + 원래 키 + 무거운 접두사의 상위 목록
+    """
+
+    def __init__(self, entries, popularity):
+        # entries: [(키, 영화 번호, 필드, 표시 이름, 원래 키), ...] (원래 키: 초성으로 바꾸기 전 키)
+        entries.sort(key=lambda e: e[0])
+        self.keys = [e[0] for e in entries]
+        self.payloads = [e[1:4] for e in entries]
+        self.sources = [e[4] for e in entries]
+        self.popularity = popularity
+        # 키별 인기도 (만들 때 큰 범위의 상위 목록을 numpy로 계산하는 데만 사용)
+        self.key_popularity = np.array([popularity[e[1]] for e in entries], dtype=np.float64)
+        self.heavy = self._precompute()
+        del self.key_popularity
+
+    def _top(self, lo, hi, k):
+        """
+        keys[lo:hi] 중 인기도 상위 k편 (영화당 1개, 범위가 큰 접두사를 만들 때만 사용)
+        """
+        scores = self.key_popularity[lo:hi]
+        m = k * 4
+        while True:
+            m = min(m, hi - lo)
+            candidates = np.argpartition(scores, len(scores) - m)[len(scores) - m:]
+            ranked = candidates[np.argsort(-scores[candidates], kind='stable')] + lo
+            picked, movies = [], set()
+            for i in ranked.tolist():
+                movie = self.payloads[i][0]
+                if movie not in movies:
+                    movies.add(movie)
+                    picked.append(self.payloads[i])
+                    if len(picked) == k:
+                        return picked
+            if m == hi - lo:
+                return picked
+            # 같은 영화의 키가 여러 개라 k편이 안 되면 후보를 늘려서 다시
+            m *= 4
+
+    def _top_all(self, lo, hi, k, accept=None):
+        best = {}
+        for i in range(lo, hi):
+            if accept is not None and not accept(self.sources[i]):
+                continue
+            movie = self.payloads[i][0]
+            best.setdefault(movie, self.payloads[i])
+        return heapq.nlargest(k, best.values(), key=lambda p: self.popularity[p[0]])
+
+    def _precompute(self):
+        # 길이 1 접두사부터 시작해서, 키가 SCAN_LIMIT개보다 많은 접두사만 한 글자씩 더 늘려 가며 계산
+        heavy = {}
+        ranges = [(0, len(self.keys))]
+        length = 1
+        while ranges:
+            next_ranges = []
+            for lo, hi in ranges:
+                i = lo
+                while i < hi:
+                    key = self.keys[i]
+                    if len(key) < length:
+                        i += 1
+                        continue
+                    prefix = key[:length]
+                    j = bisect_left(self.keys, prefix + KEY_END, i, hi)
+                    if j - i > SCAN_LIMIT:
+                        heavy[prefix] = self._top(i, j, TOP_K)
+                        next_ranges.append((i, j))
+                    i = j
+            ranges = next_ranges
+            length += 1
+        return heavy
+
+    def search(self, prefix, k, accept=None):
+        """
+        accept(원래 키) -> bool 을 주면 범위 안에서 통과한 키만 (미리 계산한 상위 목록은 사용하지 않음)
+        """
+        if not prefix:
+            return []
+        top = self.heavy.get(prefix) if accept is None else None
+        if top is not None:
+            return top[:k]
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + KEY_END, lo)
+        return self._top_all(lo, hi, k, accept)
+
+
+class TypeaheadIndex:
+    def __init__(self, version, rows):
+        # rows: [(tmdb_id, title, poster_path, popularity, director, actors), ...]
+        self.version = version
+        self.movies = [(tmdb_id, title, poster_path) for tmdb_id, title, poster_path, *_ in rows]
+        popularity = [row[3] or 0 for row in rows]
+
+        entries, chosung_entries = [], []
+        for number, (_, title, _, _, director, actors) in enumerate(rows):
+            names = [(FIELD_TITLE, title)]
+            if director:
+                names.append((FIELD_DIRECTOR, director))
+            names += [
+                (FIELD_ACTOR, actor['name'])
+                for actor in (actors or [])[:MAX_ACTORS]
+                if isinstance(actor, dict) and actor.get('name')
+            ]
+            for field, name in names:
+                keys = set(word_keys(name))
+                entries += [(key, number, field, name, key) for key in keys]
+                if has_hangul(name):
+                    chosung_entries += [(to_chosung(key), number, field, name, key) for key in keys]
+
+        self.plain = PrefixIndex(entries, popularity)
+        self.chosung = PrefixIndex(chosung_entries, popularity)
+
+    def search(self, query, k=TOP_K):
+        """
+        [{'tmdb_id', 'title', 'poster_path', 'field', 'match'}, ...] (인기도순)
+        """
+        prefix = normalize(query)
+        if has_jamo(prefix):
+            # '봉ㅈㅎ'처럼 완성된 글자가 섞여 있으면 그 글자까지 같은 키만
+            accept = (lambda key: syllables_match(prefix, key)) if has_hangul(prefix) else None
+            matches = self.chosung.search(to_chosung(prefix), k, accept)
+        else:
+            matches = self.plain.search(prefix, k)
+        results = []
+        for number, field, name in matches:
+            tmdb_id, title, poster_path = self.movies[number]
+            results.append({
+                'tmdb_id': tmdb_id,
+                'title': title,
+                'poster_path': poster_path,
+                'field': field,
+                'match': name,
+            })
+        return results
+
+
+def build_index(version):
+    rows = list(
+        Movie.objects.order_by('pk').values_list('tmdb_id', 'title', 'poster_path', 'popularity', 'director', 'actors')
+    )
+    return TypeaheadIndex(version, rows)
+
+
+_index = VersionedValue(build_index)
+
+
+def autocomplete(query, k=TOP_K):
+    return _index.get().search(query, min(k, TOP_K))
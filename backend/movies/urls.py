@@ -4,8 +4,11 @@ from . import views
 urlpatterns = [
     path('popular/', views.movie_popular, name='movie_popular'), # GET /movies/popular/
     path('list/', views.movie_list_by_ids, name='movie_list_by_ids'), # GET /movies/list/?ids=1,2,3
+    path('semantic/', views.movie_semantic_search, name='movie_semantic_search'), # GET /movies/semantic/?q=...
+    path('autocomplete/', views.movie_autocomplete, name='movie_autocomplete'), # GET /movies/autocomplete/?q=ㄱㅅㅊ
     path('<int:movie_pk>/', views.movie_detail, name='movie_detail'), # GET /movies/12345/
-    # 찜하기 (POST): /api/v1/movies/123/likes/
+    path('<int:movie_pk>/similar/', views.movie_similar, name='movie_similar'), # GET /movies/12345/similar/
+    # 찜하기 (POST), 내 찜 여부 + 찜한 사람 수 (GET): /api/v1/movies/123/likes/
     path('<int:movie_pk>/likes/', views.likes, name='likes'),
     # 내가 찜한 목록 (GET): /api/v1/movies/my-likes/
     path('my-likes/', views.my_like_movies, name='my_like_movies'),
@@ -1,49 +1,140 @@
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.settings import api_settings
 from django.shortcuts import get_object_or_404, get_list_or_404
-from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from django.db import transaction
 
+from .cache import CATALOG_SCOPE, cache_response, catalog_etag
 from .models import Movie
 from .serializers import MovieListSerializer, MovieDetailSerializer
+from .snapshot import get_snapshot
+from .similar import SIMILAR_COUNT, similar_tmdb_ids
+from .semantic import semantic_search
+from .search import search_movie_ids
+from .typeahead import TOP_K, autocomplete
+
+# 자연어 검색 기본/최대 결과 수
+SEMANTIC_COUNT = 20
+SEMANTIC_MAX_COUNT = 100
 
 @api_view(['GET'])
+@cache_response(lambda request: [CATALOG_SCOPE])
 def movie_list(request):
     search_keyword = request.GET.get('search', '').strip()
-    
+
     if search_keyword:
-        # 제목이나 원제에 검색어가 포함된 영화 검색
-        movies = Movie.objects.filter(
-            Q(title__icontains=search_keyword)
-        ).order_by('-popularity') # 인기도순 정렬
+        # 제목 / 감독 / 배우 / 줄거리 전문 검색 (FTS5, BM25 + 인기도순, 최대 200편)
+        movie_ids = search_movie_ids(search_keyword)
     else:
-        # 검색어 없으면 빈 리스트 반환 (혹은 전체 목록)
-        movies = [] 
+        # 검색어 없으면 빈 리스트 반환
+        movie_ids = []
 
-    # 검색 결과 페이지이므로 개수 제한 없이(또는 넉넉하게) 보냅니다.
-    serializer = MovieListSerializer(movies, many=True)
+    # 요청한 페이지의 영화만 조회 (검색 순서 유지, 설정의 DEFAULT_PAGINATION_CLASS -> {count, next, previous, results})
+    paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+    page_ids = paginator.paginate_queryset(movie_ids, request)
+    movies = Movie.objects.in_bulk(page_ids)
+    serializer = MovieListSerializer([movies[pk] for pk in page_ids if pk in movies], many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+# 자연어 검색: 줄거리 의미가 비슷한 영화 (예: "a heist that goes wrong in a casino")
+# 요청 예시: GET /movies/semantic/?q=검색어&k=20
+@api_view(['GET'])
+def movie_semantic_search(request):
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return Response({'error': 'q parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        k = min(max(int(request.GET.get('k', SEMANTIC_COUNT)), 1), SEMANTIC_MAX_COUNT)
+    except ValueError:
+        return Response({'error': 'k must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        results = semantic_search(query, k)
+    except ImportError:
+        return Response({'error': 'semantic search requires transformers and torch'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    if results is None:
+        # 아직 embed_movies를 실행하지 않음
+        return Response({'error': 'semantic index is not built'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    # 유사도 순서 유지
+    tmdb_ids = [tmdb_id for tmdb_id, _ in results]
+    movies = Movie.objects.in_bulk(tmdb_ids, field_name='tmdb_id')
+    serializer = MovieListSerializer([movies[tmdb_id] for tmdb_id in tmdb_ids if tmdb_id in movies], many=True)
     return Response(serializer.data)
 
+# 검색창 자동완성 (제목 / 감독 / 배우, 초성 검색 지원, 인기도순)
+# 요청 예시: GET /movies/autocomplete/?q=ㄱㅅㅊ&k=10
+@api_view(['GET'])
+def movie_autocomplete(request):
+    query = request.GET.get('q', '').strip()
+    try:
+        k = min(max(int(request.GET.get('k', TOP_K)), 1), TOP_K)
+    except ValueError:
+        return Response({'error': 'k must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    # 워커 메모리의 인덱스에서 바로 찾음 (SQL 없음)
+    return Response(autocomplete(query, k) if query else [])
+
+# 아래 세 API는 유저와 무관한 응답이라 인증을 건너뛰고(토큰 확인용 유저 조회도 없음)
+# 카탈로그 버전 ETag로 If-None-Match 요청에 바로 304를 돌려줍니다. (movies.cache.catalog_etag)
+
 # 1. Home 페이지: 인기 영화 Top 20 조회
 @api_view(['GET'])
+@authentication_classes([])
+@catalog_etag
 def movie_popular(request):
-    # popularity 필드 기준 내림차순 정렬 후 20개 슬라이싱
-    movies = Movie.objects.order_by('-popularity')[:20]
-    serializer = MovieListSerializer(movies, many=True)
-    return Response(serializer.data)
+    # 카탈로그 스냅샷(movies.snapshot)에 미리 정렬해 둔 인기도 상위 20개
+    return Response([record.list_data() for record in get_snapshot().popular])
 
 # 2. 특정 영화 1개 상세 조회 (movie_id로 요청)
+# 찜 여부 / 찜한 사람 수는 GET /movies/<pk>/likes/ 에서 따로 조회
 @api_view(['GET'])
+@authentication_classes([])
+@catalog_etag
 def movie_detail(request, movie_pk):
-    # tmdb_id를 기준으로 조회 (DB에 없으면 404 에러)
-    movie = get_object_or_404(Movie, tmdb_id=movie_pk)
-    serializer = MovieDetailSerializer(movie)
+    record = get_snapshot().get(movie_pk)
+    if record is None:
+        # 스냅샷을 다시 만드는 중에 막 추가된 영화 등 -> DB에서 조회 (DB에도 없으면 404 에러)
+        movie = get_object_or_404(Movie, tmdb_id=movie_pk)
+        serializer = MovieDetailSerializer(movie)
+        return Response(serializer.data)
+    # MovieDetailSerializer와 같은 응답
+    return Response(record.detail_data())
+
+# 2-1. 비슷한 영화 조회 (상세 페이지 하단)
+# 요청 예시: GET /movies/12345/similar/?k=10
+@api_view(['GET'])
+def movie_similar(request, movie_pk):
+    try:
+        k = min(max(int(request.GET.get('k', SIMILAR_COUNT)), 1), SIMILAR_COUNT)
+    except ValueError:
+        return Response({'error': 'k must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+    # 미리 계산해 둔 인덱스(movies.similar)에서 바로 읽음 (영화 수와 무관)
+    similar_ids = similar_tmdb_ids(movie_pk, k)
+    if similar_ids is not None:
+        movies = Movie.objects.in_bulk(similar_ids, field_name='tmdb_id')
+        similar = [movies[tmdb_id] for tmdb_id in similar_ids if tmdb_id in movies]
+    else:
+        # 인덱스에 없는 영화(감정 분석 전 등)는 같은 장르의 인기 영화로 대체
+        movie = get_object_or_404(Movie, tmdb_id=movie_pk)
+        similar = (
+            Movie.objects
+            .filter(genres__in=movie.genres.all())
+            .exclude(pk=movie.pk)
+            .distinct()
+            .order_by('-popularity')[:k]
+        )
+
+    serializer = MovieListSerializer(similar, many=True)
     return Response(serializer.data)
 
 # 3. 여러 영화 ID로 정보 조회 (장바구니, 좋아요 목록 등)
 # 요청 예시: GET /movies/list/?ids=101,102,103
 @api_view(['GET'])
+@authentication_classes([])
+@catalog_etag
 def movie_list_by_ids(request):
     ids = request.GET.get('ids', '') # URL 쿼리 파라미터에서 ids 가져오기
     
@@ -53,30 +144,39 @@ def movie_list_by_ids(request):
     # 콤마로 분리하여 리스트로 변환
     id_list = [int(id) for id in ids.split(',') if id.isdigit()]
     
-    # tmdb_id가 id_list 안에 있는 영화들 필터링
-    movies = Movie.objects.filter(tmdb_id__in=id_list)
-    serializer = MovieListSerializer(movies, many=True)
-    return Response(serializer.data)
+    # tmdb_id가 id_list 안에 있는 영화들 (스냅샷에서 조회)
+    records = get_snapshot().list_by_ids(id_list)
+    return Response([record.list_data() for record in records])
 
 
-# 찜하기 기능 (토글)
-@api_view(['POST'])
-@permission_classes([IsAuthenticated])
+# 찜하기 기능 (GET: 내 찜 여부 + 찜한 사람 수, POST: 토글)
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticatedOrReadOnly])
 def likes(request, movie_pk):
     movie = get_object_or_404(Movie, pk=movie_pk)
+
+    if request.method == 'GET':
+        context = {
+            'is_liked': request.user.is_authenticated and movie.like_users.filter(pk=request.user.pk).exists(),
+            'count': movie.like_count,
+        }
+        return Response(context, status=status.HTTP_200_OK)
     
-    # 이미 찜한 상태면 -> 취소 (remove)
-    if movie.like_users.filter(pk=request.user.pk).exists():
-        movie.like_users.remove(request.user)
-        is_liked = False
-    # 찜하지 않은 상태면 -> 추가 (add)
-    else:
-        movie.like_users.add(request.user)
-        is_liked = True
+    with transaction.atomic():
+        # 이미 찜한 상태면 -> 취소 (remove)
+        if movie.like_users.filter(pk=request.user.pk).exists():
+            movie.like_users.remove(request.user)
+            is_liked = False
+        # 찜하지 않은 상태면 -> 추가 (add)
+        else:
+            movie.like_users.add(request.user)
+            is_liked = True
+        # like_count는 시그널이 같은 트랜잭션에서 갱신 (movies.counters) -> 갱신된 값만 다시 읽음
+        movie.refresh_from_db(fields=['like_count'])
         
     context = {
         'is_liked': is_liked,
-        'count': movie.like_users.count() # 현재 찜한 사람 수도 같이 반환하면 좋음
+        'count': movie.like_count # 현재 찜한 사람 수도 같이 반환하면 좋음
     }
     return Response(context, status=status.HTTP_200_OK)
 
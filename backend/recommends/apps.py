@@ -4,3 +4,36 @@ from django.apps import AppConfig
 class RecommendsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'recommends'
+
+    def ready(self):
+        # 감정 벡터 행렬을 다시 내보내면(영화 수집 / 감정 분석 후) 기분별 후보 풀도 다시 만듦
+        from moods.vectors import mood_matrix_exported
+        from .pools import rebuild_mood_pools
+
+        mood_matrix_exported.connect(rebuild_mood_pools, dispatch_uid='rebuild_mood_pools')
+
+        # 추천 기록 / 찜하기가 저장되면 유저별 "본 영화" 비트셋에 추가
+        from django.db.models.signals import m2m_changed
+        from movies.models import Movie
+        from .models import Recommendation
+        from .seen import on_liked, on_recommended
+
+        m2m_changed.connect(on_recommended, sender=Recommendation.recommended_movies.through, dispatch_uid='seen_recommended')
+        m2m_changed.connect(on_liked, sender=Movie.like_users.through, dispatch_uid='seen_liked')
+
+        # 찜 / 리뷰 평점이 바뀌면 아이템 기반 협업 필터링 이웃 목록을 증분 갱신
+        from django.contrib.auth import get_user_model
+        from django.db.models.signals import post_delete, post_save, pre_delete
+        from community.models import Review
+        from .cf import on_movie_liked, on_review_changed, on_user_deleted
+
+        m2m_changed.connect(on_movie_liked, sender=Movie.like_users.through, dispatch_uid='cf_liked')
+        post_save.connect(on_review_changed, sender=Review, dispatch_uid='cf_review_saved')
+        post_delete.connect(on_review_changed, sender=Review, dispatch_uid='cf_review_deleted')
+        pre_delete.connect(on_user_deleted, sender=get_user_model(), dispatch_uid='cf_user_deleted')
+
+        # 좋아하는 영화가 바뀌면 유저 취향 벡터 갱신
+        from .cf import interaction_changed
+        from .taste import on_interaction_changed
+
+        interaction_changed.connect(on_interaction_changed, dispatch_uid='taste_interaction_changed')
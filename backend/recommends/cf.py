@@ -0,0 +1,239 @@
+"""
+아이템 기반 협업 필터링 ("이 영화를 좋아한 사람들이 좋아한 영화")
+
+- 좋아요 신호: 찜(Movie.like_users) + HIGH_RANK점 이상 리뷰 (MovieInteraction)
+- 두 영화를 모두 좋아한 유저 수를 희소 행렬로 저장 (MoviePair)
+- 유사도: 코사인 = 함께 좋아한 유저 수 / sqrt(영화 A를 좋아한 유저 수 x 영화 B를 좋아한 유저 수)
+- 영화별로 유사도 상위 NEIGHBOR_COUNT개만 MovieNeighbors에 미리 저장해 두고 API는 읽기만 합니다.
+
+찜/리뷰가 바뀌면 sync_interaction()이, 유저를 지우면 forget_user()가 바뀐 영화와 관련된 행만 갱신합니다.
+(다른 영화 목록에서 빠진 자리는 다음 전체 재계산 때 채워지므로 가끔 build_item_neighbors 실행)
+"""
+import math
+from collections import Counter, defaultdict
+from itertools import combinations
+
+from django.db import transaction
+from django.db.models import Q, F
+from django.dispatch import Signal
+
+from community.models import Review
+from movies.models import Movie
+from .models import MovieInteraction, MovieNeighbors, MoviePair
+
+HIGH_RANK = 4.0        # 이 점수 이상의 리뷰를 "좋아함"으로 취급 (5점 만점)
+NEIGHBOR_COUNT = 50    # 영화별로 저장하는 이웃 수
+
+# 유저가 영화를 새로 좋아하게 되거나(positive=True) 더 이상 좋아하지 않게 되면 발생
+# 인자: user_id, movie_id, positive (recommends.taste가 취향 벡터를 갱신)
+interaction_changed = Signal()
+
+
+def similarity(co_count, count_a, count_b):
+    if not co_count or not count_a or not count_b:
+        return 0.0
+    return co_count / math.sqrt(count_a * count_b)
+
+
+def is_positive(user_id, movie_id):
+    liked = Movie.like_users.through.objects.filter(user_id=user_id, movie_id=movie_id).exists()
+    return liked or Review.objects.filter(user_id=user_id, movie_id=movie_id, rank__gte=HIGH_RANK).exists()
+
+
+def pair_filter(movie_id, others):
+    # (movie_id, 다른 영화) 쌍을 movie_a < movie_b 순서로 찾는 조건
+    return (
+        Q(movie_a_id=movie_id, movie_b_id__in=[o for o in others if o > movie_id])
+        | Q(movie_b_id=movie_id, movie_a_id__in=[o for o in others if o < movie_id])
+    )
+
+
+def sync_interaction(user_id, movie_id):
+    """
+    찜/리뷰 변경 후 호출: 좋아함 여부가 바뀌었으면 동시 출현 수와 이웃 목록을 증분 갱신합니다.
+    """
+    with transaction.atomic():
+        positive = is_positive(user_id, movie_id)
+        changed = apply_interaction(user_id, movie_id, positive)
+    if changed:
+        interaction_changed.send(sender=None, user_id=user_id, movie_id=movie_id, positive=positive)
+
+
+def forget_user(user_id):
+    """
+    유저를 지우기 전에 호출: 그 유저의 좋아요를 모두 빼서 동시 출현 수와 이웃 목록을 갱신합니다.
+    (CASCADE로 지워지는 MovieInteraction은 시그널이 없고, 지워질 유저라 취향 벡터는 갱신하지 않음)
+    """
+    with transaction.atomic():
+        movie_ids = list(MovieInteraction.objects.filter(user_id=user_id).values_list('movie_id', flat=True))
+        for movie_id in movie_ids:
+            apply_interaction(user_id, movie_id, False)
+    return len(movie_ids)
+
+
+def apply_interaction(user_id, movie_id, positive):
+    """
+    (user_id, movie_id)의 좋아함 여부를 positive로 맞추고 관련 행을 증분 갱신 (트랜잭션 안에서 호출)
+    반환값: 바뀌었는지 여부
+    """
+    if positive:
+        _, changed = MovieInteraction.objects.get_or_create(user_id=user_id, movie_id=movie_id)
+    else:
+        changed, _ = MovieInteraction.objects.filter(user_id=user_id, movie_id=movie_id).delete()
+    if not changed:
+        return False
+    delta = 1 if positive else -1
+
+    # 1. 이 유저가 좋아한 다른 영화들과의 동시 출현 수 +-1
+    others = list(
+        MovieInteraction.objects.filter(user_id=user_id).exclude(movie_id=movie_id).values_list('movie_id', flat=True)
+    )
+    if others:
+        pairs = MoviePair.objects.filter(pair_filter(movie_id, others))
+        pairs.update(count=F('count') + delta)
+        if positive:
+            existing = {a if b == movie_id else b for a, b in pairs.values_list('movie_a_id', 'movie_b_id')}
+            MoviePair.objects.bulk_create([
+                MoviePair(movie_a_id=min(movie_id, o), movie_b_id=max(movie_id, o), count=1)
+                for o in others if o not in existing
+            ])
+        else:
+            pairs.filter(count__lte=0).delete()
+
+    # 2. 이 영화를 좋아한 유저 수 +-1
+    MovieNeighbors.objects.get_or_create(movie_id=movie_id)
+    MovieNeighbors.objects.filter(movie_id=movie_id).update(user_count=F('user_count') + delta)
+
+    # 3. 이 영화의 이웃 목록은 새로 계산, 다른 영화들의 목록에서는 이 영화 항목만 고침
+    refresh_neighbors(movie_id, others)
+    return True
+
+
+def co_counts_for(movie_id):
+    """
+    {다른 영화 pk: movie_id와 함께 좋아한 유저 수}
+    """
+    pairs = MoviePair.objects.filter(Q(movie_a_id=movie_id) | Q(movie_b_id=movie_id))
+    return {
+        (a if b == movie_id else b): count
+        for a, b, count in pairs.values_list('movie_a_id', 'movie_b_id', 'count')
+    }
+
+
+def refresh_neighbors(movie_id, touched=()):
+    """
+    movie_id의 이웃 목록을 다시 계산하고, 함께 좋아한 영화들(+ 방금 쌍이 사라졌을 수 있는 touched)의
+    목록에서 movie_id 항목의 유사도를 고쳐 넣거나 뺍니다.
+    """
+    counts = co_counts_for(movie_id)
+    user_counts = dict(
+        MovieNeighbors.objects.filter(movie_id__in=[movie_id, *counts]).values_list('movie_id', 'user_count')
+    )
+    own_count = user_counts.get(movie_id, 0)
+    scores = {
+        other: similarity(count, own_count, user_counts.get(other, 0))
+        for other, count in counts.items()
+    }
+    MovieNeighbors.objects.filter(movie_id=movie_id).update(neighbors=top_neighbors(scores.items()))
+
+    rows = list(MovieNeighbors.objects.filter(movie_id__in={*counts, *touched}))
+    for row in rows:
+        entries = [entry for entry in row.neighbors if entry[0] != movie_id]
+        entries.append([movie_id, scores.get(row.movie_id, 0.0)])
+        row.neighbors = top_neighbors(entries)
+    MovieNeighbors.objects.bulk_update(rows, ['neighbors'], batch_size=500)
+
+
+def top_neighbors(scored):
+    ranked = sorted(((int(m), round(float(s), 6)) for m, s in scored if s > 0), key=lambda e: (-e[1], e[0]))
+    return [list(entry) for entry in ranked[:NEIGHBOR_COUNT]]
+
+
+def rebuild_all():
+    """
+    찜/리뷰 전체로 MovieInteraction, MoviePair, MovieNeighbors를 처음부터 다시 만듭니다.
+    반환값: (유저-영화 수, 영화 쌍 수)
+    """
+    positives = defaultdict(set)
+    for user_id, movie_id in Movie.like_users.through.objects.values_list('user_id', 'movie_id').iterator():
+        positives[user_id].add(movie_id)
+    reviews = Review.objects.filter(rank__gte=HIGH_RANK).values_list('user_id', 'movie_id')
+    for user_id, movie_id in reviews.iterator():
+        positives[user_id].add(movie_id)
+
+    user_counts = Counter()
+    co_counts = Counter()
+    for movies in positives.values():
+        user_counts.update(movies)
+        co_counts.update(combinations(sorted(movies), 2))
+
+    neighbors = defaultdict(list)
+    for (a, b), count in co_counts.items():
+        score = similarity(count, user_counts[a], user_counts[b])
+        neighbors[a].append((b, score))
+        neighbors[b].append((a, score))
+
+    with transaction.atomic():
+        MovieInteraction.objects.all().delete()
+        MoviePair.objects.all().delete()
+        MovieNeighbors.objects.all().delete()
+        MovieInteraction.objects.bulk_create(
+            [MovieInteraction(user_id=u, movie_id=m) for u, movies in positives.items() for m in movies],
+            batch_size=1000,
+        )
+        MoviePair.objects.bulk_create(
+            [MoviePair(movie_a_id=a, movie_b_id=b, count=c) for (a, b), c in co_counts.items()],
+            batch_size=1000,
+        )
+        MovieNeighbors.objects.bulk_create(
+            [
+                MovieNeighbors(movie_id=m, user_count=count, neighbors=top_neighbors(neighbors[m]))
+                for m, count in user_counts.items()
+            ],
+            batch_size=1000,
+        )
+    return sum(user_counts.values()), len(co_counts)
+
+
+def neighbor_ids(movie_id, k):
+    """
+    미리 계산한 이웃 목록에서 상위 k개 (영화 pk, 유사도)
+    """
+    neighbors = MovieNeighbors.objects.filter(movie_id=movie_id).values_list('neighbors', flat=True).first()
+    return [(m, score) for m, score in (neighbors or [])[:k]]
+
+
+# ---- 시그널 핸들러 (recommends.apps에서 연결) ----
+
+def on_movie_liked(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # clear()는 pk_set이 없으므로 지우기 전에 대상 id를 기억해 두고 post_clear에서 동기화
+        if reverse:
+            rows = sender.objects.filter(user_id=instance.pk).values_list('movie_id', flat=True)
+        else:
+            rows = sender.objects.filter(movie_id=instance.pk).values_list('user_id', flat=True)
+        instance._cf_cleared_ids = set(rows)
+        return
+    if action == 'post_clear':
+        pk_set = instance.__dict__.pop('_cf_cleared_ids', None)
+    elif action not in ('post_add', 'post_remove'):
+        return
+    if not pk_set:
+        return
+    if reverse:
+        # user.like_movies.add(movie) 형태
+        for movie_id in pk_set:
+            sync_interaction(instance.pk, movie_id)
+    else:
+        for user_id in pk_set:
+            sync_interaction(user_id, instance.pk)
+
+
+def on_review_changed(sender, instance, **kwargs):
+    # 리뷰 작성/수정(평점 변경)/삭제
+    sync_interaction(instance.user_id, instance.movie_id)
+
+
+def on_user_deleted(sender, instance, **kwargs):
+    # User pre_delete (CASCADE로 지워지는 찜 / 리뷰 / MovieInteraction은 위 핸들러를 거치지 않음)
+    forget_user(instance.pk)
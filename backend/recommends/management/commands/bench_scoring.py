@@ -0,0 +1,62 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from moods.vectors import MOOD_LABELS
+from recommends.scoring import MOOD_VECTORS, build_prior, score_movies, taste_weights, top_k
+from recommends.taste import TasteVector
+
+
+class Command(BaseCommand):
+    help = '추천 점수 계산(행렬-벡터 곱 + 상위 k개) 속도 측정 (임의로 만든 영화 데이터 사용, DB 접근 없음)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--movies', type=int, default=100_000, help='영화 수 (기본 100,000)')
+        parser.add_argument('--k', type=int, default=30, help='상위 후보 수 (기본 30)')
+        parser.add_argument('--repeat', type=int, default=1000, help='반복 횟수')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--taste', action='store_true', help='유저 취향 벡터(감정 + 장르)를 섞어서 측정')
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        n = options['movies']
+
+        # 실제 내보낸 행렬과 같은 형태 (float32, 열 우선 배열)
+        vectors = np.asfortranarray(rng.random((n, len(MOOD_LABELS)), dtype=np.float32))
+        prior = build_prior(rng.gamma(2.0, 20.0, n).astype(np.float32), rng.uniform(4, 9, n).astype(np.float32))
+        weights = list(MOOD_VECTORS.values())
+
+        genres, genre_ids, genre_weights = None, [], None
+        if options['taste']:
+            genre_ids = list(range(19))
+            genres = np.zeros((n, len(genre_ids)), dtype=np.float32, order='F')
+            genres[np.arange(n), rng.integers(0, len(genre_ids), n)] = 1.0
+            mood = rng.random(len(MOOD_LABELS), dtype=np.float32)
+            # 보통 유저가 좋아하는 장르 3개
+            taste = TasteVector(mood / mood.sum(), {genre_id: 1 / 3 for genre_id in (0, 5, 9)})
+            pairs = [taste_weights(w, taste, genre_ids) for w in weights]
+            weights = [w for w, _ in pairs]
+            genre_weights = pairs[0][1]
+
+        # 워밍업
+        for w in weights:
+            top_k(score_movies(vectors, prior, w, genres, genre_weights), options['k'])
+
+        timings = []
+        for i in range(options['repeat']):
+            w = weights[i % len(weights)]
+            t0 = time.perf_counter()
+            top_k(score_movies(vectors, prior, w, genres, genre_weights), options['k'])
+            timings.append(time.perf_counter() - t0)
+
+        # 상위 k개 결과가 전체 정렬과 같은지 확인
+        scores = score_movies(vectors, prior, weights[0], genres, genre_weights)
+        expected = np.argsort(scores)[::-1][:options['k']]
+        assert np.array_equal(np.sort(scores[top_k(scores, options['k'])]), np.sort(scores[expected]))
+
+        timings = np.array(timings) * 1000
+        self.stdout.write(
+            f'영화 {n:,}편, k={options["k"]}: '
+            f'p50 {np.percentile(timings, 50):.3f}ms / p95 {np.percentile(timings, 95):.3f}ms / '
+            f'p99 {np.percentile(timings, 99):.3f}ms'
+        )
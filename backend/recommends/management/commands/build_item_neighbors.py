@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+from recommends.cf import NEIGHBOR_COUNT, rebuild_all
+from recommends.models import UserTaste
+
+
+class Command(BaseCommand):
+    help = '찜 / 높은 평점 리뷰 전체로 영화별 유사 영화 목록(아이템 기반 협업 필터링)을 처음부터 다시 계산'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        interactions, pairs = rebuild_all()
+        # 좋아한 영화 순서가 바뀌었으므로 취향 벡터는 다음 추천 요청 때 다시 계산
+        UserTaste.objects.all().delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'완료: 유저-영화 {interactions}건, 영화 쌍 {pairs}개, 영화별 상위 {NEIGHBOR_COUNT}개 저장 '
+            f'({time.perf_counter() - started:.1f}초)'
+        ))
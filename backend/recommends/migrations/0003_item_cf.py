@@ -0,0 +1,116 @@
+# Generated by Django 5.2 on 2026-10-18 15:55
+
+import math
+from collections import Counter, defaultdict
+from itertools import combinations
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# 마이그레이션 시점의 기준 (recommends.cf와 같지만, 앱 코드가 바뀌어도 이 마이그레이션은 그대로 동작하도록 복사)
+HIGH_RANK = 4.0
+NEIGHBOR_COUNT = 50
+BATCH_SIZE = 1000
+
+
+def similarity(co_count, count_a, count_b):
+    if not co_count or not count_a or not count_b:
+        return 0.0
+    return co_count / math.sqrt(count_a * count_b)
+
+
+def top_neighbors(scored):
+    ranked = sorted(((int(m), round(float(s), 6)) for m, s in scored if s > 0), key=lambda e: (-e[1], e[0]))
+    return [list(entry) for entry in ranked[:NEIGHBOR_COUNT]]
+
+
+def backfill(apps, schema_editor):
+    # 기존 찜 / 높은 평점 리뷰로 채워 두어야 이후 증분 갱신(recommends.cf.sync_interaction)이 맞는 값에서 시작함
+    Movie = apps.get_model('movies', 'Movie')
+    Review = apps.get_model('community', 'Review')
+    MovieInteraction = apps.get_model('recommends', 'MovieInteraction')
+    MoviePair = apps.get_model('recommends', 'MoviePair')
+    MovieNeighbors = apps.get_model('recommends', 'MovieNeighbors')
+
+    positives = defaultdict(set)
+    for user_id, movie_id in Movie.like_users.through.objects.values_list('user_id', 'movie_id').iterator():
+        positives[user_id].add(movie_id)
+    reviews = Review.objects.filter(rank__gte=HIGH_RANK).values_list('user_id', 'movie_id')
+    for user_id, movie_id in reviews.iterator():
+        positives[user_id].add(movie_id)
+
+    user_counts = Counter()
+    co_counts = Counter()
+    for movies in positives.values():
+        user_counts.update(movies)
+        co_counts.update(combinations(sorted(movies), 2))
+
+    neighbors = defaultdict(list)
+    for (a, b), count in co_counts.items():
+        score = similarity(count, user_counts[a], user_counts[b])
+        neighbors[a].append((b, score))
+        neighbors[b].append((a, score))
+
+    MovieInteraction.objects.bulk_create(
+        [MovieInteraction(user_id=u, movie_id=m) for u, movies in positives.items() for m in movies],
+        batch_size=BATCH_SIZE,
+    )
+    MoviePair.objects.bulk_create(
+        [MoviePair(movie_a_id=a, movie_b_id=b, count=c) for (a, b), c in co_counts.items()],
+        batch_size=BATCH_SIZE,
+    )
+    MovieNeighbors.objects.bulk_create(
+        [
+            MovieNeighbors(movie_id=m, user_count=count, neighbors=top_neighbors(neighbors[m]))
+            for m, count in user_counts.items()
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0003_alter_review_rank'),
+        ('movies', '0006_ingestionjob'),
+        ('recommends', '0002_seenmovies'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovieNeighbors',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_count', models.IntegerField(default=0)),
+                ('neighbors', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('movie', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='neighbors', to='movies.movie')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MovieInteraction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interactions', to='movies.movie')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movie_interactions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'movie')},
+            },
+        ),
+        migrations.CreateModel(
+            name='MoviePair',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('movie_a', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movies.movie')),
+                ('movie_b', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movies.movie')),
+            ],
+            options={
+                'unique_together': {('movie_a', 'movie_b')},
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-18 15:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommends', '0003_item_cf'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserTaste',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mood_sum', models.BinaryField(default=b'')),
+                ('genre_sums', models.JSONField(default=dict)),
+                ('weight', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='taste', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -24,4 +24,79 @@ class Recommendation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"{self.user}님의 추천 기록 - {self.created_at}"
\ No newline at end of file
+        return f"{self.user}님의 추천 기록 - {self.created_at}"
+
+
+class SeenMovies(models.Model):
+    """
+    유저별로 이미 추천받았거나 찜한 영화 집합 (추천에서 제외)
+    영화 pk를 비트 위치로 쓰는 비트셋이라 영화 10만 편이어도 12.5KB입니다. (recommends.seen.SeenSet)
+    추천 기록 / 찜하기가 저장될 때 시그널로 갱신되므로 추천 요청마다 기록 전체를 조회하지 않습니다.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='seen_movies'
+    )
+    bits = models.BinaryField(default=b'')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user}님이 본 영화 ({len(self.bits)} bytes)"
+
+
+# ---- 아이템 기반 협업 필터링 (recommends.cf) ----
+
+class MovieInteraction(models.Model):
+    """
+    유저가 좋아한 영화 (찜했거나 4점 이상 리뷰를 남긴 영화, 유저-영화당 1행)
+    찜/리뷰가 바뀔 때마다 시그널로 맞춰 두고, 바뀐 경우에만 MoviePair를 갱신합니다.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='movie_interactions')
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='interactions')
+
+    class Meta:
+        unique_together = [['user', 'movie']]
+
+
+class MoviePair(models.Model):
+    """
+    두 영화를 모두 좋아한 유저 수 (희소 동시 출현 행렬, movie_a_id < movie_b_id 인 행만 저장)
+    """
+    movie_a = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='+')
+    movie_b = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='+')
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = [['movie_a', 'movie_b']]
+
+
+class MovieNeighbors(models.Model):
+    """
+    영화별 유사한 영화 목록 (미리 계산해서 상위 NEIGHBOR_COUNT개만 보관)
+    neighbors 예시: [[영화 pk, 유사도], ...] (유사도 내림차순)
+    """
+    movie = models.OneToOneField(Movie, on_delete=models.CASCADE, related_name='neighbors')
+    user_count = models.IntegerField(default=0)  # 이 영화를 좋아한 유저 수
+    neighbors = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class UserTaste(models.Model):
+    """
+    유저 취향 벡터 (좋아한 영화들의 감정 벡터 / 장르 원-핫의 지수 감쇠 평균, recommends.taste)
+    새로 좋아한 영화일수록 비중이 크며, 좋아요가 추가될 때마다 벡터 연산 한 번으로 갱신합니다.
+    mood_sum / genre_sums는 가중 합계이고 weight(가중치 합)로 나누면 평균입니다.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='taste'
+    )
+    mood_sum = models.BinaryField(default=b'')      # float32 x 28 (moods.vectors.MOOD_LABELS 순서)
+    genre_sums = models.JSONField(default=dict)     # {장르 tmdb_id: 가중 합계}
+    weight = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user}님의 취향"
@@ -0,0 +1,153 @@
+"""
+기분별 추천 후보 풀 + 가중치 랜덤 추출 (Vose의 alias method)
+
+감정 벡터 행렬을 내보낼 때마다(moods.vectors.mood_matrix_exported) 기분마다
+- 추천 점수(recommends.scoring) 상위 POOL_SIZE편을 후보 풀로 저장하고
+- 점수가 높을수록 잘 뽑히도록 exp((점수 - 최고 점수) / TEMPERATURE) 가중치의 alias 테이블을 만들어
+CATALOG_DIR에 함께 내보냅니다.
+
+추천 요청은 SQL 없이 alias 테이블에서 한 번에 O(1)로 영화를 뽑습니다.
+상위 30편 안에서 균등하게 고르던 방식과 달리 점수 순서를 지키면서도 풀 전체에서 골고루 나옵니다.
+
+취향 벡터가 있는 유저는 풀 안의 영화(POOL_SIZE편)만 취향을 섞어 다시 점수를 매기고,
+같은 가중치 exp(점수 / TEMPERATURE)로 Gumbel-top-k 추출을 합니다. (alias 테이블은 기분별 공통이라 사용 불가)
+"""
+import random
+
+import numpy as np
+
+from movies.catalog import ArrayStore, write_arrays
+from moods.vectors import load_mood_matrix
+from .scoring import MOOD_VECTORS, build_prior, prepared_matrix, score_movies, taste_weights, top_k
+
+POOL_NAME = 'mood_pools'
+POOL_SIZE = 300      # 기분별 후보 수
+TEMPERATURE = 0.05   # 작을수록 상위 영화에 집중 (점수 0.05 차이마다 뽑힐 확률 약 1/e배)
+
+_pool_store = ArrayStore(POOL_NAME)
+# 개인화 추출의 Gumbel 노이즈용 (테스트에서는 draw_movie_ids(generator=np.random.default_rng(시드))로 고정)
+_generator = np.random.default_rng()
+
+
+def build_alias_table(weights):
+    """
+    Vose의 alias method: O(n)으로 만들고 O(1)로 뽑는 가중치 랜덤 추출 테이블
+    반환값: (prob, alias) - i번 칸을 고른 뒤 prob[i] 확률로 i, 아니면 alias[i]
+    """
+    n = len(weights)
+    total = float(np.sum(weights))
+    scaled = [float(w) * n / total for w in weights]
+    prob = np.ones(n, dtype=np.float32)
+    alias = np.arange(n, dtype=np.int32)
+
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        prob[less] = scaled[less]
+        alias[less] = more
+        scaled[more] = scaled[more] + scaled[less] - 1.0
+        (small if scaled[more] < 1.0 else large).append(more)
+    # 남은 칸은 부동소수점 오차로 남은 것이므로 확률 1
+    return prob, alias
+
+
+def build_mood_pools(matrix):
+    """
+    matrix: moods.vectors.load_mood_matrix() 결과
+    반환값: {f'{기분}_ids' / _rows / _prob / _alias: 배열} (_rows: 행렬에서의 행 번호)
+    """
+    arrays = matrix.arrays
+    prior = build_prior(arrays['popularity'], arrays['vote_average'])
+    pools = {}
+    for mood, weights in MOOD_VECTORS.items():
+        scores = score_movies(arrays['vectors'], prior, weights)
+        ranked = top_k(scores, POOL_SIZE)
+        prob, alias = build_alias_table(np.exp((scores[ranked] - scores[ranked[0]]) / TEMPERATURE))
+        pools[f'{mood}_ids'] = arrays['movie_ids'][ranked]
+        pools[f'{mood}_rows'] = ranked
+        pools[f'{mood}_prob'] = prob
+        pools[f'{mood}_alias'] = alias
+    return pools
+
+
+def rebuild_mood_pools(sender=None, **kwargs):
+    """
+    mood_matrix_exported 시그널 핸들러 (방금 내보낸 행렬로 후보 풀을 다시 만듦)
+    """
+    matrix = load_mood_matrix(refresh=True)
+    if matrix is None:
+        return
+    if not len(matrix.arrays['movie_ids']):
+        # 감정 분석된 영화가 없음 -> 빈 풀로 덮어써서 이전 풀에서 뽑지 않도록 (draw_movie_ids는 None)
+        write_arrays(POOL_NAME, {}, matrix_version=matrix.version)
+        return
+    write_arrays(POOL_NAME, build_mood_pools(matrix), matrix_version=matrix.version)
+
+
+def draw_movie_ids(user_mood, k, seen=None, rng=random, taste=None, generator=None):
+    """
+    기분별 후보 풀에서 가중치에 따라 서로 다른 영화 k편의 pk를 뽑습니다.
+    seen(recommends.seen.SeenSet)에 있는 영화는 건너뜁니다.
+    taste(recommends.taste.TasteVector)가 있으면 취향을 섞은 점수로 뽑습니다.
+    rng: alias 테이블 추출용 random.Random, generator: 개인화 추출용 numpy Generator (없으면 모듈 공용)
+    후보 풀이 없거나, 모르는 기분이거나, 풀에 안 본 영화가 k편보다 적으면 None
+    """
+    pools = _pool_store.get()
+    if pools is None or f'{user_mood}_ids' not in pools.arrays:
+        return None
+    if taste is not None:
+        matrix = prepared_matrix()
+        # 풀의 행 번호는 풀을 만든 행렬 기준이라 버전이 같을 때만 사용 (아니면 공통 가중치로 뽑음)
+        if matrix is not None and pools.meta.get('matrix_version') == matrix.version:
+            return draw_personalized(pools, matrix, user_mood, k, seen, generator or _generator, taste)
+    ids = pools.arrays[f'{user_mood}_ids']
+    prob = pools.arrays[f'{user_mood}_prob']
+    alias = pools.arrays[f'{user_mood}_alias']
+
+    n = len(ids)
+    k = min(k, n)
+    # 본 영화는 처음부터 뽑힌 것으로 취급
+    skipped = np.flatnonzero(seen.mask(ids)).tolist() if seen is not None else []
+    if n - len(skipped) < k:
+        return None
+    picked = []
+    taken = set(skipped)
+    # 이미 뽑은 영화가 나오면 다시 뽑음 (k가 풀 크기보다 훨씬 작아서 거의 일어나지 않음)
+    for _ in range(k * 50):
+        if len(picked) == k:
+            break
+        i = rng.randrange(n)
+        index = i if rng.random() < prob[i] else int(alias[i])
+        if index not in taken:
+            taken.add(index)
+            picked.append(int(ids[index]))
+    # 가중치가 극단적으로 몰려 있어 다 못 뽑았으면 남은 자리는 순위대로 채움
+    for index in range(n):
+        if len(picked) == k:
+            break
+        if index not in taken:
+            taken.add(index)
+            picked.append(int(ids[index]))
+    return picked
+
+
+def draw_personalized(pools, matrix, user_mood, k, seen, generator, taste):
+    """
+    풀의 영화만 취향을 섞어 다시 점수를 매기고 exp(점수 / TEMPERATURE)에 비례해 k편을 뽑습니다.
+    (점수 / TEMPERATURE + Gumbel 노이즈의 상위 k개 = 가중치 비복원 추출)
+    """
+    ids = pools.arrays[f'{user_mood}_ids']
+    rows = pools.arrays[f'{user_mood}_rows']
+    weights, genre_weights = taste_weights(MOOD_VECTORS[user_mood], taste, matrix.genre_ids)
+    genres = matrix.genres[rows] if matrix.genres is not None else None
+    scores = score_movies(matrix.vectors[rows], matrix.prior[rows], weights, genres, genre_weights)
+
+    noise = generator.random(len(ids))
+    keys = scores / TEMPERATURE - np.log(-np.log(np.maximum(noise, 1e-12)))
+    if seen is not None:
+        keys[seen.mask(ids)] = -np.inf
+    k = min(k, len(ids))
+    if np.count_nonzero(np.isfinite(keys)) < k:
+        return None
+    return ids[top_k(keys, k)].tolist()
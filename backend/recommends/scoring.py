@@ -0,0 +1,211 @@
+"""
+감정 가중치 기반 추천 점수 계산
+
+사용자가 고른 기분(bored, sad, ...)을 28가지 감정에 대한 가중치 벡터로 바꾸고,
+내보낸 감정 벡터 행렬(moods.vectors)과의 곱(NumPy 연산 몇 번)으로 모든 영화의 점수를 한 번에 계산합니다.
+
+    점수 = MOOD_BLEND x (감정 점수 / 최댓값) + POPULARITY_BLEND x 인기도 + VOTE_BLEND x 평점
+
+- 인기도는 log1p(popularity)를 최댓값으로 나눈 값, 평점은 vote_average / 10 (둘 다 0~1)
+- 인기도/평점 부분(prior)은 행렬이 바뀔 때만 프로세스당 한 번 계산해 둡니다.
+- 로그인 유저는 취향 벡터(recommends.taste)를 섞습니다. 감정 부분은 기분 가중치에 더해서 같은 곱으로,
+  장르 부분은 장르 행렬과의 곱 한 번으로 계산합니다. (기록 조회 없이 벡터 연산 하나 추가)
+- 상위 k개는 전체 정렬 대신 np.argpartition(O(n))으로 고른 뒤 k개만 정렬합니다.
+- 영화 10만 편 기준 1ms 이내 (python manage.py bench_scoring 으로 확인)
+"""
+import threading
+
+import numpy as np
+
+from moods.vectors import LABEL_INDEX, MOOD_LABELS, load_mood_matrix
+
+# 기분 -> 감정별 가중치 (1.0이 가장 중요한 감정)
+MOOD_WEIGHTS = {
+    # 1. 심심할 땐 -> 자극적인 것 (흥미, 놀람, 깨달음/반전, 공포)
+    'bored': {'excitement': 1.0, 'curiosity': 0.8, 'surprise': 0.8, 'realization': 0.6, 'fear': 0.6},
+
+    # 2. 화날 땐 -> 다 때려부수는 것 (분노) 혹은 통쾌함 (흥미)
+    'angry': {'anger': 1.0, 'annoyance': 0.7, 'excitement': 0.6},
+
+    # 3. 슬플 땐 -> 같이 울어줄 영화 (슬픔, 후회)
+    'sad': {'sadness': 1.0, 'grief': 0.9, 'remorse': 0.6, 'disappointment': 0.5},
+
+    # 4. 행복할 땐 -> 계속 행복하게 (기쁨, 즐거움, 사랑, 존경)
+    'happy': {'joy': 1.0, 'amusement': 0.9, 'love': 0.8, 'admiration': 0.6, 'optimism': 0.6},
+
+    # 5. 긴장/스트레스 -> 편안하고 따뜻한 것 (안도감, 승인)
+    'stressed': {'relief': 1.0, 'approval': 0.7, 'caring': 0.8, 'joy': 0.6},
+}
+
+# 가중치가 있는 감정이 이 개수 이하면 해당 열만 읽어서 계산 (그 이상이면 행렬-벡터 곱 한 번)
+SPARSE_LABELS = 8
+
+# 최종 점수에서 각 요소의 비중
+MOOD_BLEND = 0.7
+POPULARITY_BLEND = 0.2
+VOTE_BLEND = 0.1
+
+# 취향 반영 비율: 기분 가중치 중 취향 감정 벡터 비율 / 장르 취향 점수 비중
+TASTE_BLEND = 0.3
+GENRE_BLEND = 0.15
+# 취향 감정 벡터는 비중이 큰 감정 몇 개만 사용 (기분 가중치와 합쳐도 SPARSE_LABELS 이하로 유지)
+TASTE_LABELS = 3
+
+
+def mood_weight_vector(user_mood):
+    """
+    기분 -> MOOD_LABELS 순서의 float32 가중치 벡터 (합이 1). 모르는 기분이면 None
+    """
+    weights = MOOD_WEIGHTS.get(user_mood)
+    if not weights:
+        return None
+    vector = np.zeros(len(MOOD_LABELS), dtype=np.float32)
+    for label, weight in weights.items():
+        vector[LABEL_INDEX[label]] = weight
+    return vector / vector.sum()
+
+
+MOOD_VECTORS = {mood: mood_weight_vector(mood) for mood in MOOD_WEIGHTS}
+
+
+def taste_weights(weights, taste, genre_ids):
+    """
+    취향(recommends.taste.TasteVector)을 섞은 (감정 가중치, 장르 가중치)
+    취향이 없거나 행렬에 장르 정보가 없으면 장르 가중치는 None
+    """
+    if taste is None:
+        return weights, None
+    mood = np.zeros_like(taste.mood)
+    top = np.argsort(taste.mood)[-TASTE_LABELS:]
+    mood[top] = taste.mood[top]
+    total = mood.sum()
+    blended = (1 - TASTE_BLEND) * weights + (TASTE_BLEND / total * mood if total > 0 else 0)
+    genre_weights = taste.genre_vector(genre_ids) if genre_ids else None
+    return blended.astype(np.float32, copy=False), genre_weights
+
+
+def build_prior(popularity, vote_average):
+    """
+    인기도/평점 부분 점수 (영화 수 크기의 float32 배열)
+    """
+    popularity = np.log1p(np.maximum(popularity, 0, dtype=np.float32))
+    top = popularity.max() if len(popularity) else 0
+    if top > 0:
+        popularity /= top
+    prior = POPULARITY_BLEND * popularity
+    prior += VOTE_BLEND * (np.asarray(vote_average, dtype=np.float32) / 10)
+    return prior.astype(np.float32, copy=False)
+
+
+def score_movies(vectors, prior, weights, genres=None, genre_weights=None):
+    """
+    vectors: (영화 수 x 28) float32, prior: build_prior() 결과, weights: 가중치 벡터
+    genres / genre_weights: 장르 행렬과 취향 장르 가중치 (taste_weights() 결과, 없으면 생략)
+    반환값: 영화별 최종 점수 (새 배열)
+
+    기분 가중치는 28개 중 4~5개 감정에만 값이 있으므로, 행렬이 열 우선(moods.vectors)이면
+    그 감정 열만 읽어서 곱합니다. (행렬 전체 대비 메모리 읽기량 1/5 이하)
+    """
+    scores = weighted_sum(vectors, weights)
+    top = scores.max() if len(scores) else 0
+    scores *= MOOD_BLEND / top if top > 0 else 0
+    scores += prior
+    if genre_weights is not None and genres is not None and genre_weights.any():
+        # 장르 행과 취향 장르 벡터 모두 합이 1이라 0~1
+        genre_scores = weighted_sum(genres, genre_weights)
+        genre_scores *= GENRE_BLEND
+        scores += genre_scores
+    return scores
+
+
+def weighted_sum(matrix, weights):
+    """
+    matrix @ weights (새 배열). 열 우선 행렬이고 가중치가 있는 열이 적으면 그 열만 읽어서 곱합니다.
+    """
+    labels = np.flatnonzero(weights)
+    if not matrix.flags.f_contiguous or not len(labels) or len(labels) > SPARSE_LABELS:
+        return (matrix @ weights).astype(np.float32, copy=False)
+    scores = matrix[:, labels[0]] * weights[labels[0]]
+    column = np.empty_like(scores)
+    for label in labels[1:]:
+        np.multiply(matrix[:, label], weights[label], out=column)
+        scores += column
+    return scores
+
+
+def top_k(scores, k):
+    """
+    점수가 높은 순으로 k개의 인덱스 (전체 정렬 없이)
+
+    영화가 많으면 먼저 일정 간격으로 뽑은 표본에서 상위 값을 기준값으로 잡고, 기준값 이상인
+    영화(보통 수백 개)만 argpartition 합니다. 기준값 이상인 영화가 k개 이상이면 실제 상위 k개는
+    모두 그 안에 있으므로 결과는 전체 argpartition과 같고, 부족하면 전체로 다시 계산합니다.
+    """
+    n = len(scores)
+    if k >= n:
+        return np.argsort(scores)[::-1]
+
+    candidates = None
+    stride = n // (k * 16)
+    if stride >= 4:
+        sample = scores[::stride]
+        rank = min(len(sample), max(8, 2 * k // stride + 1))
+        threshold = np.partition(sample, len(sample) - rank)[len(sample) - rank]
+        selected = np.flatnonzero(scores >= threshold)
+        if len(selected) >= k:
+            candidates = selected[np.argpartition(scores[selected], len(selected) - k)[len(selected) - k:]]
+    if candidates is None:
+        candidates = np.argpartition(scores, n - k)[n - k:]
+    return candidates[np.argsort(scores[candidates])[::-1]]
+
+
+class PreparedMatrix:
+    __slots__ = ('version', 'vectors', 'movie_ids', 'prior', 'genres', 'genre_ids')
+
+    def __init__(self, snapshot):
+        arrays = snapshot.arrays
+        self.version = snapshot.version
+        self.vectors = arrays['vectors']
+        self.movie_ids = arrays['movie_ids']
+        self.prior = build_prior(arrays['popularity'], arrays['vote_average'])
+        self.genres = arrays.get('genres')
+        self.genre_ids = snapshot.meta.get('genre_ids', []) if self.genres is not None else []
+
+
+_prepared = None
+_prepared_lock = threading.Lock()
+
+
+def prepared_matrix():
+    """
+    현재 행렬 + prior (행렬 파일이 교체되면 다시 계산). 행렬이 아직 없으면 None
+    """
+    global _prepared
+    snapshot = load_mood_matrix()
+    if snapshot is None:
+        return None
+    prepared = _prepared
+    if prepared is None or prepared.version != snapshot.version:
+        with _prepared_lock:
+            if _prepared is None or _prepared.version != snapshot.version:
+                _prepared = PreparedMatrix(snapshot)
+            prepared = _prepared
+    return prepared
+
+
+def recommend_movie_ids(user_mood, k=30, seen=None, taste=None):
+    """
+    기분에 맞는 상위 k개 영화의 pk (점수 내림차순)
+    seen(recommends.seen.SeenSet)에 있는 영화는 점수를 -inf로 두어 안 본 영화가 먼저 나오게 합니다.
+    taste(recommends.taste.TasteVector)가 있으면 유저 취향을 섞어서 계산합니다.
+    행렬 파일이 없거나 모르는 기분이면 None (호출하는 쪽에서 DB 기반 추천으로 대체)
+    """
+    weights = MOOD_VECTORS.get(user_mood)
+    matrix = prepared_matrix()
+    if weights is None or matrix is None or not len(matrix.movie_ids):
+        return None
+    weights, genre_weights = taste_weights(weights, taste, matrix.genre_ids)
+    scores = score_movies(matrix.vectors, matrix.prior, weights, matrix.genres, genre_weights)
+    if seen is not None:
+        scores[seen.mask(matrix.movie_ids)] = -np.inf
+    return matrix.movie_ids[top_k(scores, k)].tolist()
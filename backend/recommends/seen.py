@@ -0,0 +1,110 @@
+"""
+유저별 "이미 본 영화" 비트셋
+
+- 영화 pk번째 비트가 1이면 이미 추천받았거나 찜한 영화
+- 처음 사용할 때 한 번만 추천 기록 + 찜 목록으로 만들고, 이후에는 시그널로 비트만 추가합니다.
+  (Recommendation.recommended_movies / Movie.like_users 에 영화가 추가될 때)
+"""
+import numpy as np
+from django.db import transaction
+
+from movies.models import Movie
+from .models import Recommendation, SeenMovies
+
+
+class SeenSet:
+    def __init__(self, data=b''):
+        self.bits = bytearray(data)
+
+    def __contains__(self, movie_id):
+        byte = movie_id >> 3
+        return byte < len(self.bits) and bool(self.bits[byte] & (1 << (movie_id & 7)))
+
+    def add(self, movie_id):
+        byte = movie_id >> 3
+        if byte >= len(self.bits):
+            self.bits.extend(bytes(byte + 1 - len(self.bits)))
+        self.bits[byte] |= 1 << (movie_id & 7)
+
+    def update(self, movie_ids):
+        for movie_id in movie_ids:
+            self.add(movie_id)
+
+    def mask(self, movie_ids):
+        """
+        movie_ids(numpy 배열)와 같은 길이의 bool 배열 (본 영화면 True)
+        """
+        movie_ids = np.asarray(movie_ids)
+        if not self.bits:
+            return np.zeros(len(movie_ids), dtype=bool)
+        unpacked = np.unpackbits(np.frombuffer(self.bits, dtype=np.uint8), bitorder='little')
+        inside = movie_ids < len(unpacked)
+        result = np.zeros(len(movie_ids), dtype=bool)
+        result[inside] = unpacked[movie_ids[inside]].astype(bool)
+        return result
+
+    def tobytes(self):
+        return bytes(self.bits)
+
+
+def history_movie_ids(user_id):
+    """
+    추천 기록 + 찜 목록의 영화 pk (비트셋을 처음 만들 때 한 번만 사용)
+    """
+    recommended = Recommendation.recommended_movies.through.objects.filter(
+        recommendation__user_id=user_id
+    ).values_list('movie_id', flat=True)
+    liked = Movie.like_users.through.objects.filter(user_id=user_id).values_list('movie_id', flat=True)
+    return set(recommended) | set(liked)
+
+
+def load_seen(user):
+    """
+    유저의 SeenSet (저장된 비트셋이 없으면 기록으로 만들어서 저장)
+    """
+    bits = SeenMovies.objects.filter(user=user).values_list('bits', flat=True).first()
+    if bits is not None:
+        return SeenSet(bits)
+    seen = SeenSet()
+    seen.update(history_movie_ids(user.pk))
+    SeenMovies.objects.get_or_create(user=user, defaults={'bits': seen.tobytes()})
+    return seen
+
+
+def mark_seen(user_id, movie_ids):
+    with transaction.atomic():
+        row, created = SeenMovies.objects.select_for_update().get_or_create(user_id=user_id)
+        seen = SeenSet(row.bits)
+        if created:
+            seen.update(history_movie_ids(user_id))
+        seen.update(movie_ids)
+        row.bits = seen.tobytes()
+        row.save(update_fields=['bits', 'updated_at'])
+
+
+def on_recommended(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    m2m_changed: 추천 기록에 영화가 저장되면 본 영화로 표시
+    """
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        # movie.recommended_records.add(recommendation) 형태
+        for user_id in Recommendation.objects.filter(pk__in=pk_set).values_list('user_id', flat=True):
+            mark_seen(user_id, [instance.pk])
+    else:
+        mark_seen(instance.user_id, pk_set)
+
+
+def on_liked(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    m2m_changed: 찜하기가 추가되면 본 영화로 표시 (찜을 취소해도 다시 추천하지 않음)
+    """
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        # user.like_movies.add(movie) 형태
+        mark_seen(instance.pk, pk_set)
+    else:
+        for user_id in pk_set:
+            mark_seen(user_id, [instance.pk])
@@ -0,0 +1,151 @@
+"""
+유저 취향 벡터
+
+좋아한 영화(찜 / 높은 평점 리뷰, recommends.cf.MovieInteraction)의 감정 벡터와 장르 원-핫을
+새로 좋아한 영화일수록 크게 반영하는 지수 감쇠 평균으로 합칩니다.
+
+    합계 = TASTE_DECAY x 합계 + 영화 벡터,  가중치 = TASTE_DECAY x 가중치 + 1,  취향 = 합계 / 가중치
+
+- 좋아요가 추가되면 위 식 한 번으로 갱신 (기록 조회 없음)
+- 좋아요가 취소되면 감쇠 평균에서 빼낼 수 없으므로 최근 HISTORY_LIMIT편으로 다시 계산
+- 추천 요청은 저장된 취향을 읽어서 점수 계산에 섞기만 합니다. (recommends.scoring.taste_weights)
+"""
+import numpy as np
+from django.db import transaction
+
+from moods.models import MovieMood
+from moods.vectors import MOOD_LABELS, unpack_vector
+from movies.models import Movie
+from .models import MovieInteraction, UserTaste
+
+TASTE_DECAY = 0.9     # 좋아한 영화가 하나 늘 때마다 이전 영화들의 비중에 곱하는 값
+HISTORY_LIMIT = 100   # 다시 계산할 때 쓰는 최근 영화 수 (0.9^100 ~ 0.00003 이라 그 이전은 영향 없음)
+
+
+class TasteVector:
+    __slots__ = ('mood', 'genres')
+
+    def __init__(self, mood, genres):
+        self.mood = mood        # float32 x 28, 합 1
+        self.genres = genres    # {장르 tmdb_id: 비중}, 합 1
+
+    def genre_vector(self, genre_ids):
+        """
+        genre_ids(행렬의 장르 열 순서)에 맞춘 float32 장르 가중치
+        """
+        return np.array([self.genres.get(genre_id, 0.0) for genre_id in genre_ids], dtype=np.float32)
+
+
+def movie_features(movie_ids):
+    """
+    {영화 pk: (감정 벡터(합 1), {장르 tmdb_id: 1 / 장르 수})} - 감정 분석 전인 영화는 감정 벡터가 0
+    """
+    features = {movie_id: [np.zeros(len(MOOD_LABELS), dtype=np.float32), {}] for movie_id in movie_ids}
+    moods = MovieMood.objects.filter(movie_id__in=movie_ids).exclude(vector=b'').values_list('movie_id', 'vector')
+    for movie_id, vector in moods:
+        mood = unpack_vector(bytes(vector))
+        total = mood.sum()
+        if total > 0:
+            features[movie_id][0] = mood / total
+    links = Movie.genres.through.objects.filter(movie_id__in=movie_ids).values_list('movie_id', 'genre__tmdb_id')
+    for movie_id, genre_id in links:
+        features[movie_id][1][genre_id] = 1.0
+    for _, genres in features.values():
+        for genre_id in genres:
+            genres[genre_id] = 1.0 / len(genres)
+    return {movie_id: tuple(feature) for movie_id, feature in features.items()}
+
+
+def accumulate(mood_sum, genre_sums, weight, feature):
+    """
+    지수 감쇠 합계에 영화 하나를 더한 (mood_sum, genre_sums, weight)
+    """
+    mood, genres = feature
+    mood_sum = TASTE_DECAY * mood_sum + mood
+    genre_sums = {genre_id: TASTE_DECAY * value for genre_id, value in genre_sums.items()}
+    for genre_id, value in genres.items():
+        genre_sums[genre_id] = genre_sums.get(genre_id, 0.0) + value
+    return mood_sum, genre_sums, TASTE_DECAY * weight + 1
+
+
+def empty_sums():
+    return np.zeros(len(MOOD_LABELS), dtype=np.float32), {}, 0.0
+
+
+def rebuild_taste(user_id):
+    """
+    최근 좋아한 영화 HISTORY_LIMIT편으로 취향 합계를 처음부터 계산해서 저장
+    """
+    recent = list(
+        MovieInteraction.objects.filter(user_id=user_id).order_by('-pk').values_list('movie_id', flat=True)[:HISTORY_LIMIT]
+    )
+    features = movie_features(recent)
+    mood_sum, genre_sums, weight = empty_sums()
+    for movie_id in reversed(recent):  # 오래된 영화부터 더해야 최근 영화의 비중이 큼
+        mood_sum, genre_sums, weight = accumulate(mood_sum, genre_sums, weight, features[movie_id])
+    return save_sums(user_id, mood_sum, genre_sums, weight)
+
+
+def save_sums(user_id, mood_sum, genre_sums, weight):
+    taste, _ = UserTaste.objects.update_or_create(
+        user_id=user_id,
+        defaults={
+            'mood_sum': mood_sum.astype('<f4').tobytes(),
+            'genre_sums': {str(genre_id): round(float(value), 6) for genre_id, value in genre_sums.items()},
+            'weight': weight,
+        },
+    )
+    return taste
+
+
+def add_movie(user_id, movie_id):
+    """
+    새로 좋아한 영화 하나를 취향 합계에 더함 (저장된 취향이 없으면 기록으로 새로 계산)
+    """
+    with transaction.atomic():
+        taste = UserTaste.objects.select_for_update().filter(user_id=user_id).first()
+        if taste is None:
+            rebuild_taste(user_id)
+            return
+        mood_sum = unpack_vector(bytes(taste.mood_sum)) if taste.mood_sum else empty_sums()[0]
+        genre_sums = {int(genre_id): value for genre_id, value in taste.genre_sums.items()}
+        feature = movie_features([movie_id])[movie_id]
+        save_sums(user_id, *accumulate(mood_sum, genre_sums, taste.weight, feature))
+
+
+def to_vector(taste):
+    """
+    UserTaste -> TasteVector (좋아한 영화가 없으면 None)
+    """
+    if taste.weight <= 0 or not taste.mood_sum:
+        return None
+    # 감정 분석 전인 영화만 좋아했으면 감정 부분은 0 (장르 취향만 반영)
+    mood = unpack_vector(bytes(taste.mood_sum))
+    total = mood.sum()
+    if total > 0:
+        mood = mood / total
+    genres = {int(genre_id): value for genre_id, value in taste.genre_sums.items()}
+    genre_total = sum(genres.values())
+    if genre_total > 0:
+        genres = {genre_id: value / genre_total for genre_id, value in genres.items()}
+    return TasteVector(mood.astype(np.float32), genres)
+
+
+def load_taste(user):
+    """
+    유저의 TasteVector (저장된 취향이 없으면 기록으로 만들어서 저장). 좋아한 영화가 없으면 None
+    """
+    taste = UserTaste.objects.filter(user=user).first()
+    if taste is None:
+        taste = rebuild_taste(user.pk)
+    return to_vector(taste)
+
+
+def on_interaction_changed(sender, user_id, movie_id, positive, **kwargs):
+    """
+    recommends.cf.interaction_changed 핸들러
+    """
+    if positive:
+        add_movie(user_id, movie_id)
+    else:
+        rebuild_taste(user_id)
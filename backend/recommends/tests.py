@@ -1,3 +1,79 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from community.models import Review
+from movies.models import Movie
+from .cf import HIGH_RANK, neighbor_ids, rebuild_all
+from .models import MovieInteraction, MovieNeighbors, MoviePair
+
+User = get_user_model()
+
+
+class ItemCFIncrementalTests(TestCase):
+    """
+    찜 / 리뷰 / 유저 삭제 때마다 증분 갱신한 결과가 전체 재계산(rebuild_all)과 같은지 (recommends.cf)
+    """
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f'user{i}', email=f'user{i}@example.com', password='pw')
+            for i in range(3)
+        ]
+        self.movies = [Movie.objects.create(tmdb_id=i, title=f'영화 {i}') for i in range(1, 6)]
+
+    def state(self):
+        # 좋아한 유저가 없어진 영화는 증분 갱신에서 빈 행이 남을 수 있으므로 제외하고 비교
+        return (
+            set(MovieInteraction.objects.values_list('user_id', 'movie_id')),
+            set(MoviePair.objects.values_list('movie_a_id', 'movie_b_id', 'count')),
+            {
+                movie_id: (user_count, [tuple(entry) for entry in neighbors])
+                for movie_id, user_count, neighbors in
+                MovieNeighbors.objects.filter(user_count__gt=0).values_list('movie_id', 'user_count', 'neighbors')
+            },
+        )
+
+    def assertMatchesRebuild(self):
+        incremental = self.state()
+        rebuild_all()
+        self.assertEqual(incremental, self.state())
+
+    def like(self, user, *movies):
+        user.like_movies.add(*movies)
+
+    def test_likes_and_reviews(self):
+        a, b, c = self.users
+        m1, m2, m3, m4, m5 = self.movies
+        self.like(a, m1, m2, m3)
+        self.like(b, m2, m3)
+        m4.like_users.add(a, c)
+        Review.objects.create(user=c, movie=m2, title='좋아요', content='내용', rank=HIGH_RANK)
+        Review.objects.create(user=b, movie=m5, title='별로', content='내용', rank=HIGH_RANK - 2)
+        self.assertEqual(neighbor_ids(m2.pk, 1)[0][0], m3.pk)
+        self.assertMatchesRebuild()
+
+        a.like_movies.remove(m1)
+        m3.like_users.remove(b)
+        self.assertMatchesRebuild()
+
+    def test_clear(self):
+        a, b, c = self.users
+        m1, m2, m3 = self.movies[:3]
+        for user in self.users:
+            self.like(user, m1, m2, m3)
+        a.like_movies.clear()
+        m3.like_users.clear()
+        self.assertMatchesRebuild()
+
+    def test_user_deleted(self):
+        a, b, c = self.users
+        m1, m2, m3 = self.movies[:3]
+        self.like(a, m1, m2, m3)
+        self.like(b, m2, m3)
+        Review.objects.create(user=b, movie=m1, title='좋아요', content='내용', rank=HIGH_RANK)
+        self.assertEqual(MoviePair.objects.get(movie_a=m2, movie_b=m3).count, 2)
+
+        b.delete()
+        self.assertEqual(MoviePair.objects.get(movie_a=m2, movie_b=m3).count, 1)
+        self.assertEqual(MovieNeighbors.objects.get(movie=m2).user_count, 1)
+        self.assertMatchesRebuild()
@@ -7,4 +7,7 @@ urlpatterns = [
     
     # 2. 기록 조회: GET /api/v1/recommends/history/
     path('history/', views.recommendation_history, name='recommendation_history'),
+
+    # 3. 이 영화를 좋아한 사람들이 좋아한 영화: GET /api/v1/recommends/because/<tmdb_id>/
+    path('because/<int:movie_pk>/', views.because_you_liked, name='because_you_liked'),
 ]
\ No newline at end of file
@@ -9,23 +9,46 @@ from .models import Recommendation
 from .serializers import RecommendationSerializer
 from movies.models import Movie
 from movies.serializers import MovieListSerializer
+from .cf import neighbor_ids
+from .pools import draw_movie_ids
+from .seen import load_seen
+from .taste import load_taste
+from .scoring import MOOD_WEIGHTS, recommend_movie_ids
+
+# 한 번의 추천에서 보여줄 영화 수 / 랜덤으로 고를 후보 수
+RECOMMEND_COUNT = 4
+CANDIDATE_COUNT = 30
+
+# "이 영화를 좋아한 사람들이 좋아한 영화" 기본/최대 개수
+BECAUSE_COUNT = 10
+BECAUSE_MAX_COUNT = 50
+
+
+def top_candidates(user_mood, seen, taste=None):
+    """
+    기분에 맞는 상위 30개 후보 (후보 풀이 없거나 풀의 영화를 거의 다 봤을 때 사용)
+    """
+    # 감정 벡터 행렬로 전체 영화 점수 계산 (감정 가중치 + 취향 + 인기도 + 평점, 본 영화는 맨 뒤로)
+    candidate_ids = recommend_movie_ids(user_mood, k=CANDIDATE_COUNT, seen=seen, taste=taste)
+    if candidate_ids is not None:
+        movies = Movie.objects.in_bulk(candidate_ids)
+        return [movies[pk] for pk in candidate_ids if pk in movies]
+
+    if user_mood in MOOD_WEIGHTS:
+        # 행렬 파일이 아직 없으면 (movie_moods 실행 전) 대표 감정으로 필터링 후 인기도순
+        candidates = list(
+            Movie.objects
+            .filter(mood_result__dominant_mood__in=list(MOOD_WEIGHTS[user_mood]))
+            .order_by('-popularity')[:CANDIDATE_COUNT]
+        )
+    else:
+        # 매핑 안 된 기분일 때도 인기도 기반 랜덤 추천
+        candidates = list(Movie.objects.order_by('-popularity')[:CANDIDATE_COUNT])
+
+    # 안 본 영화가 4편 이상 남아 있으면 그 안에서만 고름
+    unseen = [movie for movie in candidates if movie.pk not in seen]
+    return unseen if len(unseen) >= RECOMMEND_COUNT else candidates
 
-MOOD_MAPPING = {
-    # 1. 심심할 땐 -> 자극적인 것 (흥미, 놀람, 깨달음/반전, 공포)
-    'bored': ['excitement', 'curiosity', 'surprise', 'realization', 'fear'],
-    
-    # 2. 화날 땐 -> 다 때려부수는 것 (분노) 혹은 통쾌함 (흥미)
-    'angry': ['anger', 'annoyance', 'excitement'],
-    
-    # 3. 슬플 땐 -> 같이 울어줄 영화 (슬픔, 후회)
-    'sad': ['sadness', 'grief', 'remorse', 'disappointment'],
-    
-    # 4. 행복할 땐 -> 계속 행복하게 (기쁨, 즐거움, 사랑, 존경)
-    'happy': ['joy', 'amusement', 'love', 'admiration', 'optimism'],
-    
-    # 5. 긴장/스트레스 -> 편안하고 따뜻한 것 (안도감, 승인)
-    'stressed': ['relief', 'approval', 'caring', 'joy']
-}
 
 # 1. 추천 생성 및 저장 (POST)
 # 로그인한 유저만 저장할 수 있도록 설정 (선택사항)
@@ -34,36 +57,26 @@ MOOD_MAPPING = {
 def generate_recommendation(request):
     # 프론트에서 보낸 기분 데이터 받기 ({ "mood": "sad" })
     user_mood = request.data.get('mood')
-    target_moods = MOOD_MAPPING.get(user_mood, [])
-    
-    recommended_movies = []
-    
-    if target_moods:
-        # 1. 감정에 맞는 영화 필터링
-        candidates = Movie.objects.filter(
-            mood_result__dominant_mood__in=target_moods
-        )
-        
-        # 2. [핵심] 인기도 순으로 정렬 후 상위 30개 가져오기 (후보군)
-        # 평점도 중요하다면: .order_by('-popularity', '-vote_average')
-        top_candidates = candidates.order_by('-popularity')[:30]
-        
-        # QuerySet을 리스트로 변환 (random.sample을 쓰기 위해)
-        top_candidates_list = list(top_candidates)
-        
-        # 3. [핵심] 상위 30개 중에서 랜덤으로 4개 뽑기
-        if len(top_candidates_list) >= 4:
-            recommended_movies = random.sample(top_candidates_list, 4)
-        else:
-            # 만약 후보가 4개보다 적으면 있는 거 다 보여줌
-            recommended_movies = top_candidates_list
-            
+
+    # 이미 추천받았거나 찜한 영화 (유저별 비트셋, 기록 전체를 조회하지 않음)
+    seen = load_seen(request.user)
+    # 좋아한 영화들로 미리 계산해 둔 취향 벡터 (좋아한 영화가 없으면 None)
+    taste = load_taste(request.user)
+
+    # 1. [핵심] 기분별 후보 풀(추천 점수 상위 300편)에서 점수 가중치대로 안 본 영화 4편 뽑기 (SQL 없이)
+    # 취향이 있으면 풀 안의 영화 점수에 취향을 섞어서 뽑음
+    picked_ids = draw_movie_ids(user_mood, RECOMMEND_COUNT, seen=seen, taste=taste)
+
+    if picked_ids is not None:
+        movies = Movie.objects.in_bulk(picked_ids)
+        recommended_movies = [movies[pk] for pk in picked_ids if pk in movies]
     else:
-        # 매핑 안 된 기분일 때도 인기도 기반 랜덤 추천
-        top_candidates = Movie.objects.order_by('-popularity')[:30]
-        recommended_movies = random.sample(list(top_candidates), 4)
+        # 2. 후보 풀이 없거나 풀의 영화를 거의 다 봤으면 전체 영화 중 상위 30개 후보에서 랜덤으로 4개 뽑기
+        # (후보가 4개보다 적으면 있는 거 다 보여줌)
+        candidates = top_candidates(user_mood, seen, taste)
+        recommended_movies = random.sample(candidates, min(RECOMMEND_COUNT, len(candidates)))
 
-    # 4. DB에 기록 저장 (기존 로직 동일)
+    # 3. DB에 기록 저장 (기존 로직 동일)
     # 선택된 영화들(recommended_movies)은 리스트이므로 바로 set() 가능
     if request.user.is_authenticated:
         recommendation = Recommendation.objects.create(
@@ -72,7 +85,7 @@ def generate_recommendation(request):
         )
         recommendation.recommended_movies.set(recommended_movies)
 
-    # 5. 응답
+    # 4. 응답
     serializer = MovieListSerializer(recommended_movies, many=True)
     return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -85,4 +98,25 @@ def recommendation_history(request):
     histories = Recommendation.objects.filter(user=request.user)
     
     serializer = RecommendationSerializer(histories, many=True)
-    return Response(serializer.data)
\ No newline at end of file
+    return Response(serializer.data)
+
+
+# 3. "이 영화를 좋아한 사람들이 좋아한 영화" (GET)
+# 요청 예시: GET /api/v1/recommends/because/550/?k=10
+@api_view(['GET'])
+def because_you_liked(request, movie_pk):
+    movie = get_object_or_404(Movie, tmdb_id=movie_pk)
+    try:
+        k = min(max(int(request.GET.get('k', BECAUSE_COUNT)), 1), BECAUSE_MAX_COUNT)
+    except ValueError:
+        return Response({'error': 'k must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+    # 미리 계산해 둔 이웃 목록(recommends.cf)을 읽기만 함 (유사도 순서 유지)
+    neighbors = neighbor_ids(movie.pk, k)
+    movies = Movie.objects.in_bulk([pk for pk, _ in neighbors])
+    similar = [movies[pk] for pk, _ in neighbors if pk in movies]
+
+    return Response({
+        'movie': MovieListSerializer(movie).data,
+        'results': MovieListSerializer(similar, many=True).data,
+    })